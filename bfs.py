@@ -1,17 +1,51 @@
 import matplotlib.pyplot as plt
 import matplotlib.patches as patches
+from matplotlib.collections import LineCollection, PatchCollection
 import networkx as nx
 import numpy as np
 import random
 import heapq
+import functools
 from collections import defaultdict, deque
 
 
+def shared_walls(left1, bottom1, width1, height1, left2, bottom2, width2, height2):
+    """
+    Element-wise (broadcasting) version of Room.has_shared_wall_with for rectangle arrays.
+    Returns a boolean array that is True where the two rectangles share a wall.
+    """
+    right1, top1 = left1 + width1, bottom1 + height1
+    right2, top2 = left2 + width2, bottom2 + height2
+
+    vertical_overlap = np.maximum(bottom1, bottom2) < np.minimum(top1, top2)
+    horizontal_overlap = np.maximum(left1, left2) < np.minimum(right1, right2)
+
+    # A touching left/right wall decides the result before top/bottom walls are considered
+    touches_side = (right1 == left2) | (right2 == left1)
+    touches_end = (top1 == bottom2) | (top2 == bottom1)
+    return np.where(touches_side, vertical_overlap, touches_end & horizontal_overlap)
+
+
+def score_positions(positions, width, height, neighbor_rects):
+    """
+    Count, for each candidate position of a width x height room, how many of the given
+    neighbor rectangles it shares a wall with (same rules as Room.has_shared_wall_with).
+
+    positions: (N, 2) array of candidate (x, y)
+    neighbor_rects: (K, 4) array of placed neighbor (x, y, width, height)
+    Returns an (N,) int array of scores.
+    """
+    shared = shared_walls(positions[:, 0:1], positions[:, 1:2], width, height,
+                          neighbor_rects[:, 0], neighbor_rects[:, 1], neighbor_rects[:, 2], neighbor_rects[:, 3])
+    return shared.sum(axis=1)
+
+
 class Room:
     def __init__(self, name, width, height, max_expansion=20):
         self.name = name
         self.original_width = width
         self.original_height = height
+        self.original_area = width * height  # Unchanged by rotation; used as a sort key
         self.width = width
         self.height = height
         self.x = None
@@ -60,8 +94,10 @@ class Room:
         if self.x is None or self.y is None or other_room.x is None or other_room.y is None:
             return False
 
-        left1, right1, bottom1, top1 = self.get_boundaries()
-        left2, right2, bottom2, top2 = other_room.get_boundaries()
+        left1, bottom1 = self.x, self.y
+        right1, top1 = left1 + self.width, bottom1 + self.height
+        left2, bottom2 = other_room.x, other_room.y
+        right2, top2 = left2 + other_room.width, bottom2 + other_room.height
 
         # Check for vertical walls (left or right side)
         if right1 == left2:  # This room's right wall is other room's left wall
@@ -100,7 +136,11 @@ class FloorPlan:
         ]
         """
         self.rooms = []
+        self._rooms_by_name = {}
         self.adjacency_graph = nx.Graph()
+        self._neighbor_cache = {}  # room name -> tuple of required neighbors
+        self._adjacency_matrix = None  # boolean (N, N) matrix indexed by room.idx, built lazily
+        self._edge_index = None  # (edges, (E, 2) array of room.idx pairs), built lazily
 
         # Process floor regions
         self.floor_regions = []
@@ -131,33 +171,88 @@ class FloorPlan:
         self.floor_width = max(region['x'] + region['width'] for region in self.floor_regions)
         self.floor_height = max(region['y'] + region['height'] for region in self.floor_regions)
 
-        # Add spatial indexing for faster overlap detection
-        self.spatial_grid = {}
+        # Region bounds as plain (left, bottom, right, top) tuples for the containment fast path
+        self._region_bounds = tuple(
+            (region['x'], region['y'], region['x'] + region['width'], region['y'] + region['height'])
+            for region in self.floor_regions
+        )
+        # The same regions as an (R, 4) array of x, y, width, height for batched sampling
+        self._region_arr = np.array([(region['x'], region['y'], region['width'], region['height'])
+                                     for region in self.floor_regions], dtype=np.int64)
+
+        self._anchor_cache = {}  # (width, height, grid_size) -> grid-aligned anchor array
+
+        # NumPy generator for batched random draws, seeded from `random` so random.seed() still
+        # makes runs reproducible
+        self._rng = np.random.default_rng(random.getrandbits(64))
+
+        # Rasterize the composite floor shape once so containment tests become array lookups.
+        # The mask starts at the lowest region corner so negative coordinates are supported.
+        self._mask_x0 = min(region['x'] for region in self.floor_regions)
+        self._mask_y0 = min(region['y'] for region in self.floor_regions)
+        self._floor_mask = np.zeros((self.floor_height - self._mask_y0, self.floor_width - self._mask_x0),
+                                    dtype=bool)
+        for region in self.floor_regions:
+            mx, my = region['x'] - self._mask_x0, region['y'] - self._mask_y0
+            self._floor_mask[my:my + region['height'], mx:mx + region['width']] = True
+
+        # Zero-padded integral image of the mask: covered cells of any rectangle in O(1)
+        self._floor_integral = np.pad(self._floor_mask.cumsum(axis=0).cumsum(axis=1), ((1, 0), (1, 0)))
+
+        # Add spatial indexing for faster overlap detection (grid cell -> set of rooms)
+        self.spatial_grid = defaultdict(set)
         self.grid_size = 2  # Grid cell size for spatial indexing
 
+        # Room rectangles as parallel arrays (indexed by room.idx) for vectorized overlap tests
+        self._rx = np.zeros(0, dtype=np.int32)
+        self._ry = np.zeros(0, dtype=np.int32)
+        self._rw = np.zeros(0, dtype=np.int32)
+        self._rh = np.zeros(0, dtype=np.int32)
+        self._rrot = np.zeros(0, dtype=bool)
+        self._placed = np.zeros(0, dtype=bool)
+
+    def _reset_spatial_grid(self):
+        """Clear the spatial grid and mark every room as unplaced"""
+        self.spatial_grid = defaultdict(set)
+        self._placed[:] = False
+
+    def _sync_room_arrays(self, room):
+        """Copy a room's current rectangle into the parallel room arrays"""
+        i = room.idx
+        if room.x is None or room.y is None:
+            self._placed[i] = False
+            return
+        self._rx[i] = room.x
+        self._ry[i] = room.y
+        self._rw[i] = room.width
+        self._rh[i] = room.height
+        self._rrot[i] = room.rotated
+        self._placed[i] = True
+
     def _get_grid_cells(self, x, y, width, height):
         """Get all grid cells that a rectangle occupies"""
-        cells = []
-        start_x = x // self.grid_size
-        end_x = (x + width - 1) // self.grid_size
-        start_y = y // self.grid_size
-        end_y = (y + height - 1) // self.grid_size
+        return self._grid_cells(x, y, width, height, self.grid_size)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def _grid_cells(x, y, width, height, grid_size):
+        """Cached tuple of grid cells covered by a rectangle; the same rectangles are queried repeatedly"""
+        start_x = x // grid_size
+        end_x = (x + width - 1) // grid_size
+        start_y = y // grid_size
+        end_y = (y + height - 1) // grid_size
 
-        for gx in range(start_x, end_x + 1):
-            for gy in range(start_y, end_y + 1):
-                cells.append((gx, gy))
-        return cells
+        return tuple((gx, gy) for gx in range(start_x, end_x + 1) for gy in range(start_y, end_y + 1))
 
     def _add_to_spatial_grid(self, room):
         """Add room to spatial grid for fast overlap detection"""
+        self._sync_room_arrays(room)
         if room.x is None or room.y is None:
             return
 
         cells = self._get_grid_cells(room.x, room.y, room.width, room.height)
         for cell in cells:
-            if cell not in self.spatial_grid:
-                self.spatial_grid[cell] = []
-            self.spatial_grid[cell].append(room)
+            self.spatial_grid[cell].add(room)
 
     def _remove_from_spatial_grid(self, room):
         """Remove room from spatial grid"""
@@ -166,117 +261,197 @@ class FloorPlan:
 
         cells = self._get_grid_cells(room.x, room.y, room.width, room.height)
         for cell in cells:
-            if cell in self.spatial_grid and room in self.spatial_grid[cell]:
-                self.spatial_grid[cell].remove(room)
-                if not self.spatial_grid[cell]:
-                    del self.spatial_grid[cell]
+            self._discard_from_cell(cell, room)
+
+    def _discard_from_cell(self, cell, room):
+        """Remove room from a single grid cell, dropping the cell once empty"""
+        cell_rooms = self.spatial_grid.get(cell)
+        if cell_rooms is not None:
+            cell_rooms.discard(room)
+            if not cell_rooms:
+                del self.spatial_grid[cell]
+
+    def _move_in_spatial_grid(self, room, old_cells, new_cells):
+        """Update the grid for a room whose footprint changed, touching only the differing cells"""
+        old_cells, new_cells = set(old_cells), set(new_cells)
+        for cell in old_cells - new_cells:
+            self._discard_from_cell(cell, room)
+        for cell in new_cells - old_cells:
+            self.spatial_grid[cell].add(room)
+        self._sync_room_arrays(room)
 
     def check_overlap_optimized(self, room, x, y, width, height):
         """Optimized overlap detection using spatial grid"""
         cells = self._get_grid_cells(x, y, width, height)
+        right, top = x + width, y + height
         checked_rooms = set()
 
         for cell in cells:
-            if cell in self.spatial_grid:
-                for existing_room in self.spatial_grid[cell]:
+            cell_rooms = self.spatial_grid.get(cell)
+            if cell_rooms:
+                for existing_room in cell_rooms:
                     if existing_room != room and existing_room not in checked_rooms:
                         checked_rooms.add(existing_room)
                         # Check actual overlap
                         if (x < existing_room.x + existing_room.width and
-                                x + width > existing_room.x and
+                                right > existing_room.x and
                                 y < existing_room.y + existing_room.height and
-                                y + height > existing_room.y):
+                                top > existing_room.y):
                             return True
         return False
 
-    def get_valid_positions(self, room, max_positions=100):
-        """Get valid positions for a room, prioritizing adjacency requirements"""
+    def get_valid_positions(self, room, max_positions=100, adjacent_rects=None):
+        """Get valid positions for a room, prioritizing adjacency requirements
+
+        adjacent_rects optionally gives the (x, y, width, height) of the room's placed
+        neighbors, as tracked incrementally by the caller; otherwise they are looked up.
+        """
         valid_positions = []
 
         # Get rooms that should be adjacent to this room
-        adjacent_rooms = []
-        for neighbor in self.adjacency_graph.neighbors(room.name):
-            neighbor_room = next((r for r in self.rooms if r.name == neighbor), None)
-            if neighbor_room and neighbor_room.x is not None:
-                adjacent_rooms.append(neighbor_room)
-
-        # If we have adjacent rooms, prioritize positions near them
-        if adjacent_rooms:
-            for adj_room in adjacent_rooms:
-                # Try positions around the adjacent room
-                positions = [
-                    (adj_room.x + adj_room.width, adj_room.y),  # Right
-                    (adj_room.x - room.width, adj_room.y),  # Left
-                    (adj_room.x, adj_room.y + adj_room.height),  # Above
-                    (adj_room.x, adj_room.y - room.height),  # Below
-                ]
-
-                for x, y in positions:
-                    if (self.is_within_floor(x, y, room.width, room.height) and
-                            not self.check_overlap_optimized(room, x, y, room.width, room.height)):
-                        valid_positions.append((x, y))
-                        if len(valid_positions) >= max_positions:
-                            return valid_positions
-
-        # If no adjacent rooms or need more positions, try random positions
-        attempts = 0
-        while len(valid_positions) < max_positions and attempts < 200:
-            attempts += 1
-
-            # Choose a random region
-            region = random.choice(self.floor_regions)
-
-            if region['width'] < room.width or region['height'] < room.height:
-                continue
+        if adjacent_rects is None:
+            adjacent_rects = []
+            for neighbor in self._neighbors(room.name):
+                neighbor_room = self._rooms_by_name.get(neighbor)
+                if neighbor_room and neighbor_room.x is not None:
+                    adjacent_rects.append((neighbor_room.x, neighbor_room.y,
+                                           neighbor_room.width, neighbor_room.height))
+
+        # If we have adjacent rooms, prioritize positions near them, checking the
+        # positions around every adjacent room in one batch
+        if adjacent_rects:
+            positions = np.array([
+                position
+                for adj_x, adj_y, adj_width, adj_height in adjacent_rects
+                for position in (
+                    (adj_x + adj_width, adj_y),  # Right
+                    (adj_x - room.width, adj_y),  # Left
+                    (adj_x, adj_y + adj_height),  # Above
+                    (adj_x, adj_y - room.height),  # Below
+                )
+            ], dtype=np.int64)
+            valid_positions = [tuple(position) for position in
+                               positions[self._valid_position_mask(room, positions)].tolist()]
+            if len(valid_positions) >= max_positions:
+                return valid_positions[:max_positions]
 
-            max_x = region['x'] + region['width'] - room.width
-            max_y = region['y'] + region['height'] - room.height
+        seen = set(valid_positions)
 
-            if max_x >= region['x'] and max_y >= region['y']:
-                x = random.randint(region['x'], max_x)
-                y = random.randint(region['y'], max_y)
-
-                if (not self.check_overlap_optimized(room, x, y, room.width, room.height) and
-                        (x, y) not in valid_positions):
+        # If no adjacent rooms or need more positions, take grid-aligned anchors from every
+        # region that fits the room, validated in one batch and shuffled to keep attempts varied
+        if len(valid_positions) < max_positions:
+            anchors = self._grid_anchors(room.width, room.height)
+            if len(anchors):
+                free_anchors = [(int(x), int(y)) for x, y in anchors[self._valid_position_mask(room, anchors)]
+                                if (x, y) not in seen]
+                random.shuffle(free_anchors)
+                free_anchors = free_anchors[:max_positions - len(valid_positions)]
+                valid_positions.extend(free_anchors)
+                seen.update(free_anchors)
+
+        # Fall back to random positions between the anchors if still short
+        if len(valid_positions) < max_positions:
+            for x, y in self._random_valid_positions(room, room.width, room.height).tolist():
+                if (x, y) not in seen:
                     valid_positions.append((x, y))
+                    seen.add((x, y))
+                    if len(valid_positions) >= max_positions:
+                        break
 
         return valid_positions
 
+    def _grid_anchors(self, width, height):
+        """Grid-aligned (x, y) anchors in every region that fits a width x height room, as an (N, 2) array"""
+        key = (width, height, self.grid_size)
+        anchors = self._anchor_cache.get(key)
+        if anchors is None:
+            anchors = np.array(list(dict.fromkeys(
+                (x, y)
+                for region in self.floor_regions
+                if region['width'] >= width and region['height'] >= height
+                for x in range(region['x'], region['x'] + region['width'] - width + 1, self.grid_size)
+                for y in range(region['y'], region['y'] + region['height'] - height + 1, self.grid_size)
+            )), dtype=np.int64).reshape(-1, 2)
+            self._anchor_cache[key] = anchors
+        return anchors
+
+    def _random_valid_positions(self, room, width, height, samples=200):
+        """
+        Draw a batch of random (region, x, y) positions for the room at the given size and
+        return the valid ones, in draw order, as an (N, 2) array
+        """
+        regions = self._region_arr[self._rng.integers(0, len(self._region_arr), size=samples)]
+        regions = regions[(regions[:, 2] >= width) & (regions[:, 3] >= height)]
+        positions = np.column_stack((
+            regions[:, 0] + self._rng.integers(0, regions[:, 2] - width + 1),
+            regions[:, 1] + self._rng.integers(0, regions[:, 3] - height + 1),
+        ))
+        return positions[self._valid_position_mask(room, positions, (width, height))]
+
+    def _first_valid_position(self, room, adjacent_rects):
+        """
+        First position get_valid_positions would yield for the room, trying its current
+        orientation before the rotated one. Adjacency and grid-anchor candidates of both
+        orientations are validated in a single batch instead of a fresh search per orientation.
+        Returns (x, y, rotated), or None if the room fits nowhere.
+        """
+        orientations = ((room.width, room.height), (room.height, room.width))
+        stages = []
+        for width, height in orientations:
+            adjacent = np.array([
+                position
+                for adj_x, adj_y, adj_width, adj_height in adjacent_rects
+                for position in ((adj_x + adj_width, adj_y), (adj_x - width, adj_y),
+                                 (adj_x, adj_y + adj_height), (adj_x, adj_y - height))
+            ], dtype=np.int64).reshape(-1, 2)
+            stages.append((adjacent, self._grid_anchors(width, height)))
+
+        positions = np.concatenate([stage for pair in stages for stage in pair])
+        sizes = np.repeat(np.array(orientations, dtype=np.int64),
+                          [len(adjacent) + len(anchors) for adjacent, anchors in stages], axis=0)
+        valid = self._valid_position_mask(room, positions, (sizes[:, 0], sizes[:, 1]))
+
+        start = 0
+        for rotated, ((width, height), (adjacent, anchors)) in enumerate(zip(orientations, stages)):
+            # Adjacency positions in order, then a random free anchor, then random sampling
+            adjacent_valid = np.flatnonzero(valid[start:start + len(adjacent)])
+            start += len(adjacent)
+            anchors_valid = np.flatnonzero(valid[start:start + len(anchors)])
+            start += len(anchors)
+            if len(adjacent_valid):
+                x, y = adjacent[adjacent_valid[0]]
+            elif len(anchors_valid):
+                x, y = anchors[random.choice(anchors_valid)]
+            else:
+                sampled = self._random_valid_positions(room, width, height)
+                if not len(sampled):
+                    continue
+                x, y = sampled[0]
+            return int(x), int(y), bool(rotated)
+
+        return None
+
     def get_adjacency_clusters(self):
         """
         Group rooms into connected components based on adjacency requirements
         Returns clusters ordered by size (largest first)
         """
-        visited = set()
-        clusters = []
-
-        for room in self.rooms:
-            if room.name not in visited:
-                # BFS to find connected component
-                cluster = []
-                queue = deque([room.name])
-                visited.add(room.name)
-
-                while queue:
-                    current_room = queue.popleft()
-                    cluster.append(current_room)
+        if not self.rooms:
+            return []
 
-                    # Add all unvisited neighbors
-                    for neighbor in self.adjacency_graph.neighbors(current_room):
-                        if neighbor not in visited:
-                            visited.add(neighbor)
-                            queue.append(neighbor)
-
-                clusters.append(cluster)
+        # Label every room with the index of its connected component
+        labels = np.empty(len(self.rooms), dtype=np.int64)
+        for label, component in enumerate(nx.connected_components(self.adjacency_graph)):
+            for name in component:
+                labels[self._rooms_by_name[name].idx] = label
 
         # Sort clusters by size (largest first) and then by total area
-        def cluster_priority(cluster):
-            total_area = sum(next(r for r in self.rooms if r.name == name).get_area()
-                             for name in cluster)
-            return (len(cluster), total_area)
+        areas = np.array([room.get_area() for room in self.rooms], dtype=np.int64)
+        sizes = np.bincount(labels)
+        total_areas = np.bincount(labels, weights=areas)
+        order = np.lexsort((-total_areas, -sizes))
 
-        clusters.sort(key=cluster_priority, reverse=True)
-        return clusters
+        return [[self.rooms[i].name for i in np.flatnonzero(labels == label)] for label in order]
 
     def place_cluster_bfs(self, cluster, placed_rooms):
         """
@@ -285,7 +460,7 @@ class FloorPlan:
         if not cluster:
             return True
 
-        cluster_rooms = [next(r for r in self.rooms if r.name == name) for name in cluster]
+        cluster_rooms = [self._rooms_by_name[name] for name in cluster]
 
         # If this is the first cluster or no rooms are placed yet
         if not placed_rooms:
@@ -302,7 +477,15 @@ class FloorPlan:
             center_y = max(best_region['y'],
                            min(center_y, best_region['y'] + best_region['height'] - start_room.height))
 
-            if (self.is_within_floor(center_x, center_y, start_room.width, start_room.height) and
+            # The clamp keeps the room inside best_region whenever it fits there; otherwise only a
+            # composite floor could still contain it
+            if start_room.width <= best_region['width'] and start_room.height <= best_region['height']:
+                within_floor = True
+            else:
+                within_floor = (len(self.floor_regions) > 1 and
+                                self.is_within_floor(center_x, center_y, start_room.width, start_room.height))
+
+            if (within_floor and
                     not self.check_overlap_optimized(start_room, center_x, center_y, start_room.width,
                                                      start_room.height)):
                 start_room.x = center_x
@@ -327,7 +510,7 @@ class FloorPlan:
 
         # Initialize queue with rooms that should be adjacent to already placed rooms
         for room_name in remaining_rooms:
-            for neighbor in self.adjacency_graph.neighbors(room_name):
+            for neighbor in self._neighbors(room_name):
                 if neighbor in placed_rooms:
                     queue.append(room_name)
                     break
@@ -338,20 +521,28 @@ class FloorPlan:
                                     key=lambda r: r.get_area())
             queue.append(largest_remaining.name)
 
+        # Mirror of the queue contents for O(1) membership tests
+        queued = set(queue)
+
         # BFS placement
         while queue and remaining_rooms:
             current_room_name = queue.popleft()
+            queued.discard(current_room_name)
 
             if current_room_name not in remaining_rooms:
                 continue
 
-            current_room = next(r for r in self.rooms if r.name == current_room_name)
+            current_room = self._rooms_by_name[current_room_name]
 
             # Get positions prioritizing adjacency to already placed neighbors
-            placed_neighbors = [neighbor for neighbor in self.adjacency_graph.neighbors(current_room_name)
+            placed_neighbors = [neighbor for neighbor in self._neighbors(current_room_name)
                                 if neighbor in placed_rooms]
 
-            valid_positions = self.get_valid_positions_for_adjacency(current_room, placed_neighbors)
+            # Placed neighbor rectangles don't change while this room is tried, so build them once
+            neighbor_rects = np.array([
+                (room.x, room.y, room.width, room.height)
+                for room in (self._rooms_by_name[name] for name in placed_neighbors)
+            ], dtype=np.int64).reshape(-1, 4)
 
             # Try both orientations
             placed = False
@@ -362,24 +553,12 @@ class FloorPlan:
                 valid_positions = self.get_valid_positions_for_adjacency(current_room, placed_neighbors)
 
                 if valid_positions:
-                    # Sort positions by adjacency score
-                    position_scores = []
-                    for x, y in valid_positions:
-                        temp_x, temp_y = current_room.x, current_room.y
-                        current_room.x, current_room.y = x, y
-
-                        # Count how many required adjacencies this position satisfies
-                        adjacency_score = 0
-                        for neighbor_name in placed_neighbors:
-                            neighbor_room = next(r for r in self.rooms if r.name == neighbor_name)
-                            if current_room.has_shared_wall_with(neighbor_room):
-                                adjacency_score += 1
-
-                        position_scores.append(((x, y), adjacency_score))
-                        current_room.x, current_room.y = temp_x, temp_y
+                    # Count how many required adjacencies each position satisfies
+                    scores = score_positions(np.array(valid_positions, dtype=np.int64),
+                                             current_room.width, current_room.height, neighbor_rects)
 
                     # Sort by adjacency score (highest first)
-                    position_scores.sort(key=lambda x: x[1], reverse=True)
+                    position_scores = [(valid_positions[i], scores[i]) for i in np.argsort(-scores, kind='stable')]
 
                     # Try the best positions
                     for (x, y), score in position_scores[:5]:  # Try top 5 positions
@@ -391,9 +570,10 @@ class FloorPlan:
                         placed = True
 
                         # Add unplaced neighbors to queue
-                        for neighbor in self.adjacency_graph.neighbors(current_room_name):
-                            if neighbor in remaining_rooms and neighbor not in [item for item in queue]:
+                        for neighbor in self._neighbors(current_room_name):
+                            if neighbor in remaining_rooms and neighbor not in queued:
                                 queue.append(neighbor)
+                                queued.add(neighbor)
 
                         break
 
@@ -405,32 +585,37 @@ class FloorPlan:
 
         return len(remaining_rooms) == 0
 
-    def get_valid_positions_for_adjacency(self, room, placed_neighbors, max_positions=30):
+    def get_valid_positions_for_adjacency(self, room, placed_neighbors, max_positions=30, max_wall_offsets=6):
         """
-        Get valid positions prioritizing adjacency to specific placed neighbors
+        Get valid positions prioritizing adjacency to specific placed neighbors.
+        At most max_wall_offsets partial-wall offsets are tried per neighbor side.
         """
-        valid_positions = []
-
         # Get neighbor rooms
         neighbor_rooms = []
         for neighbor_name in placed_neighbors:
-            neighbor_room = next(r for r in self.rooms if r.name == neighbor_name)
+            neighbor_room = self._rooms_by_name[neighbor_name]
             if neighbor_room.x is not None:
                 neighbor_rooms.append(neighbor_room)
 
-        # Generate positions adjacent to neighbors
+        # Generate positions adjacent to neighbors (dict keys dedupe while keeping order)
+        potential_positions = {}
         for neighbor_room in neighbor_rooms:
             # Try all four sides of the neighbor
-            potential_positions = [
+            potential_positions.update(dict.fromkeys([
                 (neighbor_room.x + neighbor_room.width, neighbor_room.y),  # Right
                 (neighbor_room.x - room.width, neighbor_room.y),  # Left
                 (neighbor_room.x, neighbor_room.y + neighbor_room.height),  # Above
                 (neighbor_room.x, neighbor_room.y - room.height),  # Below
-            ]
-
-            # Also try positions that share partial walls
-            for offset in range(1, min(neighbor_room.width, neighbor_room.height)):
-                potential_positions.extend([
+            ]))
+
+            # Also try positions that share partial walls, using a few spread-out offsets
+            # (plus those aligning this room's far edge) instead of every unit offset
+            min_dim = min(neighbor_room.width, neighbor_room.height)
+            offsets = sorted(offset for offset in {1, min_dim // 4, min_dim // 2, 3 * min_dim // 4, min_dim - 1,
+                                                   room.width - 1, room.height - 1}
+                             if 1 <= offset < min_dim)[:max_wall_offsets]
+            for offset in offsets:
+                potential_positions.update(dict.fromkeys([
                     (neighbor_room.x + neighbor_room.width, neighbor_room.y + offset),
                     (neighbor_room.x + neighbor_room.width, neighbor_room.y - offset),
                     (neighbor_room.x - room.width, neighbor_room.y + offset),
@@ -439,86 +624,162 @@ class FloorPlan:
                     (neighbor_room.x - offset, neighbor_room.y + neighbor_room.height),
                     (neighbor_room.x + offset, neighbor_room.y - room.height),
                     (neighbor_room.x - offset, neighbor_room.y - room.height),
-                ])
+                ]))
 
-            for x, y in potential_positions:
-                if (self.is_within_floor(x, y, room.width, room.height) and
-                        not self.check_overlap_optimized(room, x, y, room.width, room.height) and
-                        (x, y) not in valid_positions):
-                    valid_positions.append((x, y))
-
-                    if len(valid_positions) >= max_positions:
-                        return valid_positions
+        # Validate all candidates in one batch
+        candidates = np.array(list(potential_positions), dtype=np.int64).reshape(-1, 2)
+        valid = candidates[self._valid_position_mask(room, candidates)][:max_positions]
+        valid_positions = [(int(x), int(y)) for x, y in valid]
 
         # If we need more positions, add some random ones
         if len(valid_positions) < max_positions:
+            seen = set(valid_positions)
             additional_positions = self.get_valid_positions(room, max_positions - len(valid_positions))
             for pos in additional_positions:
-                if pos not in valid_positions:
+                if pos not in seen:
+                    seen.add(pos)
                     valid_positions.append(pos)
 
         return valid_positions
 
+    def _valid_position_mask(self, room, positions, size=None):
+        """
+        Vectorized is_within_floor and overlap test for an (N, 2) array of candidate
+        positions of a room. size optionally overrides the room's (width, height), either
+        as scalars or as per-candidate arrays. Returns a boolean array marking the valid positions.
+        """
+        xs, ys = positions[:, 0], positions[:, 1]
+        width, height = size if size is not None else (room.width, room.height)
+        right, top = xs + width, ys + height
+        valid = self.is_within_floor_batch(xs, ys, width, height)
+
+        # Overlap against every other placed room, candidates x rooms
+        others = self._placed.copy()
+        others[room.idx] = False
+        ox, oy, ow, oh = self._rx[others], self._ry[others], self._rw[others], self._rh[others]
+        overlap = ((xs[:, None] < ox + ow) & (right[:, None] > ox) &
+                   (ys[:, None] < oy + oh) & (top[:, None] > oy)).any(axis=1)
+
+        return valid & ~overlap
+
     def add_room(self, name, width, height, max_expansion=20):
         """Add a room with specified dimensions and maximum expansion limit"""
         room = Room(name, width, height, max_expansion)
+        room.idx = len(self.rooms)
         self.rooms.append(room)
+        self._rooms_by_name.setdefault(name, room)
+        self._rx = np.append(self._rx, np.int32(0))
+        self._ry = np.append(self._ry, np.int32(0))
+        self._rw = np.append(self._rw, np.int32(0))
+        self._rh = np.append(self._rh, np.int32(0))
+        self._rrot = np.append(self._rrot, False)
+        self._placed = np.append(self._placed, False)
+        self._adjacency_matrix = None
+        self._edge_index = None
         self.adjacency_graph.add_node(name)
         return room
 
     def add_adjacency(self, room1_name, room2_name):
         if room1_name in self.adjacency_graph.nodes and room2_name in self.adjacency_graph.nodes:
             self.adjacency_graph.add_edge(room1_name, room2_name)
+            self._neighbor_cache.clear()
+            self._adjacency_matrix = None
+            self._edge_index = None
+
+    def _neighbors(self, room_name):
+        """Cached tuple of rooms that must be adjacent to the given room"""
+        neighbors = self._neighbor_cache.get(room_name)
+        if neighbors is None:
+            neighbors = tuple(self.adjacency_graph.neighbors(room_name))
+            self._neighbor_cache[room_name] = neighbors
+        return neighbors
+
+    def _get_adjacency_matrix(self):
+        """Boolean matrix where [i, j] is True if rooms i and j must be adjacent"""
+        if self._adjacency_matrix is None:
+            matrix = np.zeros((len(self.rooms), len(self.rooms)), dtype=bool)
+            for room1_name, room2_name in self.adjacency_graph.edges:
+                i, j = self._rooms_by_name[room1_name].idx, self._rooms_by_name[room2_name].idx
+                matrix[i, j] = matrix[j, i] = True
+            self._adjacency_matrix = matrix
+        return self._adjacency_matrix
+
+    def _get_edge_index(self):
+        """Adjacency edges as a list of name pairs plus an (E, 2) array of room indices"""
+        if self._edge_index is None:
+            edges = list(self.adjacency_graph.edges)
+            index = np.array([(self._rooms_by_name[room1_name].idx, self._rooms_by_name[room2_name].idx)
+                              for room1_name, room2_name in edges], dtype=np.int64).reshape(-1, 2)
+            self._edge_index = (edges, index)
+        return self._edge_index
 
     def is_within_floor(self, x, y, width, height):
         """Check if a rectangle fits within the entire composite floor shape"""
-        for dx in range(width):
-            for dy in range(height):
-                px = x + dx
-                py = y + dy
+        right, top = x + width, y + height
 
-                if not self.point_in_floor(px, py):
-                    return False
-        return True
+        # Fast path: the rectangle lies entirely inside a single region
+        for left, bottom, region_right, region_top in self._region_bounds:
+            if left <= x and right <= region_right and bottom <= y and top <= region_top:
+                return True
+
+        if len(self.floor_regions) == 1:
+            return False
+
+        # Composite shape: every cell under the rectangle must be floor
+        mx, my = x - self._mask_x0, y - self._mask_y0
+        if mx < 0 or my < 0 or right > self.floor_width or top > self.floor_height:
+            return False
+        return bool(self._floor_mask[my:my + height, mx:mx + width].all())
+
+    def is_within_floor_batch(self, xs, ys, width, height):
+        """
+        Vectorized is_within_floor for arrays of x and y; width and height may be scalars
+        or per-rectangle arrays. Returns a boolean array.
+        """
+        # The rectangle must lie in the mask bounds and be fully covered, which the
+        # integral image answers with four lookups per rectangle
+        mx, my = xs - self._mask_x0, ys - self._mask_y0
+        inside = (mx >= 0) & (my >= 0) & (xs + width <= self.floor_width) & (ys + height <= self.floor_height)
+        x0, y0 = np.where(inside, mx, 0), np.where(inside, my, 0)
+        x1, y1 = np.where(inside, mx + width, 0), np.where(inside, my + height, 0)
+        integral = self._floor_integral
+        covered = integral[y1, x1] - integral[y0, x1] - integral[y1, x0] + integral[y0, x0]
+        return inside & (covered == width * height)
 
     def point_in_floor(self, x, y):
         """Check if a point is within any of the defined floor regions"""
-        for region in self.floor_regions:
-            if (region['x'] <= x < region['x'] + region['width'] and
-                    region['y'] <= y < region['y'] + region['height']):
-                return True
-        return False
+        mx, my = x - self._mask_x0, y - self._mask_y0
+        if mx < 0 or my < 0 or x >= self.floor_width or y >= self.floor_height:
+            return False
+        return bool(self._floor_mask[my, mx])
 
     def check_overlap(self, room, x, y, width, height):
         """Check if placing a room at (x,y) with given width/height would overlap with existing rooms"""
-        for existing_room in self.rooms:
-            if existing_room.x is not None and existing_room != room:
-                # Check for overlap - two rectangles overlap if they overlap in both x and y directions
-                if (x < existing_room.x + existing_room.width and
-                        x + width > existing_room.x and
-                        y < existing_room.y + existing_room.height and
-                        y + height > existing_room.y):
-                    return True
-        return False
+        # Two rectangles overlap if they overlap in both x and y directions
+        mask = ((x < self._rx + self._rw) & (x + width > self._rx) &
+                (y < self._ry + self._rh) & (y + height > self._ry) & self._placed)
+        mask[room.idx] = False
+        return bool(mask.any())
 
     def evaluate_adjacency_score(self):
         """Calculate how well adjacency requirements are met"""
-        score = 0
-        adjacent_pairs = []
+        edges, edge_index = self._get_edge_index()
+        if not edges:
+            return 0, []
 
-        for room1_name, room2_name in self.adjacency_graph.edges:
-            room1 = next(r for r in self.rooms if r.name == room1_name)
-            room2 = next(r for r in self.rooms if r.name == room2_name)
-
-            if room1.x is None or room2.x is None:
-                continue
+        # Read positions from the rooms themselves: callers such as the GUI restore path
+        # set them directly, without going through the spatial grid
+        placed = np.array([room.x is not None for room in self.rooms], dtype=bool)
+        rects = np.array([(room.x, room.y, room.width, room.height) if room.x is not None else (0, 0, 0, 0)
+                          for room in self.rooms], dtype=np.int64)
 
-            # Check if rooms share a wall
-            if room1.has_shared_wall_with(room2):
-                score += 1
-                adjacent_pairs.append((room1_name, room2_name))
+        # Test every required adjacency at once
+        a, b = rects[edge_index[:, 0]], rects[edge_index[:, 1]]
+        satisfied = (placed[edge_index[:, 0]] & placed[edge_index[:, 1]] &
+                     shared_walls(a[:, 0], a[:, 1], a[:, 2], a[:, 3], b[:, 0], b[:, 1], b[:, 2], b[:, 3]))
 
-        return score, adjacent_pairs
+        adjacent_pairs = [edges[i] for i in np.flatnonzero(satisfied)]
+        return len(adjacent_pairs), adjacent_pairs
 
     def can_expand_room(self, room, direction, amount):
         """Check if a room can be expanded in the given direction by the specified amount"""
@@ -559,7 +820,7 @@ class FloorPlan:
         if not self.is_within_floor(new_x, new_y, new_width, new_height):
             return False
 
-        if self.check_overlap(room, new_x, new_y, new_width, new_height):
+        if self.check_overlap_optimized(room, new_x, new_y, new_width, new_height):
             return False
 
         return True
@@ -570,36 +831,93 @@ class FloorPlan:
         and ensuring no overlaps, respecting each room's max_expansion limit
         """
         # For each room, attempt expansion in each direction
-        for room in self.rooms:
+        for room, directions in zip(self.rooms, self._direction_orders()):
             if room.x is None or room.y is None:
                 continue
 
-            # Try to expand in all four directions
-            directions = ['right', 'down', 'left', 'up']
-            random.shuffle(directions)  # Randomize direction order for more varied results
-
+            # Try to expand in all four directions, in a random order for more varied results
             for direction in directions:
-                # Try expanding 1 unit at a time up to max expansion
-                expanded = True
-                total_expansion = 0
-
-                while expanded:
-                    if self.can_expand_room(room, direction, 1):
-                        # Apply 1 unit expansion
-                        if direction == 'right':
-                            room.width += 1
-                        elif direction == 'left':
-                            room.x -= 1
-                            room.width += 1
-                        elif direction == 'up':
-                            room.height += 1
-                        elif direction == 'down':
-                            room.y -= 1
-                            room.height += 1
-
-                        total_expansion += 1
-                    else:
-                        expanded = False
+                amount = self._expansion_limit(room, direction)
+                if amount:
+                    old_cells = self._get_grid_cells(room.x, room.y, room.width, room.height)
+                    self._grow_room(room, direction, amount)
+
+                    # Keep the grid accurate so later overlap checks see the grown room
+                    self._move_in_spatial_grid(
+                        room, old_cells, self._get_grid_cells(room.x, room.y, room.width, room.height))
+
+    def _direction_orders(self):
+        """One random order of the four expansion directions per room, drawn as a single batch"""
+        directions = ('right', 'down', 'left', 'up')
+        orders = self._rng.permuted(np.tile(np.arange(4), (len(self.rooms), 1)), axis=1)
+        return [[directions[i] for i in order] for order in orders.tolist()]
+
+    def _expansion_limit(self, room, direction):
+        """
+        Largest amount the room can legally grow towards direction (as can_expand_room decides),
+        computed in one step: the smallest of its remaining expansion budget, the run of whole
+        floor rows/columns past that side, and the gap to the nearest placed room in the way
+        """
+        if room.x is None or room.y is None:
+            return 0
+        x, y, width, height = room.x, room.y, room.width, room.height
+
+        if not room.rotated:
+            budget = room.max_expansion - (width - room.original_width) - (height - room.original_height)
+        else:
+            budget = room.max_expansion - (width - room.original_height) - (height - room.original_width)
+        if budget <= 0 or not self.is_within_floor(x, y, width, height):
+            return 0
+
+        # Floor: leading run of fully covered columns/rows beyond the growing side
+        mx, my = x - self._mask_x0, y - self._mask_y0
+        mask = self._floor_mask
+        if direction == 'right':
+            free = mask[my:my + height, mx + width:].all(axis=0)
+        elif direction == 'left':
+            free = mask[my:my + height, :mx].all(axis=0)[::-1]
+        elif direction == 'up':
+            free = mask[my + height:, mx:mx + width].all(axis=1)
+        elif direction == 'down':
+            free = mask[:my, mx:mx + width].all(axis=1)[::-1]
+        else:
+            return 0
+        limit = min(budget, len(free) if free.all() else int(free.argmin()))
+
+        # Rooms: other placed rooms overlapping the room's span across the direction block it
+        others = self._placed.copy()
+        others[room.idx] = False
+        ox, oy, ow, oh = self._rx, self._ry, self._rw, self._rh
+        if direction == 'right':
+            in_way = others & (oy < y + height) & (oy + oh > y) & (ox + ow > x)
+            gaps = ox - (x + width)
+        elif direction == 'left':
+            in_way = others & (oy < y + height) & (oy + oh > y) & (ox < x + width)
+            gaps = x - (ox + ow)
+        elif direction == 'up':
+            in_way = others & (ox < x + width) & (ox + ow > x) & (oy + oh > y)
+            gaps = oy - (y + height)
+        else:
+            in_way = others & (ox < x + width) & (ox + ow > x) & (oy < y + height)
+            gaps = y - (oy + oh)
+        if in_way.any():
+            limit = min(limit, max(int(gaps[in_way].min()), 0))
+
+        return limit
+
+    @staticmethod
+    def _grow_room(room, direction, amount):
+        """Grow a room by amount units towards the given direction"""
+        if direction == 'right':
+            room.width += amount
+        elif direction == 'left':
+            room.x -= amount
+            room.width += amount
+        elif direction == 'up':
+            room.height += amount
+        elif direction == 'down':
+            room.y -= amount
+            room.height += amount
 
     def place_rooms_bfs_with_backtracking(self, max_depth=None, max_positions_per_room=25, enable_expansion=True,
                                           timeout_seconds=30):
@@ -612,7 +930,7 @@ class FloorPlan:
         start_time = time.time()
 
         # Clear spatial grid and reset rooms
-        self.spatial_grid = {}
+        self._reset_spatial_grid()
         for room in self.rooms:
             room.x = None
             room.y = None
@@ -621,18 +939,22 @@ class FloorPlan:
         # Sort rooms by constraint priority (most constrained first)
         room_constraints = {}
         for room in self.rooms:
-            room_constraints[room.name] = len(list(self.adjacency_graph.neighbors(room.name)))
+            room_constraints[room.name] = len(self._neighbors(room.name))
 
         sorted_rooms = sorted(self.rooms,
-                              key=lambda r: (room_constraints[r.name], r.get_area()),
+                              key=lambda r: (room_constraints[r.name], r.original_area),
                               reverse=True)
 
         if max_depth is None:
             max_depth = len(sorted_rooms)
+        total_edges = self.adjacency_graph.number_of_edges()
 
         # BFS queue: (room_index, placement_state)
-        initial_state = PlacementState()
+        cell_bounds = (self._mask_x0 // self.grid_size, self._mask_y0 // self.grid_size,
+                       (self.floor_width - 1) // self.grid_size + 1, (self.floor_height - 1) // self.grid_size + 1)
+        initial_state = PlacementState(len(self.rooms), cell_bounds, self.grid_size)
         queue = deque([(0, initial_state)])
+        state_pool = PlacementStatePool()
 
         best_score = -1
         best_placement = None
@@ -657,14 +979,16 @@ class FloorPlan:
                     best_placement = self._capture_current_placement()
 
                 # If perfect score, we can stop
-                if score == len(self.adjacency_graph.edges):
+                if score == total_edges:
                     print(f"Perfect solution found! Explored {nodes_explored} nodes")
                     return True
 
+                state_pool.release(current_state)
                 continue
 
             # Skip if we've exceeded max depth
             if room_idx >= max_depth:
+                state_pool.release(current_state)
                 continue
 
             current_room = sorted_rooms[room_idx]
@@ -685,7 +1009,7 @@ class FloorPlan:
                     # Check if this position is valid with current state
                     if self._is_position_valid_with_state(current_room, x, y, current_state):
                         # Create new state with this room placed
-                        new_state = current_state.copy()
+                        new_state = state_pool.copy(current_state)
                         new_state.add_room(current_room, x, y, current_room.width, current_room.height, rotated)
 
                         # Add to queue for next room
@@ -695,10 +1019,13 @@ class FloorPlan:
                 if rotated:
                     current_room.rotate()
 
+            # Every child copied what it needs, so this node's state can be recycled
+            state_pool.release(current_state)
+
         print(f"BFS completed. Explored {nodes_explored} nodes in {time.time() - start_time:.2f} seconds")
 
         # Apply best placement found
-        if best_placement:
+        if best_placement is not None:
             self._apply_placement_data(best_placement)
             print(f"Best adjacency score: {best_score}/{len(self.adjacency_graph.edges)}")
             return True
@@ -708,18 +1035,14 @@ class FloorPlan:
     def _get_valid_positions_with_state(self, room, current_state, max_positions):
         """Get valid positions considering current placement state"""
         valid_positions = []
+        seen = set()  # Mirrors valid_positions for O(1) duplicate checks
 
         # Get rooms that should be adjacent and are already placed
-        adjacent_rooms = []
-        for neighbor_name in self.adjacency_graph.neighbors(room.name):
-            for placement in current_state.placements:
-                if placement[0] == neighbor_name:  # room_name matches
-                    adjacent_rooms.append(placement)
-                    break
+        adjacent_idx = np.flatnonzero(current_state.placed & self._get_adjacency_matrix()[room.idx])
 
         # Prioritize positions near already placed adjacent rooms
-        if adjacent_rooms:
-            for adj_name, adj_x, adj_y, adj_w, adj_h, adj_rot in adjacent_rooms:
+        if len(adjacent_idx):
+            for adj_x, adj_y, adj_w, adj_h, adj_rot in current_state.xywhr[adjacent_idx].tolist():
                 positions = [
                     (adj_x + adj_w, adj_y),  # Right
                     (adj_x - room.width, adj_y),  # Left
@@ -728,10 +1051,10 @@ class FloorPlan:
                 ]
 
                 for x, y in positions:
-                    if (self.is_within_floor(x, y, room.width, room.height) and
-                            self._is_position_valid_with_state(room, x, y, current_state) and
-                            (x, y) not in valid_positions):
+                    if ((x, y) not in seen and
+                            self._is_position_valid_with_state(room, x, y, current_state)):
                         valid_positions.append((x, y))
+                        seen.add((x, y))
 
                         if len(valid_positions) >= max_positions:
                             return valid_positions
@@ -753,9 +1076,10 @@ class FloorPlan:
                 x = random.randint(region['x'], max_x)
                 y = random.randint(region['y'], max_y)
 
-                if (self._is_position_valid_with_state(room, x, y, current_state) and
-                        (x, y) not in valid_positions):
+                if ((x, y) not in seen and
+                        self._is_position_valid_with_state(room, x, y, current_state)):
                     valid_positions.append((x, y))
+                    seen.add((x, y))
 
         return valid_positions
 
@@ -766,53 +1090,58 @@ class FloorPlan:
             return False
 
         # Check overlap with already placed rooms using grid cells
-        room_cells = set(current_state._get_grid_cells(x, y, room.width, room.height))
-
-        if room_cells.intersection(current_state.occupied_cells):
-            return False
-
-        return True
+        return current_state.is_free(x, y, room.width, room.height)
 
     def _apply_placement_state(self, placement_state):
         """Apply a placement state to the actual rooms"""
-        self.spatial_grid = {}
-
-        for room_name, x, y, width, height, rotated in placement_state.placements:
-            room = next(r for r in self.rooms if r.name == room_name)
-            room.x = x
-            room.y = y
-            room.width = width
-            room.height = height
-            room.rotated = rotated
-            self._add_to_spatial_grid(room)
+        placed_idx = np.flatnonzero(placement_state.placed)
+        self._unplace_rooms_except(set(placed_idx.tolist()))
+
+        for i in placed_idx:
+            x, y, width, height, rotated = placement_state.xywhr[i].tolist()
+            self._move_room(self.rooms[i], x, y, width, height, bool(rotated))
 
     def _capture_current_placement(self):
-        """Capture current room placements"""
-        return [
-            (room.name, room.x, room.y, room.width, room.height, room.rotated, room.max_expansion)
-            for room in self.rooms if room.x is not None
-        ]
+        """Capture current room placements as (placed mask, (N, 5) array of x, y, width, height, rotated)"""
+        return self._placed.copy(), np.stack((self._rx, self._ry, self._rw, self._rh, self._rrot), axis=1)
 
     def _apply_placement_data(self, placement_data):
         """Apply captured placement data"""
-        self.spatial_grid = {}
-        for room_data in placement_data:
-            name, x, y, width, height, rotated, max_expansion = room_data
-            room = next(r for r in self.rooms if r.name == name)
-            room.x = x
-            room.y = y
-            room.width = width
-            room.height = height
-            room.rotated = rotated
-            room.max_expansion = max_expansion
-            self._add_to_spatial_grid(room)
+        placed, rects = placement_data
+        placed_idx = np.flatnonzero(placed)
+        self._unplace_rooms_except(set(placed_idx.tolist()))
+
+        for i in placed_idx:
+            x, y, width, height, rotated = rects[i].tolist()
+            self._move_room(self.rooms[i], x, y, width, height, bool(rotated))
+
+    def _move_room(self, room, x, y, width, height, rotated):
+        """Set a room's placement, touching the spatial grid only if the placement changed"""
+        if self._placed[room.idx]:
+            if (room.x, room.y, room.width, room.height, room.rotated) == (x, y, width, height, rotated):
+                return
+            self._remove_from_spatial_grid(room)
+
+        room.x = x
+        room.y = y
+        room.width = width
+        room.height = height
+        room.rotated = rotated
+        self._add_to_spatial_grid(room)
+
+    def _unplace_rooms_except(self, keep_idx):
+        """Take every gridded room whose index is not in keep_idx out of the spatial grid"""
+        for i in np.flatnonzero(self._placed):
+            if i not in keep_idx:
+                self._remove_from_spatial_grid(self.rooms[i])
+                self._placed[i] = False
 
     def place_rooms_with_constraints_optimized(self, max_attempts=100, enable_expansion=True):
         """
         Optimized room placement using constraint satisfaction and spatial indexing
         """
         # Clear spatial grid
-        self.spatial_grid = {}
+        self._reset_spatial_grid()
 
         # Reset all rooms
         for room in self.rooms:
@@ -823,18 +1152,19 @@ class FloorPlan:
         # Sort rooms by constraint priority (rooms with more adjacency requirements first)
         room_constraints = {}
         for room in self.rooms:
-            room_constraints[room.name] = len(list(self.adjacency_graph.neighbors(room.name)))
+            room_constraints[room.name] = len(self._neighbors(room.name))
 
         sorted_rooms = sorted(self.rooms,
-                              key=lambda r: (room_constraints[r.name], r.get_area()),
+                              key=lambda r: (room_constraints[r.name], r.original_area),
                               reverse=True)
 
+        total_edges = self.adjacency_graph.number_of_edges()
         best_score = -1
         best_placement = None
 
         for attempt in range(max_attempts):
             # Reset placements
-            self.spatial_grid = {}
+            self._reset_spatial_grid()
             for room in self.rooms:
                 room.x = None
                 room.y = None
@@ -842,38 +1172,25 @@ class FloorPlan:
                 if random.random() > 0.5:
                     room.rotate()
 
-            # Use constraint satisfaction approach
+            # Use constraint satisfaction approach; placed rooms don't move until expansion,
+            # so each room's placed neighbors are recorded as they land instead of re-scanned
             placement_successful = True
+            adjacent_rects = defaultdict(list)
 
             for room in sorted_rooms:
-                placed = False
-
-                # Get valid positions for this room
-                valid_positions = self.get_valid_positions(room, max_positions=30)
-
-                # Try original orientation
-                for x, y in valid_positions:
-                    room.x = x
-                    room.y = y
-                    self._add_to_spatial_grid(room)
-                    placed = True
+                # First valid position, trying the rotated orientation only if the current one fails
+                position = self._first_valid_position(room, adjacent_rects[room.name])
+                if position is None:
+                    placement_successful = False
                     break
 
-                # If not placed, try rotated
-                if not placed:
+                room.x, room.y, rotated = position
+                if rotated:
                     room.rotate()
-                    valid_positions = self.get_valid_positions(room, max_positions=30)
-
-                    for x, y in valid_positions:
-                        room.x = x
-                        room.y = y
-                        self._add_to_spatial_grid(room)
-                        placed = True
-                        break
+                self._add_to_spatial_grid(room)
 
-                if not placed:
-                    placement_successful = False
-                    break
+                for neighbor in self._neighbors(room.name):
+                    adjacent_rects[neighbor].append((room.x, room.y, room.width, room.height))
 
             if placement_successful:
                 # Apply expansion if enabled
@@ -885,28 +1202,15 @@ class FloorPlan:
 
                 if score > best_score:
                     best_score = score
-                    best_placement = [
-                        (room.name, room.x, room.y, room.width, room.height, room.rotated, room.max_expansion)
-                        for room in self.rooms
-                    ]
+                    best_placement = self._capture_current_placement()
 
                 # Early exit if all constraints satisfied
-                if score == len(self.adjacency_graph.edges):
+                if score == total_edges:
                     break
 
         # Restore best placement
-        if best_placement:
-            self.spatial_grid = {}
-            for room_data in best_placement:
-                name, x, y, width, height, rotated, max_expansion = room_data
-                room = next(r for r in self.rooms if r.name == name)
-                room.x = x
-                room.y = y
-                room.width = width
-                room.height = height
-                room.rotated = rotated
-                room.max_expansion = max_expansion
-                self._add_to_spatial_grid(room)
+        if best_placement is not None:
+            self._apply_placement_data(best_placement)
             return True
 
         return False
@@ -914,7 +1218,7 @@ class FloorPlan:
 
     def expand_rooms_optimized(self):
         """Optimized room expansion using spatial grid"""
-        for room in self.rooms:
+        for room, directions in zip(self.rooms, self._direction_orders()):
             if room.x is None or room.y is None:
                 continue
 
@@ -922,24 +1226,10 @@ class FloorPlan:
             self._remove_from_spatial_grid(room)
 
             # Try expansion in each direction
-            directions = ['right', 'down', 'left', 'up']
-            random.shuffle(directions)
-
             for direction in directions:
-                # Try expanding in larger increments first, then smaller
-                for increment in [5, 3, 2, 1]:
-                    while self.can_expand_room_optimized(room, direction, increment):
-                        # Apply expansion
-                        if direction == 'right':
-                            room.width += increment
-                        elif direction == 'left':
-                            room.x -= increment
-                            room.width += increment
-                        elif direction == 'up':
-                            room.height += increment
-                        elif direction == 'down':
-                            room.y -= increment
-                            room.height += increment
+                # Grow straight to the largest legal amount instead of stepping in fixed increments
+                amount = self._expansion_limit(room, direction)
+                self._grow_room(room, direction, amount)
 
             # Add back to spatial grid
             self._add_to_spatial_grid(room)
@@ -991,59 +1281,58 @@ class FloorPlan:
         """Visualize the floor plan using matplotlib"""
         fig, ax = plt.subplots(figsize=(10, 8))
 
-        # Draw floor shape
-        for region in self.floor_regions:
-            rect = patches.Rectangle(
-                (region['x'], region['y']),
-                region['width'],
-                region['height'],
-                linewidth=2,
-                edgecolor='black',
-                facecolor='none',
-                linestyle='--'
-            )
-            ax.add_patch(rect)
-
-        # Draw rooms
+        # Draw floor shape as a single collection
+        ax.add_collection(PatchCollection(
+            [patches.Rectangle((region['x'], region['y']), region['width'], region['height'])
+             for region in self.floor_regions],
+            linewidths=2,
+            edgecolors='black',
+            facecolors='none',
+            linestyles='--'
+        ))
+
+        # Draw rooms, also as one collection
         colors = plt.cm.tab20(np.linspace(0, 1, len(self.rooms)))
-        for i, room in enumerate(self.rooms):
-            if room.x is not None and room.y is not None:
-                rect = patches.Rectangle(
-                    (room.x, room.y),
-                    room.width,
-                    room.height,
-                    linewidth=1,
-                    edgecolor='black',
-                    facecolor=colors[i],
-                    alpha=0.7
-                )
-                ax.add_patch(rect)
-
-                # Add room name, size, and expansion info
-                original_size = f"{room.original_width}x{room.original_height}"
-                current_size = f"{room.width}x{room.height}"
-                display_text = f"{room.name}\n{current_size}"
-
-                # Add expansion info if expanded
-                if room.width != room.original_width or room.height != room.original_height:
-                    if room.rotated:
-                        display_text += f"\n(from {room.original_height}x{room.original_width})"
-                    else:
-                        display_text += f"\n(from {original_size})"
-
-                ax.text(
-                    room.x + room.width / 2,
-                    room.y + room.height / 2,
-                    display_text,
-                    ha='center',
-                    va='center',
-                    fontsize=8
-                )
+        placed_rooms = [i for i, room in enumerate(self.rooms) if room.x is not None and room.y is not None]
+        ax.add_collection(PatchCollection(
+            [patches.Rectangle((self.rooms[i].x, self.rooms[i].y), self.rooms[i].width, self.rooms[i].height)
+             for i in placed_rooms],
+            linewidths=1,
+            edgecolors='black',
+            facecolors=colors[placed_rooms],
+            alpha=0.7
+        ))
+
+        for i in placed_rooms:
+            room = self.rooms[i]
+
+            # Add room name, size, and expansion info
+            original_size = f"{room.original_width}x{room.original_height}"
+            current_size = f"{room.width}x{room.height}"
+            display_text = f"{room.name}\n{current_size}"
+
+            # Add expansion info if expanded
+            if room.width != room.original_width or room.height != room.original_height:
+                if room.rotated:
+                    display_text += f"\n(from {room.original_height}x{room.original_width})"
+                else:
+                    display_text += f"\n(from {original_size})"
+
+            ax.text(
+                room.x + room.width / 2,
+                room.y + room.height / 2,
+                display_text,
+                ha='center',
+                va='center',
+                fontsize=8
+            )
 
-        # Add adjacency relationships as dotted lines between room centers
+        # Add adjacency relationships as lines between room centers: solid green where the
+        # rooms share a wall, dotted red otherwise, each kind drawn as one collection
+        satisfied, unsatisfied = [], []
         for room1_name, room2_name in self.adjacency_graph.edges:
-            room1 = next(r for r in self.rooms if r.name == room1_name)
-            room2 = next(r for r in self.rooms if r.name == room2_name)
+            room1 = self._rooms_by_name[room1_name]
+            room2 = self._rooms_by_name[room2_name]
 
             if room1.x is not None and room2.x is not None:
                 center1 = (room1.x + room1.width / 2, room1.y + room1.height / 2)
@@ -1051,9 +1340,12 @@ class FloorPlan:
 
                 # Check if rooms share a wall
                 if room1.has_shared_wall_with(room2):
-                    ax.plot([center1[0], center2[0]], [center1[1], center2[1]], 'g-', linewidth=1.5)
+                    satisfied.append((center1, center2))
                 else:
-                    ax.plot([center1[0], center2[0]], [center1[1], center2[1]], 'r:', linewidth=0.8)
+                    unsatisfied.append((center1, center2))
+
+        ax.add_collection(LineCollection(satisfied, colors='g', linestyles='-', linewidths=1.5))
+        ax.add_collection(LineCollection(unsatisfied, colors='r', linestyles=':', linewidths=0.8))
 
         # Set limits and labels
         max_width = self.floor_width
@@ -1104,40 +1396,83 @@ class FloorPlan:
 class PlacementState:
     """Represents the state of room placements during BFS"""
 
-    def __init__(self):
-        self.placements = []  # List of (room_name, x, y, width, height, rotated)
-        self.occupied_cells = set()  # Set of occupied grid cells
+    def __init__(self, num_rooms, cell_bounds=(0, 0, 0, 0), grid_size=2):
+        """cell_bounds: (gx0, gy0, gx1, gy1) half-open range of grid cells covering the floor"""
+        self.placed = np.zeros(num_rooms, dtype=bool)  # placed[room.idx] is True once the room has a position
+        self.xywhr = np.zeros((num_rooms, 5), dtype=np.int32)  # Rows of (x, y, width, height, rotated)
+
+        # Occupied grid cells as an int bitmap, bit (gx - gx0) * rows + (gy - gy0)
+        self.occupied = 0
+        self.cell_bounds = cell_bounds
+        self.grid_size = grid_size
+        self._cell_masks = {}  # (x, y, width, height) -> bitmap of its cells, shared between copies
 
     def add_room(self, room, x, y, width, height, rotated):
         """Add a room placement to this state"""
-        self.placements.append((room.name, x, y, width, height, rotated))
-
-        # Add occupied cells (using same grid logic as spatial_grid)
-        cells = self._get_grid_cells(x, y, width, height)
-        self.occupied_cells.update(cells)
+        self.placed[room.idx] = True
+        self.xywhr[room.idx] = (x, y, width, height, rotated)
+
+        # Mark occupied cells (using same grid logic as spatial_grid)
+        self.occupied |= self.cell_mask(x, y, width, height)
+
+    def is_free(self, x, y, width, height):
+        """True if no grid cell under the rectangle is occupied"""
+        return not self.occupied & self.cell_mask(x, y, width, height)
+
+    def cell_mask(self, x, y, width, height):
+        """Bitmap of the grid cells covered by a rectangle inside the floor"""
+        key = (x, y, width, height)
+        mask = self._cell_masks.get(key)
+        if mask is None:
+            grid_size = self.grid_size
+            gx0, gy0, _, gy1 = self.cell_bounds
+            rows = gy1 - gy0
+            gy_start = y // grid_size - gy0
+            column = ((1 << ((y + height - 1) // grid_size - gy0 + 1 - gy_start)) - 1) << gy_start
+            mask = 0
+            for gx in range(x // grid_size - gx0, (x + width - 1) // grid_size - gx0 + 1):
+                mask |= column << (gx * rows)
+            self._cell_masks[key] = mask
+        return mask
 
     def copy(self):
         """Create a deep copy of this state"""
-        new_state = PlacementState()
-        new_state.placements = self.placements.copy()
-        new_state.occupied_cells = self.occupied_cells.copy()
+        new_state = PlacementState(0)
+        new_state.placed = self.placed.copy()
+        new_state.xywhr = self.xywhr.copy()
+        new_state.occupied = self.occupied
+        new_state.cell_bounds = self.cell_bounds
+        new_state.grid_size = self.grid_size
+        new_state._cell_masks = self._cell_masks
         return new_state
 
-    def _get_grid_cells(self, x, y, width, height):
-        """Get grid cells occupied by a rectangle (matches main class logic)"""
-        cells = []
-        grid_size = 2
+    def copy_from(self, other):
+        """Overwrite this state in place with the contents of another of the same size"""
+        np.copyto(self.placed, other.placed)
+        np.copyto(self.xywhr, other.xywhr)
+        self.occupied = other.occupied
+        self.cell_bounds = other.cell_bounds
+        self.grid_size = other.grid_size
+        self._cell_masks = other._cell_masks
 
-        start_x = x // grid_size
-        end_x = (x + width - 1) // grid_size
-        start_y = y // grid_size
-        end_y = (y + height - 1) // grid_size
 
-        for gx in range(start_x, end_x + 1):
-            for gy in range(start_y, end_y + 1):
-                cells.append((gx, gy))
+class PlacementStatePool:
+    """Free list of finished PlacementStates whose arrays BFS reuses instead of allocating per node"""
+
+    def __init__(self):
+        self.free = []
+
+    def copy(self, state):
+        """Copy of state, recycled from a released state when one is available"""
+        if not self.free:
+            return state.copy()
+        new_state = self.free.pop()
+        new_state.copy_from(state)
+        return new_state
 
-        return cells
+    def release(self, state):
+        """Return a state that is no longer referenced so a later copy can reuse it"""
+        self.free.append(state)
 
 
 # Example usage
@@ -1,13 +1,46 @@
 import matplotlib.pyplot as plt
 import matplotlib.patches as patches
+from matplotlib.collections import LineCollection, PatchCollection
+from matplotlib.figure import Figure
 import networkx as nx
 import numpy as np
 import random
 import heapq
+import functools
 from collections import defaultdict, deque
 
+# (dx, dy, dwidth, dheight) applied per unit of expansion towards each direction
+EXPANSION_DELTAS = {
+    'right': (0, 0, 1, 0),
+    'left': (-1, 0, 1, 0),
+    'up': (0, 0, 0, 1),
+    'down': (0, -1, 0, 1),
+}
+
+
+def shared_walls(left1, bottom1, width1, height1, left2, bottom2, width2, height2):
+    """
+    Element-wise (broadcasting) version of Room.has_shared_wall_with for rectangle arrays.
+    Returns a boolean array that is True where the two rectangles share a wall.
+    """
+    right1, top1 = left1 + width1, bottom1 + height1
+    right2, top2 = left2 + width2, bottom2 + height2
+
+    vertical_overlap = np.maximum(bottom1, bottom2) < np.minimum(top1, top2)
+    horizontal_overlap = np.maximum(left1, left2) < np.minimum(right1, right2)
+
+    # A touching left/right wall decides the result before top/bottom walls are considered
+    touches_side = (right1 == left2) | (right2 == left1)
+    touches_end = (top1 == bottom2) | (top2 == bottom1)
+    return np.where(touches_side, vertical_overlap, touches_end & horizontal_overlap)
+
 
 class Room:
+    # Fixed attribute layout: smaller rooms and faster attribute access in the placement loops.
+    # idx is assigned by FloorPlan.add_room
+    __slots__ = ('name', 'original_width', 'original_height', 'width', 'height', 'x', 'y', 'rotated',
+                 'max_expansion', 'idx')
+
     def __init__(self, name, width, height, max_expansion=20):
         self.name = name
         self.original_width = width
@@ -36,6 +69,10 @@ class Room:
     def get_area(self):
         return self.width * self.height
 
+    def get_expansion_used(self):
+        """Units the room has grown by; rotation swaps both sides, so the sum ignores orientation"""
+        return self.width + self.height - self.original_width - self.original_height
+
     def __repr__(self):
         position = f"at ({self.x}, {self.y})" if self.x is not None else "unplaced"
         size_info = f"[{self.width}x{self.height}]"
@@ -57,72 +94,101 @@ class Room:
 
     def has_shared_wall_with(self, other_room):
         """Check if this room shares a wall with another room"""
-        if self.x is None or self.y is None or other_room.x is None or other_room.y is None:
+        x1, y1, x2, y2 = self.x, self.y, other_room.x, other_room.y
+        if x1 is None or y1 is None or x2 is None or y2 is None:
             return False
+        right1, top1 = x1 + self.width, y1 + self.height
+        right2, top2 = x2 + other_room.width, y2 + other_room.height
 
-        left1, right1, bottom1, top1 = self.get_boundaries()
-        left2, right2, bottom2, top2 = other_room.get_boundaries()
-
-        # Check for vertical walls (left or right side)
-        if right1 == left2:  # This room's right wall is other room's left wall
-            # Check if there's a vertical overlap
-            return max(bottom1, bottom2) < min(top1, top2)
-
-        if right2 == left1:  # Other room's right wall is this room's left wall
-            # Check if there's a vertical overlap
-            return max(bottom1, bottom2) < min(top1, top2)
-
-        # Check for horizontal walls (top or bottom)
-        if top1 == bottom2:  # This room's top wall is other room's bottom wall
-            # Check if there's a horizontal overlap
-            return max(left1, left2) < min(right1, right2)
-
-        if top2 == bottom1:  # Other room's top wall is this room's bottom wall
-            # Check if there's a horizontal overlap
-            return max(left1, left2) < min(right1, right2)
-
-        return False
+        # A touching left/right wall decides the result before top/bottom walls are considered
+        if right1 == x2 or right2 == x1:
+            return max(y1, y2) < min(top1, top2)
+        return (top1 == y2 or top2 == y1) and max(x1, x2) < min(right1, right2)
 
 
 class FloorPlan:
-    def compact_rooms(self):
-        def overlaps(r1, r2):
-            return not (
-                    r1.x + r1.width <= r2.x or
-                    r2.x + r2.width <= r1.x or
-                    r1.y + r1.height <= r2.y or
-                    r2.y + r2.height <= r1.y
-            )
-
-        def is_within_any_floor_region(room):
-            """Check if the entire room lies inside any one allowed region."""
-            for region in self.floor_regions:
-                rx, ry, rw, rh = region['x'], region['y'], region['width'], region['height']
-                if (room.x >= rx and
-                        room.y >= ry and
-                        room.x + room.width <= rx + rw and
-                        room.y + room.height <= ry + rh):
-                    return True
-            return False
-
-        moved = True
-        while moved:
-            moved = False
-            for room in sorted(self.rooms, key=lambda r: (r.x, r.y)):
-                while room.x > 0:
-                    room.x -= 1
-                    if not is_within_any_floor_region(room) or any(
-                            overlaps(room, other) for other in self.rooms if other != room):
-                        room.x += 1
-                        break
-                    moved = True
-                while room.y > 0:
-                    room.y -= 1
-                    if not is_within_any_floor_region(room) or any(
-                            overlaps(room, other) for other in self.rooms if other != room):
-                        room.y += 1
-                        break
-                    moved = True
+    # Styles of the constraint edges in visualize, shared by the edge collections and the
+    # legend proxies
+    _EDGE_STYLES = {
+        'adjacent': dict(color='green', linewidth=2),
+        'unsatisfied': dict(color='red', linewidth=1.5, linestyle='--', alpha=0.7),
+        'separated': dict(color='blue', linewidth=1.5, linestyle='-.', alpha=0.6),
+        'violated': dict(color='red', linewidth=3, linestyle=':', alpha=0.8),
+    }
+    _EDGE_LABELS = {
+        'adjacent': 'Adjacent (satisfied)',
+        'unsatisfied': 'Adjacent (unsatisfied)',
+        'separated': 'Non-adjacent (satisfied)',
+        'violated': 'Non-adjacent (VIOLATED)',
+    }
+
+    def compact_rooms(self, only_rooms=None):
+        """
+        Slide rooms down and left as far as they go. only_rooms, a collection of room names,
+        restricts the sliding to those rooms; every placed room still blocks them
+        """
+        placed = [room for room in self.rooms if room.x is not None and room.y is not None]
+        movable = placed if only_rooms is None else [room for room in placed if room.name in only_rooms]
+
+        def max_slide(room, axis):
+            """
+            Number of unit steps the room can slide left (axis 0) or down (axis 1) while staying
+            above 0, inside some single floor region and clear of every other room
+            """
+            def span(r):
+                # (position, size) along the slide axis, then across it
+                if axis == 0:
+                    return r.x, r.width, r.y, r.height
+                return r.y, r.height, r.x, r.width
+
+            pos, size, cross, cross_size = span(room)
+            limit = max(pos, 0)
+
+            # A room in the way blocks the first step at which the two would overlap
+            for other in placed:
+                if other is room:
+                    continue
+                other_pos, other_size, other_cross, other_cross_size = span(other)
+                if other_cross < cross + cross_size and cross < other_cross + other_cross_size:
+                    first = max(1, pos - (other_pos + other_size) + 1)
+                    if first < pos + size - other_pos:
+                        limit = min(limit, first - 1)
+
+            # Each region spanning the room across the slide allows a contiguous range of steps;
+            # follow the chain of ranges that starts at the first step
+            ranges = []
+            for left, bottom, right, top in self._region_bounds:
+                low, high, cross_low, cross_high = (left, right, bottom, top) if axis == 0 else (bottom, top, left, right)
+                if cross_low <= cross and cross + cross_size <= cross_high:
+                    ranges.append((pos + size - high, pos - low))
+
+            reach = 0
+            extended = True
+            while extended and reach < limit:
+                extended = False
+                for first_step, last_step in ranges:
+                    if first_step <= reach + 1 <= last_step:
+                        reach = last_step
+                        extended = True
+
+            return min(limit, reach)
+
+        # Bottom-left fill: rooms nearest the bottom settle first, and each one alternates
+        # sliding down and left until it is wedged, so the rooms it could rest on have already
+        # moved. A second sweep is only needed when a settled room was blocked by a later one
+        swept = True
+        while swept:
+            swept = False
+            for room in sorted(movable, key=lambda r: (r.y, r.x)):
+                moved = True
+                while moved:
+                    steps = max_slide(room, 1)
+                    room.y -= steps
+                    moved = bool(steps)
+                    steps = max_slide(room, 0)
+                    room.x -= steps
+                    moved = moved or bool(steps)
+                    swept = swept or moved
 
     def __init__(self, region_specs):
         """
@@ -139,8 +205,12 @@ class FloorPlan:
         ]
         """
         self.rooms = []
+        self._rooms_by_name = {}
         self.adjacency_graph = nx.Graph()
         self.non_adjacency_graph = nx.Graph()
+        # The same constraints as neighbour lists of room indices (by room.idx), for the hot loops
+        self._adj = []
+        self._nonadj = []
 
         # Process floor regions
         self.floor_regions = []
@@ -171,33 +241,92 @@ class FloorPlan:
         self.floor_width = max(region['x'] + region['width'] for region in self.floor_regions)
         self.floor_height = max(region['y'] + region['height'] for region in self.floor_regions)
 
+        # The same regions as an (R, 4) array of x, y, width, height for batched sampling
+        self._region_arr = np.array([(region['x'], region['y'], region['width'], region['height'])
+                                     for region in self.floor_regions], dtype=np.int64)
+
+        # Region bounds as plain (left, bottom, right, top) tuples for the containment tests
+        self._region_bounds = tuple(
+            (region['x'], region['y'], region['x'] + region['width'], region['y'] + region['height'])
+            for region in self.floor_regions
+        )
+
         # Add spatial indexing for faster overlap detection
         self.spatial_grid = {}
         self.grid_size = 2  # Grid cell size for spatial indexing
 
+        # NumPy generator for batched random draws, seeded from `random` so random.seed() still
+        # makes runs reproducible
+        self._rng = np.random.default_rng(random.getrandbits(64))
+
+        # Room rectangles as parallel arrays (indexed by room.idx) for vectorized overlap tests
+        self._rx = np.zeros(0, dtype=np.int32)
+        self._ry = np.zeros(0, dtype=np.int32)
+        self._rw = np.zeros(0, dtype=np.int32)
+        self._rh = np.zeros(0, dtype=np.int32)
+        self._placed = np.zeros(0, dtype=bool)
+        self._edge_index = None  # (edges, (E, 2) idx array) for adjacency and non-adjacency, built lazily
+        self._score_cache = None  # LRU-cached _score_placement, rebuilt along with the edge index
+
+    def _reset_spatial_grid(self):
+        """Clear the spatial grid and mark every room as unplaced in the room arrays"""
+        self.spatial_grid = {}
+        self._placed[:] = False
+
+    def _sync_room_arrays(self, rooms=None):
+        """Copy the current rectangles of the given rooms (default: all) into the parallel room arrays"""
+        for room in self.rooms if rooms is None else rooms:
+            i = room.idx
+            if room.x is None or room.y is None:
+                self._placed[i] = False
+                continue
+            self._rx[i] = room.x
+            self._ry[i] = room.y
+            self._rw[i] = room.width
+            self._rh[i] = room.height
+            self._placed[i] = True
+
+    def _get_edge_index(self):
+        """
+        Adjacency and non-adjacency edges, each as a list of name pairs plus an (E, 2)
+        array of room indices
+        """
+        if self._edge_index is None:
+            def index(graph):
+                edges = list(graph.edges)
+                pairs = np.array([(self._rooms_by_name[room1_name].idx, self._rooms_by_name[room2_name].idx)
+                                  for room1_name, room2_name in edges], dtype=np.int64).reshape(-1, 2)
+                return edges, pairs
+
+            self._edge_index = (index(self.adjacency_graph), index(self.non_adjacency_graph))
+            # Cached scores were computed against the old edges
+            self._score_cache = functools.lru_cache(maxsize=4096)(self._score_placement)
+        return self._edge_index
+
     def _get_grid_cells(self, x, y, width, height):
-        """Get all grid cells that a rectangle occupies"""
-        cells = []
-        start_x = x // self.grid_size
-        end_x = (x + width - 1) // self.grid_size
-        start_y = y // self.grid_size
-        end_y = (y + height - 1) // self.grid_size
-
-        for gx in range(start_x, end_x + 1):
-            for gy in range(start_y, end_y + 1):
-                cells.append((gx, gy))
-        return cells
+        """Get all grid cells that a rectangle occupies, as packed int keys gx * 2**32 + gy"""
+        return self._grid_cells(x, y, width, height, self.grid_size)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def _grid_cells(x, y, width, height, grid_size):
+        """Cached tuple of packed grid cells covered by a rectangle; the same rectangles are queried repeatedly"""
+        gx = np.arange(x // grid_size, (x + width - 1) // grid_size + 1, dtype=np.int64)
+        gy = np.arange(y // grid_size, (y + height - 1) // grid_size + 1, dtype=np.int64)
+        return tuple(((gx[:, None] << 32) + gy[None, :]).ravel().tolist())
 
     def _add_to_spatial_grid(self, room):
         """Add room to spatial grid for fast overlap detection"""
+        self._sync_room_arrays([room])
         if room.x is None or room.y is None:
             return
 
         cells = self._get_grid_cells(room.x, room.y, room.width, room.height)
         for cell in cells:
-            if cell not in self.spatial_grid:
-                self.spatial_grid[cell] = []
-            self.spatial_grid[cell].append(room)
+            cell_rooms = self.spatial_grid.get(cell)
+            if cell_rooms is None:
+                self.spatial_grid[cell] = cell_rooms = set()
+            cell_rooms.add(room)
 
     def _remove_from_spatial_grid(self, room):
         """Remove room from spatial grid"""
@@ -206,27 +335,32 @@ class FloorPlan:
 
         cells = self._get_grid_cells(room.x, room.y, room.width, room.height)
         for cell in cells:
-            if cell in self.spatial_grid and room in self.spatial_grid[cell]:
-                self.spatial_grid[cell].remove(room)
-                if not self.spatial_grid[cell]:
+            cell_rooms = self.spatial_grid.get(cell)
+            if cell_rooms is not None:
+                cell_rooms.discard(room)
+                if not cell_rooms:
                     del self.spatial_grid[cell]
 
     def check_overlap_optimized(self, room, x, y, width, height):
         """Optimized overlap detection using spatial grid"""
-        cells = self._get_grid_cells(x, y, width, height)
-        checked_rooms = set()
+        grid = self.spatial_grid
+        occupied = [grid[cell] for cell in self._get_grid_cells(x, y, width, height) if cell in grid]
+        if not occupied:
+            # Common early in an attempt: nothing near the footprint at all
+            return False
 
-        for cell in cells:
-            if cell in self.spatial_grid:
-                for existing_room in self.spatial_grid[cell]:
-                    if existing_room != room and existing_room not in checked_rooms:
-                        checked_rooms.add(existing_room)
-                        # Check actual overlap
-                        if (x < existing_room.x + existing_room.width and
-                                x + width > existing_room.x and
-                                y < existing_room.y + existing_room.height and
-                                y + height > existing_room.y):
-                            return True
+        # Only a handful of rooms share these cells, so a list dedups faster than a set
+        checked_rooms = [room]
+        for cell_rooms in occupied:
+            for existing_room in cell_rooms:
+                if existing_room not in checked_rooms:
+                    checked_rooms.append(existing_room)
+                    # Check actual overlap
+                    if (x < existing_room.x + existing_room.width and
+                            x + width > existing_room.x and
+                            y < existing_room.y + existing_room.height and
+                            y + height > existing_room.y):
+                        return True
         return False
 
     def get_valid_positions(self, room, max_positions=100):
@@ -235,124 +369,224 @@ class FloorPlan:
 
         # Get rooms that should be adjacent to this room
         adjacent_rooms = []
-        for neighbor in self.adjacency_graph.neighbors(room.name):
-            neighbor_room = next((r for r in self.rooms if r.name == neighbor), None)
-            if neighbor_room and neighbor_room.x is not None:
+        for i in self._adj[room.idx]:
+            neighbor_room = self.rooms[i]
+            if neighbor_room.x is not None:
                 adjacent_rooms.append(neighbor_room)
 
-        # If we have adjacent rooms, prioritize positions near them
+        # If we have adjacent rooms, prioritize positions near them. The positions around every
+        # adjacent room are tested for overlaps and non-adjacency violations in one batch
         if adjacent_rooms:
-            for adj_room in adjacent_rooms:
-                # Try positions around the adjacent room
-                positions = [
+            positions = np.array([
+                position
+                for adj_room in adjacent_rooms
+                for position in (
                     (adj_room.x + adj_room.width, adj_room.y),  # Right
                     (adj_room.x - room.width, adj_room.y),  # Left
                     (adj_room.x, adj_room.y + adj_room.height),  # Above
                     (adj_room.x, adj_room.y - room.height),  # Below
-                ]
-
-                for x, y in positions:
-                    if (self.is_within_floor(x, y, room.width, room.height) and
-                            not self.check_overlap_optimized(room, x, y, room.width, room.height) and
-                            not self.check_non_adjacency_violation(room, x, y, room.width,
-                                                                   room.height)):  # ADD THIS LINE
-                        valid_positions.append((x, y))
-                        if len(valid_positions) >= max_positions:
-                            return valid_positions
-
-        # If no adjacent rooms or need more positions, try random positions
-        attempts = 0
-        while len(valid_positions) < max_positions and attempts < 200:
-            attempts += 1
-
-            # Choose a random region
-            region = random.choice(self.floor_regions)
-
-            if region['width'] < room.width or region['height'] < room.height:
-                continue
-
-            max_x = region['x'] + region['width'] - room.width
-            max_y = region['y'] + region['height'] - room.height
-
-            if max_x >= region['x'] and max_y >= region['y']:
-                x = random.randint(region['x'], max_x)
-                y = random.randint(region['y'], max_y)
+                )
+            ], dtype=np.int64)
 
-                if (not self.check_overlap_optimized(room, x, y, room.width, room.height) and
-                        not self.check_non_adjacency_violation(room, x, y, room.width, room.height) and  # ADD THIS LINE
-                        (x, y) not in valid_positions):
+            for (x, y), free in zip(positions.tolist(), self._free_position_mask(room, positions).tolist()):
+                if free and self.is_within_floor(x, y, room.width, room.height):
                     valid_positions.append((x, y))
+                    if len(valid_positions) >= max_positions:
+                        return valid_positions
+
+        # If no adjacent rooms or need more positions, try random positions: draw the whole
+        # batch of (region, x, y) samples at once and filter them together. Regions are drawn
+        # in proportion to how many anchors the room has in them, so every sample lies on the
+        # floor and the anchors are uniform over all regions the room fits in
+        if len(valid_positions) < max_positions:
+            regions = self._region_arr[(self._region_arr[:, 2] >= room.width) &
+                                       (self._region_arr[:, 3] >= room.height)]
+            if not len(regions):
+                return valid_positions
+            anchors = (regions[:, 2] - room.width + 1) * (regions[:, 3] - room.height + 1)
+            regions = regions[self._rng.choice(len(regions), size=200, p=anchors / anchors.sum())]
+            samples = np.column_stack((
+                regions[:, 0] + self._rng.integers(0, regions[:, 2] - room.width + 1),
+                regions[:, 1] + self._rng.integers(0, regions[:, 3] - room.height + 1),
+            ))
+
+            seen = set(valid_positions)
+            for x, y in samples[self._free_position_mask(room, samples)].tolist():
+                if (x, y) not in seen:
+                    valid_positions.append((x, y))
+                    seen.add((x, y))
+                    if len(valid_positions) >= max_positions:
+                        break
 
         return valid_positions
 
+    def _best_position(self, room, max_positions=30):
+        """
+        Valid position for the room, in its current orientation or rotated, that shares walls
+        with the most placed adjacency neighbors. Ties keep the current orientation and the
+        search order; the rotated search is skipped once every neighbor is already reached.
+        Returns (x, y, rotate), or None if the room fits nowhere
+        """
+        neighbors = [self.rooms[i] for i in self._adj[room.idx]]
+        rects = [(other.x, other.y, other.width, other.height) for other in neighbors
+                 if other.x is not None and other.y is not None]
+        adj_x, adj_y, adj_width, adj_height = np.array(rects, dtype=np.int64).reshape(-1, 4).T
+
+        best, best_hits = None, -1
+        for rotate in (False, True):
+            if best_hits == len(adj_x):
+                break
+            if rotate:
+                room.rotate()
+            positions = np.array(self.get_valid_positions(room, max_positions), dtype=np.int64).reshape(-1, 2)
+            if len(positions):
+                hits = shared_walls(positions[:, 0, None], positions[:, 1, None], room.width, room.height,
+                                    adj_x, adj_y, adj_width, adj_height).sum(axis=1)
+                i = int(hits.argmax())
+                if hits[i] > best_hits:
+                    best, best_hits = (int(positions[i, 0]), int(positions[i, 1]), rotate), int(hits[i])
+            if rotate:
+                room.rotate()
+        return best
+
+    def _free_position_mask(self, room, positions):
+        """
+        Vectorized overlap and non-adjacency test for an (N, 2) array of candidate positions
+        of a room. Returns a boolean array marking positions that overlap no placed room and
+        share no wall with a room it must not be adjacent to.
+        """
+        xs, ys = positions[:, 0], positions[:, 1]
+        width, height = room.width, room.height
+
+        # Overlap against every other placed room, candidates x rooms
+        others = self._placed.copy()
+        others[room.idx] = False
+        ox, oy, ow, oh = self._rx[others], self._ry[others], self._rw[others], self._rh[others]
+        overlap = ((xs[:, None] < ox + ow) & (xs[:, None] + width > ox) &
+                   (ys[:, None] < oy + oh) & (ys[:, None] + height > oy)).any(axis=1)
+
+        # Shared walls with placed rooms this room must not be adjacent to
+        forbidden = [self.rooms[i] for i in self._nonadj[room.idx]]
+        forbidden = [other for other in forbidden if other.x is not None]
+        if forbidden:
+            fx, fy, fw, fh = np.array([(other.x, other.y, other.width, other.height) for other in forbidden]).T
+            violation = shared_walls(xs[:, None], ys[:, None], width, height, fx, fy, fw, fh).any(axis=1)
+            overlap |= violation
+
+        return ~overlap
+
     def add_non_adjacency(self, room1_name, room2_name):
         """Add a non-adjacency constraint between two rooms"""
-        if room1_name in self.adjacency_graph.nodes and room2_name in self.adjacency_graph.nodes:
+        if room1_name in self._rooms_by_name and room2_name in self._rooms_by_name:
             self.non_adjacency_graph.add_edge(room1_name, room2_name)
+            self._link(self._nonadj, room1_name, room2_name)
+            self._edge_index = None
 
     def check_non_adjacency_violation(self, room, x, y, width, height):
         """Check if placing a room at (x,y) would violate non-adjacency constraints"""
-        # Check if room has any non-adjacency constraints
-        if room.name not in self.non_adjacency_graph.nodes:
+        forbidden = [(other.x, other.y, other.width, other.height)
+                     for other in (self.rooms[i] for i in self._nonadj[room.idx]) if other.x is not None]
+        if not forbidden:
             return False
 
-        for neighbor_name in self.non_adjacency_graph.neighbors(room.name):
-            neighbor_room = next((r for r in self.rooms if r.name == neighbor_name), None)
-            if neighbor_room and neighbor_room.x is not None:
-                # Create temporary room object to check adjacency
-                temp_room = Room(room.name, width, height)
-                temp_room.x = x
-                temp_room.y = y
-
-                if temp_room.has_shared_wall_with(neighbor_room):
-                    return True
-        return False
+        # Shared walls against every placed forbidden neighbour at once
+        fx, fy, fw, fh = np.array(forbidden, dtype=np.int64).T
+        return bool(shared_walls(x, y, width, height, fx, fy, fw, fh).any())
 
     def add_room(self, name, width, height, max_expansion=20):
         """Add a room with specified dimensions and maximum expansion limit"""
         room = Room(name, width, height, max_expansion)
+        room.idx = len(self.rooms)
         self.rooms.append(room)
+        self._rooms_by_name.setdefault(name, room)
         self.adjacency_graph.add_node(name)
         self.non_adjacency_graph.add_node(name)  # ADD THIS LINE
+        self._adj.append([])
+        self._nonadj.append([])
+        self._rx = np.append(self._rx, np.int32(0))
+        self._ry = np.append(self._ry, np.int32(0))
+        self._rw = np.append(self._rw, np.int32(0))
+        self._rh = np.append(self._rh, np.int32(0))
+        self._placed = np.append(self._placed, False)
+        self._edge_index = None
         return room
 
     def add_adjacency(self, room1_name, room2_name):
-        if room1_name in self.adjacency_graph.nodes and room2_name in self.adjacency_graph.nodes:
+        if room1_name in self._rooms_by_name and room2_name in self._rooms_by_name:
             self.adjacency_graph.add_edge(room1_name, room2_name)
+            self._link(self._adj, room1_name, room2_name)
+            self._edge_index = None
+
+    def _link(self, lists, room1_name, room2_name):
+        """Mirror a new graph edge into the given neighbour lists; like nx.Graph, repeats are ignored"""
+        i, j = self._rooms_by_name[room1_name].idx, self._rooms_by_name[room2_name].idx
+        if j not in lists[i]:
+            lists[i].append(j)
+            if i != j:
+                lists[j].append(i)
 
     def is_within_floor(self, x, y, width, height):
         """Check if a rectangle fits within the entire composite floor shape"""
-        for dx in range(width):
-            for dy in range(height):
-                px = x + dx
-                py = y + dy
+        if width <= 0 or height <= 0:
+            return True
+        right, top = x + width, y + height
 
-                if not self.point_in_floor(px, py):
-                    return False
-        return True
+        # Fast path: the rectangle lies entirely inside a single region
+        for left, bottom, region_right, region_top in self._region_bounds:
+            if left <= x and right <= region_right and bottom <= y and top <= region_top:
+                return True
+
+        # Composite shape: subtract every region from the rectangle; it fits if nothing is left
+        uncovered = [(x, y, right, top)]
+        for left, bottom, region_right, region_top in self._region_bounds:
+            remaining = []
+            for x1, y1, x2, y2 in uncovered:
+                if left >= x2 or region_right <= x1 or bottom >= y2 or region_top <= y1:
+                    remaining.append((x1, y1, x2, y2))
+                    continue
+
+                # Keep the parts of this piece outside the region: side strips, then bottom and top
+                if x1 < left:
+                    remaining.append((x1, y1, left, y2))
+                if region_right < x2:
+                    remaining.append((region_right, y1, x2, y2))
+                inner_left, inner_right = max(x1, left), min(x2, region_right)
+                if y1 < bottom:
+                    remaining.append((inner_left, y1, inner_right, bottom))
+                if region_top < y2:
+                    remaining.append((inner_left, region_top, inner_right, y2))
+
+            uncovered = remaining
+            if not uncovered:
+                return True
+        return False
 
     def enforce_minimum_adjacency(self):
         """
         Ensure every room is adjacent to at least one other room.
         If a room has no adjacencies, try to move it next to another room.
+        Returns the names of the rooms that were moved
         """
+        self._sync_room_arrays()
+        walls = self._wall_index()
+        moved_rooms = set()
         for room in self.rooms:
             if room.x is None or room.y is None:
                 continue
 
             # Check if this room shares a wall with any other room
-            has_adjacency = any(
-                room.has_shared_wall_with(other)
-                for other in self.rooms
-                if other != room and other.x is not None and other.y is not None
-            )
+            has_adjacency = self._shares_wall_at(walls, room, room.x, room.y, room.width, room.height)
             if not has_adjacency:
-                # Try to move the room next to another room
-                found = False
-                for candidate in self.rooms:
-                    if candidate == room or candidate.x is None or candidate.y is None:
-                        continue
+                # Rooms this one must not end up sharing a wall with
+                forbidden = {self.rooms[i] for i in self._nonadj[room.idx]}
 
+                # Try to move the room next to another room, nearest candidates first
+                candidates = [other for other in self.rooms
+                              if other is not room and other.x is not None and other.y is not None]
+                candidates.sort(key=lambda other: abs(other.x - room.x) + abs(other.y - room.y))
+
+                found = False
+                for candidate in candidates:
                     # Try all four sides of the candidate room
                     possible_positions = [
                         (candidate.x - room.width, candidate.y),  # left
@@ -360,127 +594,136 @@ class FloorPlan:
                         (candidate.x, candidate.y + candidate.height),  # above
                         (candidate.x, candidate.y - room.height),  # below
                     ]
-                for new_x, new_y in possible_positions:
-                    # Check if the new position would create a non-adjacency violation
-                    is_non_adjacent_violation = False
-                    for existing_room in self.rooms:
-                        if existing_room != room and existing_room.x is not None and existing_room.y is not None:
-                            if self.non_adjacency_graph.has_edge(room.name, existing_room.name):
-                                # Temporarily set room's position to check for wall sharing
-                                original_x, original_y = room.x, room.y
-                                room.x, room.y = new_x, new_y
-                                if room.has_shared_wall_with(existing_room):
-                                    is_non_adjacent_violation = True
-                                room.x, room.y = original_x, original_y  # Restore original position
-                                if is_non_adjacent_violation:
-                                    break
-                    if is_non_adjacent_violation:
-                        continue
-
-                    if self.is_within_floor(new_x, new_y, room.width, room.height) and \
-                            not self.check_overlap(room, new_x, new_y, room.width, room.height):
-                        # Move room here
-                        room.x = new_x
-                        room.y = new_y
-                        # Double-check if this now shares a wall with any room
-                        if any(
-                                room.has_shared_wall_with(other)
-                                for other in self.rooms
-                                if other != room and other.x is not None and other.y is not None
-                        ):
-                            found = True
-                            break
-                if found:
-                    break
+                    for new_x, new_y in possible_positions:
+                        # Check if the new position would create a non-adjacency violation
+                        if forbidden and self._shares_wall_at(walls, room, new_x, new_y, room.width, room.height,
+                                                              among=forbidden):
+                            continue
+
+                        if self.is_within_floor(new_x, new_y, room.width, room.height) and \
+                                not self.check_overlap(room, new_x, new_y, room.width, room.height):
+                            # Move room here
+                            self._index_walls(walls, room, remove=True)
+                            room.x = new_x
+                            room.y = new_y
+                            self._index_walls(walls, room)
+                            self._sync_room_arrays([room])
+                            moved_rooms.add(room.name)
+                            # Double-check if this now shares a wall with any room
+                            if self._shares_wall_at(walls, room, room.x, room.y, room.width, room.height):
+                                found = True
+                                break
+                    if found:
+                        break
+        return moved_rooms
+
+    def _wall_index(self):
+        """
+        Index placed rooms by wall coordinate: 'left'/'right' map an x to the rooms whose
+        left/right wall lies there, 'bottom'/'top' do the same for y
+        """
+        walls = {side: defaultdict(list) for side in ('left', 'right', 'bottom', 'top')}
+        for room in self.rooms:
+            if room.x is not None and room.y is not None:
+                self._index_walls(walls, room)
+        return walls
+
+    @staticmethod
+    def _index_walls(walls, room, remove=False):
+        """Add a room's four walls to the wall index, or remove them (before the room moves)"""
+        for side, coordinate in (('left', room.x), ('right', room.x + room.width),
+                                 ('bottom', room.y), ('top', room.y + room.height)):
+            if remove:
+                walls[side][coordinate].remove(room)
+            else:
+                walls[side][coordinate].append(room)
+
+    @staticmethod
+    def _shares_wall_at(walls, room, x, y, width, height, among=None):
+        """
+        True if a room placed at (x, y) with the given size would share a wall with another
+        indexed room (restricted to the rooms in among, if given), as has_shared_wall_with decides
+        """
+        right, top = x + width, y + height
+        for side, coordinate, vertical in (('right', x, True), ('left', right, True),
+                                           ('top', y, False), ('bottom', top, False)):
+            for other in walls[side].get(coordinate, ()):
+                if other is room or (among is not None and other not in among):
+                    continue
+                if vertical:
+                    if max(y, other.y) < min(top, other.y + other.height):
+                        return True
+                elif max(x, other.x) < min(right, other.x + other.width):
+                    return True
+        return False
 
     def point_in_floor(self, x, y):
         """Check if a point is within any of the defined floor regions"""
-        for region in self.floor_regions:
-            if (region['x'] <= x < region['x'] + region['width'] and
-                    region['y'] <= y < region['y'] + region['height']):
+        for left, bottom, right, top in self._region_bounds:
+            if left <= x < right and bottom <= y < top:
                 return True
         return False
 
     def check_overlap(self, room, x, y, width, height):
-        """Check if placing a room at (x,y) with given width/height would overlap with existing rooms"""
-        for existing_room in self.rooms:
-            if existing_room.x is not None and existing_room != room:
-                # Check for overlap - two rectangles overlap if they overlap in both x and y directions
-                if (x < existing_room.x + existing_room.width and
-                        x + width > existing_room.x and
-                        y < existing_room.y + existing_room.height and
-                        y + height > existing_room.y):
-                    return True
-        return False
+        """
+        Check if placing a room at (x,y) with given width/height would overlap with existing rooms.
+        Tests every room at once against the parallel room arrays, which callers keep in sync.
+        """
+        # Two rectangles overlap if they overlap in both x and y directions
+        mask = ((x < self._rx + self._rw) & (x + width > self._rx) &
+                (y < self._ry + self._rh) & (y + height > self._ry) & self._placed)
+        mask[room.idx] = False
+        return bool(mask.any())
 
     def evaluate_adjacency_score(self):
         """Calculate how well adjacency requirements are met and penalize non-adjacency violations"""
-        score = 0
-        adjacent_pairs = []
-        violations = []
+        self._get_edge_index()
+
+        # Read positions from the rooms themselves: callers such as the GUI restore path
+        # set them directly. Attempts often end in the same placement, so scores are memoized
+        # on the rectangles in room order
+        key = tuple((room.x, room.y, room.width, room.height) if room.x is not None and room.y is not None
+                    else None for room in self.rooms)
+        score, adjacent_pairs, violations = self._score_cache(key)
+        return score, list(adjacent_pairs), list(violations)
+
+    def _score_placement(self, key):
+        """Score one placement given as a tuple of room rectangles (None for unplaced rooms)"""
+        (adjacency_edges, adjacency_index), (non_adjacency_edges, non_adjacency_index) = self._edge_index
+        placed = np.array([rect is not None for rect in key], dtype=bool)
+        rects = np.array([rect if rect is not None else (0, 0, 0, 0) for rect in key],
+                         dtype=np.int64).reshape(-1, 4)
+
+        def walls_shared(index):
+            a, b = rects[index[:, 0]], rects[index[:, 1]]
+            return (placed[index[:, 0]] & placed[index[:, 1]] &
+                    shared_walls(a[:, 0], a[:, 1], a[:, 2], a[:, 3], b[:, 0], b[:, 1], b[:, 2], b[:, 3]))
 
         # Score positive adjacencies
-        for room1_name, room2_name in self.adjacency_graph.edges:
-            room1 = next(r for r in self.rooms if r.name == room1_name)
-            room2 = next(r for r in self.rooms if r.name == room2_name)
-
-            if room1.x is None or room2.x is None:
-                continue
+        adjacent_pairs = [adjacency_edges[i] for i in np.flatnonzero(walls_shared(adjacency_index))]
 
-            # Check if rooms share a wall
-            if room1.has_shared_wall_with(room2):
-                score += 1
-                adjacent_pairs.append((room1_name, room2_name))
+        # Penalize non-adjacency violations (rooms that share a wall but should not)
+        violations = [non_adjacency_edges[i] for i in np.flatnonzero(walls_shared(non_adjacency_index))]
 
-        # Penalize non-adjacency violations
-        for room1_name, room2_name in self.non_adjacency_graph.edges:
-            room1 = next(r for r in self.rooms if r.name == room1_name)
-            room2 = next(r for r in self.rooms if r.name == room2_name)
-
-            if room1.x is None or room2.x is None:
-                continue
-
-            # Check if rooms share a wall (violation)
-            if room1.has_shared_wall_with(room2):
-                score -= 2  # Heavy penalty for violations
-                violations.append((room1_name, room2_name))
-
-        return score, adjacent_pairs, violations  # Modified return to include violations
+        score = len(adjacent_pairs) - 2 * len(violations)  # Heavy penalty for violations
+        return score, tuple(adjacent_pairs), tuple(violations)
 
     def can_expand_room(self, room, direction, amount):
         """Check if a room can be expanded in the given direction by the specified amount"""
         if room.x is None or room.y is None:
             return False
 
-        # Calculate total expansion so far
-        current_expansion = 0
-        if not room.rotated:
-            current_expansion += room.width - room.original_width
-            current_expansion += room.height - room.original_height
-        else:
-            current_expansion += room.width - room.original_height
-            current_expansion += room.height - room.original_width
-
         # Check if we've reached the maximum expansion for this room
-        if current_expansion + amount > room.max_expansion:
+        if room.get_expansion_used() + amount > room.max_expansion:
             return False
 
         # Calculate new dimensions and position after expansion
-        new_x, new_y = room.x, room.y
-        new_width, new_height = room.width, room.height
-
-        if direction == 'right':
-            new_width += amount
-        elif direction == 'left':
-            new_x -= amount
-            new_width += amount
-        elif direction == 'up':
-            new_height += amount
-        elif direction == 'down':
-            new_y -= amount
-            new_height += amount
-        else:
+        delta = EXPANSION_DELTAS.get(direction)
+        if delta is None:
             return False
+        dx, dy, dwidth, dheight = delta
+        new_x, new_y = room.x + dx * amount, room.y + dy * amount
+        new_width, new_height = room.width + dwidth * amount, room.height + dheight * amount
 
         # Check if new position is within floor and doesn't overlap other rooms
         if not self.is_within_floor(new_x, new_y, new_width, new_height):
@@ -497,8 +740,10 @@ class FloorPlan:
         and ensuring no overlaps, respecting each room's max_expansion limit
         """
         # For each room, attempt expansion in each direction
+        self._sync_room_arrays()
         for room in self.rooms:
-            if room.x is None or room.y is None:
+            # Rooms that are unplaced or have used up their budget cannot grow
+            if room.x is None or room.y is None or room.get_expansion_used() >= room.max_expansion:
                 continue
 
             # Try to expand in all four directions
@@ -506,34 +751,75 @@ class FloorPlan:
             random.shuffle(directions)  # Randomize direction order for more varied results
 
             for direction in directions:
-                # Try expanding 1 unit at a time up to max expansion
-                expanded = True
-                total_expansion = 0
-
-                while expanded:
-                    if self.can_expand_room(room, direction, 1):
-                        # Apply 1 unit expansion
-                        if direction == 'right':
-                            room.width += 1
-                        elif direction == 'left':
-                            room.x -= 1
-                            room.width += 1
-                        elif direction == 'up':
-                            room.height += 1
-                        elif direction == 'down':
-                            room.y -= 1
-                            room.height += 1
-
-                        total_expansion += 1
-                    else:
-                        expanded = False
+                # Grow in one step by the largest amount unit-by-unit expansion would reach
+                amount = self._expansion_limit(room, direction)
+                if amount:
+                    self._grow_room(room, direction, amount)
+                    self._sync_room_arrays([room])
+                    if room.get_expansion_used() >= room.max_expansion:
+                        break
+
+    def _expansion_limit(self, room, direction):
+        """
+        Largest amount the room can legally grow towards direction (as can_expand_room decides),
+        computed in one step: the smallest of its remaining expansion budget, the gap to the
+        nearest placed room in the way, and the furthest growth that stays on the floor.
+        Reads the parallel room arrays, which callers keep in sync
+        """
+        if room.x is None or room.y is None or direction not in EXPANSION_DELTAS:
+            return 0
+        x, y, width, height = room.x, room.y, room.width, room.height
+        limit = room.max_expansion - room.get_expansion_used()
+        if limit <= 0:
+            return 0
+
+        # Rooms: other placed rooms overlapping the room's span across the direction block it
+        others = self._placed.copy()
+        others[room.idx] = False
+        ox, oy, ow, oh = self._rx, self._ry, self._rw, self._rh
+        if direction == 'right':
+            in_way = others & (oy < y + height) & (oy + oh > y) & (ox + ow > x)
+            gaps = ox - (x + width)
+        elif direction == 'left':
+            in_way = others & (oy < y + height) & (oy + oh > y) & (ox < x + width)
+            gaps = x - (ox + ow)
+        elif direction == 'up':
+            in_way = others & (ox < x + width) & (ox + ow > x) & (oy + oh > y)
+            gaps = oy - (y + height)
+        else:
+            in_way = others & (ox < x + width) & (ox + ow > x) & (oy < y + height)
+            gaps = y - (oy + oh)
+        if in_way.any():
+            limit = min(limit, max(int(gaps[in_way].min()), 0))
+
+        # Floor: a grown rectangle contains every smaller one, so the fitting amounts form a
+        # prefix and the largest can be bisected
+        dx, dy, dwidth, dheight = EXPANSION_DELTAS[direction]
+        low, high = 0, limit
+        while low < high:
+            amount = (low + high + 1) // 2
+            if self.is_within_floor(x + dx * amount, y + dy * amount,
+                                    width + dwidth * amount, height + dheight * amount):
+                low = amount
+            else:
+                high = amount - 1
+        return low
+
+    @staticmethod
+    def _grow_room(room, direction, amount):
+        """Grow a room by amount units towards the given direction"""
+        dx, dy, dwidth, dheight = EXPANSION_DELTAS[direction]
+        room.x += dx * amount
+        room.y += dy * amount
+        room.width += dwidth * amount
+        room.height += dheight * amount
 
     def place_rooms_with_constraints_optimized(self, max_attempts=100, enable_expansion=True, use_compact_mode=True):
         """
         Optimized room placement using constraint satisfaction and spatial indexing
         """
         # Clear spatial grid
-        self.spatial_grid = {}
+        self._reset_spatial_grid()
 
         # Reset all rooms
         for room in self.rooms:
@@ -544,7 +830,7 @@ class FloorPlan:
         # Sort rooms by constraint priority (rooms with more adjacency requirements first)
         room_constraints = {}
         for room in self.rooms:
-            room_constraints[room.name] = len(list(self.adjacency_graph.neighbors(room.name)))
+            room_constraints[room.name] = len(self._adj[room.idx])
 
         sorted_rooms = sorted(self.rooms,
                               key=lambda r: (room_constraints[r.name], r.get_area()),
@@ -555,7 +841,7 @@ class FloorPlan:
 
         for attempt in range(max_attempts):
             # Reset placements
-            self.spatial_grid = {}
+            self._reset_spatial_grid()
             for room in self.rooms:
                 room.x = None
                 room.y = None
@@ -567,34 +853,16 @@ class FloorPlan:
             placement_successful = True
 
             for room in sorted_rooms:
-                placed = False
-
-                # Get valid positions for this room
-                valid_positions = self.get_valid_positions(room, max_positions=30)
-
-                # Try original orientation
-                for x, y in valid_positions:
-                    room.x = x
-                    room.y = y
-                    self._add_to_spatial_grid(room)
-                    placed = True
+                # Pick among the valid positions of both orientations
+                position = self._best_position(room, max_positions=30)
+                if position is None:
+                    placement_successful = False
                     break
 
-                # If not placed, try rotated
-                if not placed:
+                room.x, room.y, rotate = position
+                if rotate:
                     room.rotate()
-                    valid_positions = self.get_valid_positions(room, max_positions=30)
-
-                    for x, y in valid_positions:
-                        room.x = x
-                        room.y = y
-                        self._add_to_spatial_grid(room)
-                        placed = True
-                        break
-
-                if not placed:
-                    placement_successful = False
-                    break
+                self._add_to_spatial_grid(room)
 
             if placement_successful:
                 # Apply expansion if enabled
@@ -606,10 +874,10 @@ class FloorPlan:
 
                 if score > best_score:
                     best_score = score
-                    best_placement = [
-                        (room.name, room.x, room.y, room.width, room.height, room.rotated, room.max_expansion)
-                        for room in self.rooms
-                    ]
+                    # Every room is placed and mirrored in the room arrays, so the snapshot is a
+                    # single (N, 4) copy plus the orientations
+                    best_placement = (np.stack((self._rx, self._ry, self._rw, self._rh), axis=1),
+                                      np.array([room.rotated for room in self.rooms], dtype=bool))
 
                 # Early exit if all constraints satisfied
                 if score == len(self.adjacency_graph.edges):
@@ -617,16 +885,14 @@ class FloorPlan:
 
         # Restore best placement
         if best_placement:
-            self.spatial_grid = {}
-            for room_data in best_placement:
-                name, x, y, width, height, rotated, max_expansion = room_data
-                room = next(r for r in self.rooms if r.name == name)
+            self._reset_spatial_grid()
+            rects, rotations = best_placement
+            for room, (x, y, width, height), rotated in zip(self.rooms, rects.tolist(), rotations.tolist()):
                 room.x = x
                 room.y = y
                 room.width = width
                 room.height = height
                 room.rotated = rotated
-                room.max_expansion = max_expansion
                 self._add_to_spatial_grid(room)
             return True
 
@@ -634,8 +900,10 @@ class FloorPlan:
 
     def expand_rooms_optimized(self):
         """Optimized room expansion using spatial grid"""
+        self._sync_room_arrays()
         for room in self.rooms:
-            if room.x is None or room.y is None:
+            # Rooms that are unplaced or have used up their budget cannot grow
+            if room.x is None or room.y is None or room.get_expansion_used() >= room.max_expansion:
                 continue
 
             # Remove from spatial grid temporarily
@@ -646,20 +914,13 @@ class FloorPlan:
             random.shuffle(directions)
 
             for direction in directions:
-                # Try expanding in larger increments first, then smaller
-                for increment in [5, 3, 2, 1]:
-                    while self.can_expand_room_optimized(room, direction, increment):
-                        # Apply expansion
-                        if direction == 'right':
-                            room.width += increment
-                        elif direction == 'left':
-                            room.x -= increment
-                            room.width += increment
-                        elif direction == 'up':
-                            room.height += increment
-                        elif direction == 'down':
-                            room.y -= increment
-                            room.height += increment
+                # Grow straight to the furthest legal extent instead of probing in increments
+                amount = self._expansion_limit(room, direction)
+                if amount:
+                    self._grow_room(room, direction, amount)
+                    self._sync_room_arrays([room])
+                    if room.get_expansion_used() >= room.max_expansion:
+                        break
 
             # Add back to spatial grid
             self._add_to_spatial_grid(room)
@@ -670,33 +931,16 @@ class FloorPlan:
             return False
 
         # Check expansion limits
-        current_expansion = 0
-        if not room.rotated:
-            current_expansion += room.width - room.original_width
-            current_expansion += room.height - room.original_height
-        else:
-            current_expansion += room.width - room.original_height
-            current_expansion += room.height - room.original_width
-
-        if current_expansion + amount > room.max_expansion:
+        if room.get_expansion_used() + amount > room.max_expansion:
             return False
 
         # Calculate new dimensions
-        new_x, new_y = room.x, room.y
-        new_width, new_height = room.width, room.height
-
-        if direction == 'right':
-            new_width += amount
-        elif direction == 'left':
-            new_x -= amount
-            new_width += amount
-        elif direction == 'up':
-            new_height += amount
-        elif direction == 'down':
-            new_y -= amount
-            new_height += amount
-        else:
+        delta = EXPANSION_DELTAS.get(direction)
+        if delta is None:
             return False
+        dx, dy, dwidth, dheight = delta
+        new_x, new_y = room.x + dx * amount, room.y + dy * amount
+        new_width, new_height = room.width + dwidth * amount, room.height + dheight * amount
 
         # Quick bounds check
         if not self.is_within_floor(new_x, new_y, new_width, new_height):
@@ -705,11 +949,26 @@ class FloorPlan:
         # Use optimized overlap check
         return not self.check_overlap_optimized(room, new_x, new_y, new_width, new_height)
 
-    def visualize(self):
-        """Visualize the floor plan using matplotlib with non-adjacency constraints"""
-        fig, ax = plt.subplots(figsize=(12, 10))
+    def visualize(self, block=True, show=True, save_path=None):
+        """
+        Visualize the floor plan using matplotlib with non-adjacency constraints.
+        With block=False the figure is only scheduled for redraw (draw_idle) instead of shown,
+        so repeated calls from a search loop under interactive mode coalesce their redraws.
+        With save_path the figure is written to that file instead, built without pyplot so no
+        GUI backend is started; show=False skips displaying it altogether.
+        Returns (fig, ax)
+        """
+        # Constrained layout fits the outside legend while drawing, without a tight_layout pass
+        if save_path is None:
+            fig, ax = plt.subplots(figsize=(12, 10), constrained_layout=True)
+        else:
+            fig = Figure(figsize=(12, 10), constrained_layout=True)
+            ax = fig.subplots()
+        # The limits are set explicitly below, so skip per-artist data limit updates
+        ax.set_autoscale_on(False)
 
         # Draw floor shape
+        floor_rects = []
         for region in self.floor_regions:
             rect = patches.Rectangle(
                 (region['x'], region['y']),
@@ -720,12 +979,16 @@ class FloorPlan:
                 facecolor='none',
                 linestyle='--'
             )
-            ax.add_patch(rect)
+            floor_rects.append(rect)
+        ax.add_collection(PatchCollection(floor_rects, match_original=True))
 
-        # Draw rooms
+        # Draw rooms, all rectangles as one collection
         colors = plt.cm.tab20(np.linspace(0, 1, len(self.rooms)))
+        room_rects = []
+        centers = {}  # Room -> center point, shared by the label and every edge touching the room
         for i, room in enumerate(self.rooms):
             if room.x is not None and room.y is not None:
+                centers[room] = center = (room.x + room.width * 0.5, room.y + room.height * 0.5)
                 rect = patches.Rectangle(
                     (room.x, room.y),
                     room.width,
@@ -735,82 +998,99 @@ class FloorPlan:
                     facecolor=colors[i],
                     alpha=0.7
                 )
-                ax.add_patch(rect)
-
-                # Add room name, size, and expansion info
-                original_size = f"{room.original_width}x{room.original_height}"
-                current_size = f"{room.width}x{room.height}"
-                display_text = f"{room.name}\n{current_size}"
+                room_rects.append(rect)
 
-                # Add expansion info if expanded
-                if room.width != room.original_width or room.height != room.original_height:
-                    if room.rotated:
-                        display_text += f"\n(from {room.original_height}x{room.original_width})"
-                    else:
-                        display_text += f"\n(from {original_size})"
+                # Add room name, size, and expansion info if expanded
+                if room.width == room.original_width and room.height == room.original_height:
+                    suffix = ""
+                elif room.rotated:
+                    suffix = f"\n(from {room.original_height}x{room.original_width})"
+                else:
+                    suffix = f"\n(from {room.original_width}x{room.original_height})"
+                display_text = f"{room.name}\n{room.width}x{room.height}{suffix}"
 
                 ax.text(
-                    room.x + room.width / 2,
-                    room.y + room.height / 2,
+                    center[0],
+                    center[1],
                     display_text,
                     ha='center',
                     va='center',
                     fontsize=8
                 )
+        ax.add_collection(PatchCollection(room_rects, match_original=True))
 
-        # Add adjacency relationships as dotted lines between room centers
-        for room1_name, room2_name in self.adjacency_graph.edges:
-            room1 = next(r for r in self.rooms if r.name == room1_name)
-            room2 = next(r for r in self.rooms if r.name == room2_name)
+        # Bind the constraint edge views and their counts once; both are reused throughout
+        adjacency_edges = self.adjacency_graph.edges
+        non_adjacency_edges = self.non_adjacency_graph.edges
+        n_adjacency = len(adjacency_edges)
+        n_non_adjacency = len(non_adjacency_edges)
 
-            if room1.x is not None and room2.x is not None:
-                center1 = (room1.x + room1.width / 2, room1.y + room1.height / 2)
-                center2 = (room2.x + room2.width / 2, room2.y + room2.height / 2)
+        adjacent_pairs = []
+        adjacent_segments = []
+        unsatisfied_segments = []
+        non_adjacency_satisfied = []
+        non_adjacency_violated = []
+        separated_segments = []
+        violated_segments = []
+        violation_markers = []
+
+        # Plans without constraints skip scoring and both edge loops entirely
+        if n_adjacency or n_non_adjacency:
+            # Which constrained pairs share a wall, worked out once for every edge in a single
+            # vectorized pass; the loops below and the title only look the pairs up
+            score, adjacent_pairs, violations = self.evaluate_adjacency_score()
+            shares_wall = set(adjacent_pairs).union(violations)
+
+            # Only edges between two placed rooms are drawn; filter them once up front
+            placed_centers = {name: centers[room] for name, room in self._rooms_by_name.items() if room in centers}
+
+            def drawable(edges):
+                return [(room1_name, room2_name) for room1_name, room2_name in edges
+                        if room1_name in placed_centers and room2_name in placed_centers]
+
+        # Add adjacency relationships as lines between room centers. Segments are gathered per
+        # line style and drawn as one collection each rather than one artist per edge
+        if n_adjacency:
+            for room1_name, room2_name in drawable(adjacency_edges):
+                segment = (placed_centers[room1_name], placed_centers[room2_name])
 
                 # Check if rooms share a wall
-                if room1.has_shared_wall_with(room2):
+                if (room1_name, room2_name) in shares_wall:
                     # Satisfied adjacency - green solid line
-                    ax.plot([center1[0], center2[0]], [center1[1], center2[1]], 'g-',
-                            linewidth=2,
-                            label='Adjacent (satisfied)' if room1_name == list(self.adjacency_graph.edges)[0][
-                                0] else "")
+                    adjacent_segments.append(segment)
                 else:
                     # Unsatisfied adjacency - red dashed line
-                    ax.plot([center1[0], center2[0]], [center1[1], center2[1]], 'r--',
-                            linewidth=1.5, alpha=0.7,
-                            label='Adjacent (unsatisfied)' if room1_name == list(self.adjacency_graph.edges)[0][
-                                0] else "")
+                    unsatisfied_segments.append(segment)
 
         # Add non-adjacency constraints visualization
-        non_adjacency_satisfied = []
-        non_adjacency_violated = []
-
-        for room1_name, room2_name in self.non_adjacency_graph.edges:
-            room1 = next(r for r in self.rooms if r.name == room1_name)
-            room2 = next(r for r in self.rooms if r.name == room2_name)
-
-            if room1.x is not None and room2.x is not None:
-                center1 = (room1.x + room1.width / 2, room1.y + room1.height / 2)
-                center2 = (room2.x + room2.width / 2, room2.y + room2.height / 2)
+        if n_non_adjacency:
+            for room1_name, room2_name in drawable(non_adjacency_edges):
+                segment = (placed_centers[room1_name], placed_centers[room2_name])
 
                 # Check if rooms share a wall (this would be a violation)
-                if room1.has_shared_wall_with(room2):
+                if (room1_name, room2_name) in shares_wall:
                     # Violation - rooms should not be adjacent but they are
-                    ax.plot([center1[0], center2[0]], [center1[1], center2[1]], 'red',
-                            linewidth=3, linestyle=':', alpha=0.8,
-                            label='Non-adjacent (VIOLATED)' if len(non_adjacency_violated) == 0 else "")
+                    violated_segments.append(segment)
                     non_adjacency_violated.append((room1_name, room2_name))
 
-                    # Add warning symbols at room centers
-                    ax.scatter(center1[0], center1[1], s=100, c='red', marker='X', alpha=0.8, zorder=10)
-                    ax.scatter(center2[0], center2[1], s=100, c='red', marker='X', alpha=0.8, zorder=10)
+                    # Mark both room centers with a warning symbol
+                    violation_markers.extend(segment)
                 else:
                     # Satisfied - rooms are not adjacent as required
-                    ax.plot([center1[0], center2[0]], [center1[1], center2[1]], 'blue',
-                            linewidth=1.5, linestyle='-.', alpha=0.6,
-                            label='Non-adjacent (satisfied)' if len(non_adjacency_satisfied) == 0 else "")
+                    separated_segments.append(segment)
                     non_adjacency_satisfied.append((room1_name, room2_name))
 
+        for segments, style in ((adjacent_segments, 'adjacent'), (unsatisfied_segments, 'unsatisfied'),
+                                (violated_segments, 'violated'), (separated_segments, 'separated')):
+            if segments:
+                # zorder 2 keeps the lines above the room patches, as ax.plot lines were
+                ax.add_collection(LineCollection(segments, zorder=2, **self._EDGE_STYLES[style]))
+
+        # Add warning symbols at the centers of violating rooms in one scatter
+        if violation_markers:
+            marker_x, marker_y = zip(*violation_markers)
+            ax.scatter(marker_x, marker_y, s=100, c='red', marker='X', alpha=0.8, zorder=10)
+
         # Set limits and labels
         max_width = self.floor_width
         max_height = self.floor_height
@@ -819,39 +1099,28 @@ class FloorPlan:
         ax.set_aspect('equal')
 
         # Enhanced title with constraint satisfaction info
-        score, adjacent_pairs, violations = self.evaluate_adjacency_score()
-        title = f'Floor Plan - Adjacency: {len(adjacent_pairs)}/{len(self.adjacency_graph.edges)}'
-        if len(self.non_adjacency_graph.edges) > 0:
-            title += f', Non-Adjacency: {len(non_adjacency_satisfied)}/{len(self.non_adjacency_graph.edges)} satisfied'
+        title = f'Floor Plan - Adjacency: {len(adjacent_pairs)}/{n_adjacency}'
+        if n_non_adjacency > 0:
+            title += f', Non-Adjacency: {len(non_adjacency_satisfied)}/{n_non_adjacency} satisfied'
         ax.set_title(title, fontsize=12, fontweight='bold')
 
         ax.set_xlabel('Width')
         ax.set_ylabel('Height')
 
-        # Add legend if there are any constraint relationships
-        if len(self.adjacency_graph.edges) > 0 or len(self.non_adjacency_graph.edges) > 0:
-            # Create custom legend entries
-            legend_elements = []
+        # Add legend and summary box only if there are any constraint relationships
+        if n_adjacency or n_non_adjacency:
+            # Create custom legend entries, one per kind of edge present
+            counts = {
+                'adjacent': len(adjacent_pairs),
+                'unsatisfied': n_adjacency - len(adjacent_pairs),
+                'separated': len(non_adjacency_satisfied),
+                'violated': len(non_adjacency_violated),
+            }
+            legend_elements = [plt.Line2D([0], [0], label=f'{self._EDGE_LABELS[kind]}: {count}',
+                                          **self._EDGE_STYLES[kind])
+                               for kind, count in counts.items() if count > 0]
 
-            if len(adjacent_pairs) > 0:
-                legend_elements.append(plt.Line2D([0], [0], color='green', linewidth=2,
-                                                  label=f'Adjacent (satisfied): {len(adjacent_pairs)}'))
-
-            unsatisfied_adjacent = len(self.adjacency_graph.edges) - len(adjacent_pairs)
-            if unsatisfied_adjacent > 0:
-                legend_elements.append(plt.Line2D([0], [0], color='red', linewidth=1.5,
-                                                  linestyle='--', alpha=0.7,
-                                                  label=f'Adjacent (unsatisfied): {unsatisfied_adjacent}'))
-
-            if len(non_adjacency_satisfied) > 0:
-                legend_elements.append(plt.Line2D([0], [0], color='blue', linewidth=1.5,
-                                                  linestyle='-.', alpha=0.6,
-                                                  label=f'Non-adjacent (satisfied): {len(non_adjacency_satisfied)}'))
-
-            if len(non_adjacency_violated) > 0:
-                legend_elements.append(plt.Line2D([0], [0], color='red', linewidth=3,
-                                                  linestyle=':', alpha=0.8,
-                                                  label=f'Non-adjacent (VIOLATED): {len(non_adjacency_violated)}'))
+            if non_adjacency_violated:
                 legend_elements.append(plt.Line2D([0], [0], marker='X', color='red',
                                                   linewidth=0, markersize=8, alpha=0.8,
                                                   label='Violation markers'))
@@ -859,11 +1128,10 @@ class FloorPlan:
             if legend_elements:
                 ax.legend(handles=legend_elements, loc='upper left', bbox_to_anchor=(1.02, 1))
 
-        # Add constraint satisfaction summary as text box
-        if len(self.adjacency_graph.edges) > 0 or len(self.non_adjacency_graph.edges) > 0:
+            # Add constraint satisfaction summary as text box
             summary_text = "Constraint Summary:\n"
-            summary_text += f"• Adjacency: {len(adjacent_pairs)}/{len(self.adjacency_graph.edges)} satisfied\n"
-            summary_text += f"• Non-adjacency: {len(non_adjacency_satisfied)}/{len(self.non_adjacency_graph.edges)} satisfied"
+            summary_text += f"• Adjacency: {len(adjacent_pairs)}/{n_adjacency} satisfied\n"
+            summary_text += f"• Non-adjacency: {len(non_adjacency_satisfied)}/{n_non_adjacency} satisfied"
 
             if len(non_adjacency_violated) > 0:
                 summary_text += f"\n• Violations: {len(non_adjacency_violated)} non-adjacency"
@@ -873,13 +1141,18 @@ class FloorPlan:
             ax.text(0.02, 0.98, summary_text, transform=ax.transAxes, fontsize=9,
                     verticalalignment='top', bbox=props)
 
-        plt.tight_layout()
-        plt.show()
+        if save_path is not None:
+            fig.savefig(save_path, dpi=120)
+        elif show:
+            if block:
+                plt.show()
+            else:
+                fig.canvas.draw_idle()
 
         # Print detailed constraint information
-        if len(self.non_adjacency_graph.edges) > 0:
+        if n_non_adjacency > 0:
             print("\n=== Non-Adjacency Constraint Details ===")
-            print(f"Total non-adjacency constraints: {len(self.non_adjacency_graph.edges)}")
+            print(f"Total non-adjacency constraints: {n_non_adjacency}")
             print(f"Satisfied: {len(non_adjacency_satisfied)}")
             print(f"Violated: {len(non_adjacency_violated)}")
 
@@ -890,10 +1163,14 @@ class FloorPlan:
                 print(f"VIOLATED non-adjacency pairs: {non_adjacency_violated}")
                 print("⚠️  These rooms should NOT be adjacent but currently share walls!")
 
+        return fig, ax
+
     def print_statistics(self):
         """Print statistics about the floor plan"""
-        total_area = sum(region['width'] * region['height'] for region in self.floor_regions)
-        used_area = sum(room.width * room.height for room in self.rooms if room.x is not None)
+        total_area = int((self._region_arr[:, 2] * self._region_arr[:, 3]).sum())
+        # Rooms may have been moved directly (e.g. by the GUI), so refresh the room arrays first
+        self._sync_room_arrays()
+        used_area = int((self._rw.astype(np.int64) * self._rh)[self._placed].sum())
 
         print(f"Floor area: {total_area} square units")
         print(f"Room area: {used_area} square units")
@@ -917,10 +1194,7 @@ class FloorPlan:
                 expansion_pct = (current_area - original_area) / original_area * 100 if original_area > 0 else 0
 
                 # Calculate how much of the max expansion was used
-                if not room.rotated:
-                    total_expansion = (room.width - room.original_width) + (room.height - room.original_height)
-                else:
-                    total_expansion = (room.width - room.original_height) + (room.height - room.original_width)
+                total_expansion = room.get_expansion_used()
 
                 expansion_usage = f"{total_expansion}/{room.max_expansion}"
 
@@ -988,10 +1262,12 @@ if __name__ == "__main__":
     # Try to place rooms with expansion enabled
     success = floor_plan.place_rooms_with_constraints_optimized(max_attempts=500, enable_expansion=True)
     if success:
-        # Compact the floorplan to minimize area
-        floor_plan.compact_rooms()
-        floor_plan.enforce_minimum_adjacency()
+        # Compact the floorplan to minimize area, then pull lonely rooms next to a neighbour;
+        # only the rooms that moved need compacting again
         floor_plan.compact_rooms()
+        moved_rooms = floor_plan.enforce_minimum_adjacency()
+        if moved_rooms:
+            floor_plan.compact_rooms(only_rooms=moved_rooms)
 
         print("Successfully placed all rooms!")
         floor_plan.print_statistics()
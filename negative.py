@@ -1,11 +1,27 @@
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
 import networkx as nx
 import numpy as np
+import itertools
 import random
+import time
+
+# Change in (x, y, width, height) per unit of growth towards each direction
+EXPANSION_DELTAS = {
+    'right': (0, 0, 1, 0),
+    'left': (-1, 0, 1, 0),
+    'up': (0, 0, 0, 1),
+    'down': (0, -1, 0, 1),
+}
+
+# Every order of the four expansion directions, for drawing whole orders in one call
+DIRECTION_ORDERS = tuple(itertools.permutations(('right', 'down', 'left', 'up')))
 
 
 class Room:
+    # Fixed attribute layout: smaller rooms and faster attribute access in the placement loops.
+    # idx is assigned by FloorPlan.add_room
+    __slots__ = ('name', 'original_width', 'original_height', 'width', 'height', 'x', 'y', 'rotated',
+                 'max_expansion', 'idx')
+
     def __init__(self, name, width, height, max_expansion=20):
         self.name = name
         self.original_width = width
@@ -15,6 +31,7 @@ class Room:
         self.x = None
         self.y = None
         self.rotated = False
+        self.idx = None  # position in FloorPlan.rooms and its parallel room arrays
         # Add max_expansion parameter to control how much a room can expand
         self.max_expansion = max_expansion
 
@@ -23,17 +40,18 @@ class Room:
         self.rotated = not self.rotated
 
     def reset_to_original_size(self):
-        """Reset room to its original dimensions"""
-        if self.rotated:
-            self.width = self.original_height
-            self.height = self.original_width
-        else:
-            self.width = self.original_width
-            self.height = self.original_height
+        """Reset room to its original, unrotated dimensions"""
+        self.width = self.original_width
+        self.height = self.original_height
+        self.rotated = False
 
     def get_area(self):
         return self.width * self.height
 
+    def get_expansion_used(self):
+        """Units the room has grown by; rotation swaps both sides, so the sum ignores orientation"""
+        return self.width + self.height - self.original_width - self.original_height
+
     def __repr__(self):
         position = f"at ({self.x}, {self.y})" if self.x is not None else "unplaced"
         size_info = f"[{self.width}x{self.height}]"
@@ -55,34 +73,22 @@ class Room:
 
     def has_shared_wall_with(self, other_room):
         """Check if this room shares a wall with another room"""
-        if self.x is None or self.y is None or other_room.x is None or other_room.y is None:
+        x1, y1, x2, y2 = self.x, self.y, other_room.x, other_room.y
+        if x1 is None or y1 is None or x2 is None or y2 is None:
             return False
+        right1, top1 = x1 + self.width, y1 + self.height
+        right2, top2 = x2 + other_room.width, y2 + other_room.height
 
-        left1, right1, bottom1, top1 = self.get_boundaries()
-        left2, right2, bottom2, top2 = other_room.get_boundaries()
-
-        # Check for vertical walls (left or right side)
-        if right1 == left2:  # This room's right wall is other room's left wall
-            # Check if there's a vertical overlap
-            return max(bottom1, bottom2) < min(top1, top2)
-
-        if right2 == left1:  # Other room's right wall is this room's left wall
-            # Check if there's a vertical overlap
-            return max(bottom1, bottom2) < min(top1, top2)
-
-        # Check for horizontal walls (top or bottom)
-        if top1 == bottom2:  # This room's top wall is other room's bottom wall
-            # Check if there's a horizontal overlap
-            return max(left1, left2) < min(right1, right2)
-
-        if top2 == bottom1:  # Other room's top wall is this room's bottom wall
-            # Check if there's a horizontal overlap
-            return max(left1, left2) < min(right1, right2)
-
-        return False
+        # A touching left/right wall decides the result before top/bottom walls are considered
+        if right1 == x2 or right2 == x1:
+            return max(y1, y2) < min(top1, top2)
+        return (top1 == y2 or top2 == y1) and max(x1, x2) < min(right1, right2)
 
 
 class FloorPlan:
+    # Room count from which check_overlap tests all rooms with one array expression
+    _VECTOR_OVERLAP_MIN_ROOMS = 128
+
     def __init__(self, region_specs):
         """
         region_specs: list of dictionaries with the following keys:
@@ -98,7 +104,9 @@ class FloorPlan:
         ]
         """
         self.rooms = []
+        self._rooms_by_name = {}  # name -> first room added under that name
         self.adjacency_graph = nx.Graph()
+        self._edge_index = None  # (edge, room1, room2) per adjacency edge, built lazily
 
         # Process floor regions
         self.floor_regions = []
@@ -129,40 +137,112 @@ class FloorPlan:
         self.floor_width = max(region['x'] + region['width'] for region in self.floor_regions)
         self.floor_height = max(region['y'] + region['height'] for region in self.floor_regions)
 
+        # Region bounds as plain (left, bottom, right, top) tuples for the containment fast path
+        self._region_bounds = tuple(
+            (region['x'], region['y'], region['x'] + region['width'], region['y'] + region['height'])
+            for region in self.floor_regions
+        )
+
+        # Regions in the order placement tries them: largest first, so big rooms land in the
+        # region most likely to hold them and small regions are left for small rooms
+        self._regions_by_area = sorted(self.floor_regions, key=lambda r: r['width'] * r['height'], reverse=True)
+
+        # Rasterize the composite floor shape once so containment tests become array lookups.
+        # The mask starts at the lowest region corner so negative coordinates are supported.
+        self._mask_x0 = min(region['x'] for region in self.floor_regions)
+        self._mask_y0 = min(region['y'] for region in self.floor_regions)
+        self._floor_mask = np.zeros((self.floor_height - self._mask_y0, self.floor_width - self._mask_x0),
+                                    dtype=bool)
+        for region in self.floor_regions:
+            mx, my = region['x'] - self._mask_x0, region['y'] - self._mask_y0
+            self._floor_mask[my:my + region['height'], mx:mx + region['width']] = True
+
+        # Room rectangles as parallel arrays (indexed by room.idx) for vectorized overlap tests
+        self._rx = np.zeros(0, dtype=np.int32)
+        self._ry = np.zeros(0, dtype=np.int32)
+        self._rw = np.zeros(0, dtype=np.int32)
+        self._rh = np.zeros(0, dtype=np.int32)
+        self._placed = np.zeros(0, dtype=bool)
+
+    def _sync_room_arrays(self, room):
+        """Copy a room's current rectangle into the parallel room arrays"""
+        i = room.idx
+        if room.x is None or room.y is None:
+            self._placed[i] = False
+            return
+        self._rx[i] = room.x
+        self._ry[i] = room.y
+        self._rw[i] = room.width
+        self._rh[i] = room.height
+        self._placed[i] = True
+
     def add_room(self, name, width, height, max_expansion=20):
         """Add a room with specified dimensions and maximum expansion limit"""
         room = Room(name, width, height, max_expansion)
+        room.idx = len(self.rooms)
         self.rooms.append(room)
+        self._rooms_by_name.setdefault(name, room)
+        self._rx = np.append(self._rx, np.int32(0))
+        self._ry = np.append(self._ry, np.int32(0))
+        self._rw = np.append(self._rw, np.int32(0))
+        self._rh = np.append(self._rh, np.int32(0))
+        self._placed = np.append(self._placed, False)
         self.adjacency_graph.add_node(name)
         return room
 
     def add_adjacency(self, room1_name, room2_name):
         if room1_name in self.adjacency_graph.nodes and room2_name in self.adjacency_graph.nodes:
             self.adjacency_graph.add_edge(room1_name, room2_name)
+            self._edge_index = None
+
+    def _get_edge_index(self):
+        """
+        Adjacency edges as (name pair, room1, room2) with the Room objects already looked up,
+        rebuilt only after add_adjacency
+        """
+        if self._edge_index is None:
+            rooms_by_name = self._rooms_by_name
+            self._edge_index = [(edge, rooms_by_name[edge[0]], rooms_by_name[edge[1]])
+                                for edge in self.adjacency_graph.edges]
+        return self._edge_index
 
     def is_within_floor(self, x, y, width, height):
         """Check if a rectangle fits within the entire composite floor shape"""
-        for dx in range(width):
-            for dy in range(height):
-                px = x + dx
-                py = y + dy
+        right, top = x + width, y + height
 
-                if not self.point_in_floor(px, py):
-                    return False
-        return True
+        # Fast path: the rectangle lies entirely inside a single region
+        for left, bottom, region_right, region_top in self._region_bounds:
+            if left <= x and right <= region_right and bottom <= y and top <= region_top:
+                return True
+
+        if len(self.floor_regions) == 1:
+            return False
+
+        # Composite shape: every cell under the rectangle must be floor
+        mx, my = x - self._mask_x0, y - self._mask_y0
+        if mx < 0 or my < 0 or right > self.floor_width or top > self.floor_height:
+            return False
+        return bool(self._floor_mask[my:my + height, mx:mx + width].all())
 
     def point_in_floor(self, x, y):
         """Check if a point is within any of the defined floor regions"""
-        for region in self.floor_regions:
-            if (region['x'] <= x < region['x'] + region['width'] and
-                    region['y'] <= y < region['y'] + region['height']):
-                return True
-        return False
+        mx, my = x - self._mask_x0, y - self._mask_y0
+        if mx < 0 or my < 0 or x >= self.floor_width or y >= self.floor_height:
+            return False
+        return bool(self._floor_mask[my, mx])
 
     def check_overlap(self, room, x, y, width, height):
         """Check if placing a room at (x,y) with given width/height would overlap with existing rooms"""
+        # NumPy's per-call overhead only pays off once there are many rooms to test against
+        if len(self.rooms) >= self._VECTOR_OVERLAP_MIN_ROOMS:
+            # Two rectangles overlap if they overlap in both x and y directions
+            mask = ((x < self._rx + self._rw) & (x + width > self._rx) &
+                    (y < self._ry + self._rh) & (y + height > self._ry) & self._placed)
+            mask[room.idx] = False
+            return bool(mask.any())
+
         for existing_room in self.rooms:
-            if existing_room.x is not None and existing_room != room:
+            if existing_room.x is not None and existing_room is not room:
                 # Check for overlap - two rectangles overlap if they overlap in both x and y directions
                 if (x < existing_room.x + existing_room.width and
                         x + width > existing_room.x and
@@ -171,41 +251,50 @@ class FloorPlan:
                     return True
         return False
 
-    def evaluate_adjacency_score(self):
-        """Calculate how well adjacency requirements are met"""
-        score = 0
-        adjacent_pairs = []
-
-        for room1_name, room2_name in self.adjacency_graph.edges:
-            room1 = next(r for r in self.rooms if r.name == room1_name)
-            room2 = next(r for r in self.rooms if r.name == room2_name)
+    def _sample_free_position(self, region, width, height):
+        """
+        Pick a uniformly random position for a width x height rectangle inside a region that
+        overlaps no placed room. Returns (x, y), or None when the region has no free position.
+        """
+        region_x, region_y = region['x'], region['y']
+        nx = region['width'] - width + 1
+        ny = region['height'] - height + 1
+        if nx <= 0 or ny <= 0:
+            return None
 
-            if room1.x is None or room2.x is None:
+        # blocked[j, i] is True when the rectangle at (region_x + i, region_y + j) overlaps a
+        # placed room; each room blocks one contiguous block of positions
+        blocked = np.zeros((ny, nx), dtype=bool)
+        for other in self.rooms:
+            if other.x is None:
+                continue
+            i1 = other.x + other.width - region_x
+            j1 = other.y + other.height - region_y
+            if i1 <= 0 or j1 <= 0:
                 continue
+            i0 = max(other.x - width + 1 - region_x, 0)
+            j0 = max(other.y - height + 1 - region_y, 0)
+            blocked[j0:j1, i0:i1] = True
 
-            # Check if rooms share a wall
-            if room1.has_shared_wall_with(room2):
-                score += 1
-                adjacent_pairs.append((room1_name, room2_name))
+        free = np.flatnonzero(~blocked)
+        if free.size == 0:
+            return None
+        j, i = divmod(int(free[random.randrange(free.size)]), nx)
+        return region_x + i, region_y + j
 
-        return score, adjacent_pairs
+    def evaluate_adjacency_score(self):
+        """Calculate how well adjacency requirements are met"""
+        # has_shared_wall_with is False for unplaced rooms
+        adjacent_pairs = [edge for edge, room1, room2 in self._get_edge_index() if room1.has_shared_wall_with(room2)]
+        return len(adjacent_pairs), adjacent_pairs
 
     def can_expand_room(self, room, direction, amount):
         """Check if a room can be expanded in the given direction by the specified amount"""
         if room.x is None or room.y is None:
             return False
 
-        # Calculate total expansion so far
-        current_expansion = 0
-        if not room.rotated:
-            current_expansion += room.width - room.original_width
-            current_expansion += room.height - room.original_height
-        else:
-            current_expansion += room.width - room.original_height
-            current_expansion += room.height - room.original_width
-
         # Check if we've reached the maximum expansion for this room
-        if current_expansion + amount > room.max_expansion:
+        if room.get_expansion_used() + amount > room.max_expansion:
             return False
 
         # Calculate new dimensions and position after expansion
@@ -239,124 +328,307 @@ class FloorPlan:
         Expand rooms to fill available space while maintaining adjacency constraints
         and ensuring no overlaps, respecting each room's max_expansion limit
         """
-        # For each room, attempt expansion in each direction
+        # Rooms may have been moved directly by the caller; refresh the overlap arrays first
         for room in self.rooms:
+            self._sync_room_arrays(room)
+
+        # For each room, attempt expansion in all four directions. The order is randomized for
+        # more varied results; one uniform pick among all orders per room, drawn as a batch
+        orders = random.choices(DIRECTION_ORDERS, k=len(self.rooms))
+        for room, directions in zip(self.rooms, orders):
             if room.x is None or room.y is None:
                 continue
 
-            # Try to expand in all four directions
-            directions = ['right', 'down', 'left', 'up']
-            random.shuffle(directions)  # Randomize direction order for more varied results
-
             for direction in directions:
-                # Try expanding 1 unit at a time up to max expansion
-                expanded = True
-                total_expansion = 0
-
-                while expanded:
-                    if self.can_expand_room(room, direction, 1):
-                        # Apply 1 unit expansion
-                        if direction == 'right':
-                            room.width += 1
-                        elif direction == 'left':
-                            room.x -= 1
-                            room.width += 1
-                        elif direction == 'up':
-                            room.height += 1
-                        elif direction == 'down':
-                            room.y -= 1
-                            room.height += 1
-
-                        total_expansion += 1
-                    else:
-                        expanded = False
+                # Grow in one step by the largest amount unit-by-unit expansion would reach
+                amount = self._expansion_limit(room, direction)
+                if amount:
+                    self._grow_room(room, direction, amount)
+                    self._sync_room_arrays(room)
 
-    def place_rooms_with_constraints(self, max_attempts=1000, enable_expansion=True):
-        """Place rooms respecting floor shape and trying to satisfy adjacencies"""
+    def _expansion_limit(self, room, direction):
+        """
+        Largest amount the room can legally grow towards direction (as can_expand_room decides),
+        computed in one step: the smallest of its remaining expansion budget, the gap to the
+        nearest placed room in the way, and the furthest growth that stays on the floor
+        """
+        if room.x is None or room.y is None or direction not in EXPANSION_DELTAS:
+            return 0
+        x, y, width, height = room.x, room.y, room.width, room.height
+        limit = room.max_expansion - room.get_expansion_used()
+
+        # Rooms: other placed rooms overlapping the room's span across the direction block it
+        for other in self.rooms:
+            if limit <= 0:
+                return 0
+            ox, oy = other.x, other.y
+            if ox is None or oy is None or other is room:
+                continue
+            ow, oh = other.width, other.height
+            if direction == 'right':
+                if oy < y + height and oy + oh > y and ox + ow > x:
+                    limit = min(limit, ox - (x + width))
+            elif direction == 'left':
+                if oy < y + height and oy + oh > y and ox < x + width:
+                    limit = min(limit, x - (ox + ow))
+            elif direction == 'up':
+                if ox < x + width and ox + ow > x and oy + oh > y:
+                    limit = min(limit, oy - (y + height))
+            elif ox < x + width and ox + ow > x and oy < y + height:
+                limit = min(limit, y - (oy + oh))
+        if limit <= 0:
+            return 0
+
+        # Floor: a grown rectangle contains every smaller one, so the fitting amounts form a
+        # prefix and the largest can be bisected
+        dx, dy, dwidth, dheight = EXPANSION_DELTAS[direction]
+        low, high = 0, limit
+        while low < high:
+            amount = (low + high + 1) // 2
+            if self.is_within_floor(x + dx * amount, y + dy * amount,
+                                    width + dwidth * amount, height + dheight * amount):
+                low = amount
+            else:
+                high = amount - 1
+        return low
+
+    @staticmethod
+    def _grow_room(room, direction, amount):
+        """Grow a room by amount units towards the given direction"""
+        dx, dy, dwidth, dheight = EXPANSION_DELTAS[direction]
+        room.x += dx * amount
+        room.y += dy * amount
+        room.width += dwidth * amount
+        room.height += dheight * amount
+
+    def _capture_placement(self):
+        """Snapshot of every room's placement, in self.rooms order"""
+        return [(room.name, room.x, room.y, room.width, room.height, room.rotated, room.max_expansion)
+                for room in self.rooms]
+
+    def _apply_placement(self, placement):
+        """Restore a snapshot taken by _capture_placement"""
+        for room, room_data in zip(self.rooms, placement):
+            name, x, y, width, height, rotated, max_expansion = room_data
+            room.x = x
+            room.y = y
+            room.width = width
+            room.height = height
+            room.rotated = rotated
+            room.max_expansion = max_expansion
+            self._sync_room_arrays(room)
+
+    def _backtracking_order(self):
+        """
+        Order rooms for the backtracking search: each next room is the one with the most
+        neighbors already ordered, then the most neighbors overall, then the largest area.
+        Rooms without adjacency requirements come last and fill the remaining space
+        """
+        neighbors = {room.name: set(self.adjacency_graph.neighbors(room.name)) for room in self.rooms}
+        remaining = sorted(self.rooms, key=lambda r: r.get_area(), reverse=True)
+        ordered_names = set()
+        order = []
+        while remaining:
+            room = max(remaining, key=lambda r: (len(neighbors[r.name] & ordered_names), len(neighbors[r.name])))
+            remaining.remove(room)
+            order.append(room)
+            ordered_names.add(room.name)
+        return order
+
+    def _candidate_positions(self, room):
+        """
+        Legal (x, y, rotated) spots for an unplaced room in either orientation: flush against a
+        side of a placed room (aligned with either end of that side) or in a region corner
+        """
+        candidates = []
+        seen = set()
+        for rotated in (False, True):
+            width, height = ((room.original_height, room.original_width) if rotated
+                             else (room.original_width, room.original_height))
+            if rotated and width == height:
+                break
+
+            spots = []
+            for left, bottom, right, top in self._region_bounds:
+                spots += [(left, bottom), (right - width, bottom), (left, top - height), (right - width, top - height)]
+            for other in self.rooms:
+                if other.x is None or other.y is None:
+                    continue
+                ox, oy, ow, oh = other.x, other.y, other.width, other.height
+                for y in (oy, oy + oh - height):
+                    spots += [(ox - width, y), (ox + ow, y)]
+                for x in (ox, ox + ow - width):
+                    spots += [(x, oy - height), (x, oy + oh)]
+
+            for x, y in spots:
+                if (x, y, rotated) in seen:
+                    continue
+                seen.add((x, y, rotated))
+                if self.is_within_floor(x, y, width, height) and not self.check_overlap(room, x, y, width, height):
+                    candidates.append((x, y, rotated))
+        return candidates
+
+    def _place_at(self, room, x, y, rotated):
+        """Place a room at (x, y) in its original size, rotated or not"""
+        room.reset_to_original_size()
+        if rotated:
+            room.rotate()
+        room.x, room.y = x, y
+        self._sync_room_arrays(room)
+
+    def _backtracking_search(self, time_limit, max_candidates):
+        """
+        Depth-first placement with backtracking. Rooms are placed one at a time in
+        _backtracking_order, trying the candidate spots that satisfy the most adjacencies with
+        already placed rooms first (ties in random order) and undoing the last room when the
+        next one cannot be placed. Branches that can no longer beat the best complete layout are
+        cut. A search that gets stuck in one subtree restarts with new random tie orders and
+        twice the node budget, until a layout meets every adjacency or time_limit seconds pass.
+        Returns (score, placement snapshot) of the best complete layout, or (-1, None)
+        """
+        order = self._backtracking_order()
+        rooms_by_name = self._rooms_by_name
+        neighbors = [[rooms_by_name[name] for name in self.adjacency_graph.neighbors(room.name)] for room in order]
+        total_edges = self.adjacency_graph.number_of_edges()
+        deadline = time.perf_counter() + time_limit
+        best = [-1, None]
+        nodes = [0, 0]  # rooms placed in this run, node budget of this run
+
+        def place(i, missed):
+            """Place order[i:] given `missed` adjacencies already broken; True stops the run"""
+            if i == len(order):
+                score = total_edges - missed
+                if score > best[0]:
+                    best[0], best[1] = score, self._capture_placement()
+                return score == total_edges
+            nodes[0] += 1
+            if nodes[0] > nodes[1] or time.perf_counter() > deadline:
+                return True
+
+            room = order[i]
+            placed_neighbors = [other for other in neighbors[i] if other.x is not None and other is not room]
+
+            # Score every spot by the adjacencies it meets with placed neighbors
+            scored = []
+            for x, y, rotated in self._candidate_positions(room):
+                self._place_at(room, x, y, rotated)
+                hits = sum(room.has_shared_wall_with(other) for other in placed_neighbors)
+                scored.append((hits, x, y, rotated))
+            random.shuffle(scored)
+            scored.sort(key=lambda spot: spot[0], reverse=True)
+
+            for hits, x, y, rotated in scored[:max_candidates]:
+                # Adjacencies missed so far bound the best score this branch can still reach
+                branch_missed = missed + len(placed_neighbors) - hits
+                if total_edges - branch_missed <= best[0]:
+                    break
+                self._place_at(room, x, y, rotated)
+                if place(i + 1, branch_missed):
+                    return True
+
+            room.x = None
+            room.y = None
+            self._sync_room_arrays(room)
+            return False
+
+        budget = 8 * len(order)
+        while best[0] < total_edges and time.perf_counter() <= deadline:
+            for room in self.rooms:
+                room.x = None
+                room.y = None
+                room.reset_to_original_size()
+            self._placed[:] = False
+            nodes[0], nodes[1] = 0, budget
+            place(0, 0)
+            if nodes[0] <= budget:
+                break  # the run explored its whole tree; restarting would not find more
+            budget *= 2
+        return best[0], best[1]
+
+    def _try_place_room(self, room):
+        """
+        Place a room at a random free position, trying regions largest first in its current
+        orientation and then rotated. Returns True if the room was placed
+        """
+        for attempt in range(2):
+            if attempt:
+                # A square room has nothing new to try when rotated
+                if room.width == room.height:
+                    break
+                room.rotate()
+
+            for region in self._regions_by_area:
+                # Skip regions too small for this room
+                if region['width'] < room.width or region['height'] < room.height:
+                    continue
+
+                # Try placing in this region
+                position = self._sample_free_position(region, room.width, room.height)
+                if position is not None:
+                    room.x, room.y = position
+                    self._sync_room_arrays(room)
+                    return True
+        return False
+
+    def place_rooms_with_constraints(self, max_attempts=1000, enable_expansion=True, time_limit=1.0,
+                                     max_candidates=8):
+        """
+        Place rooms respecting floor shape and trying to satisfy adjacencies. A backtracking
+        search (at most time_limit seconds, max_candidates spots per room) runs first; random
+        restarts (max_attempts) are only tried when it does not meet every adjacency
+        """
         # Sort rooms by area (largest first) for better packing
         sorted_rooms = sorted(self.rooms, key=lambda r: r.get_area(), reverse=True)
 
         best_score = -1
         best_placement = None
+        total_edges = self.adjacency_graph.number_of_edges()
+        all_placed = False
+
+        # Backtracking keeps partial layouts that work instead of starting over every attempt
+        _, placement = self._backtracking_search(time_limit, max_candidates)
+        if placement is not None:
+            self._apply_placement(placement)
+            if enable_expansion:
+                self.expand_rooms()
+            best_score, _ = self.evaluate_adjacency_score()
+            best_placement = self._capture_placement()
+            if best_score == total_edges:
+                max_attempts = 0  # nothing left for random restarts to improve
+
+        # Random restarts put each room inside a single region. A room that fits no region in
+        # either orientation fails every attempt the same way, so skip them all
+        region_sizes = [(region['width'], region['height']) for region in self.floor_regions]
+        for room in self.rooms:
+            width, height = room.original_width, room.original_height
+            if not any((width <= region_width and height <= region_height) or
+                       (height <= region_width and width <= region_height)
+                       for region_width, region_height in region_sizes):
+                max_attempts = 0
+                break
 
         # Attempt placements
         for attempt in range(max_attempts):
-            # Reset placements and sizes
+            # Reset placements and sizes, and randomly decide whether to rotate each room
+            # (one random bit per room, drawn together)
+            rotate = random.getrandbits(len(self.rooms))
             for room in self.rooms:
                 room.x = None
                 room.y = None
                 room.reset_to_original_size()
-                # Randomly decide whether to rotate
-                if random.random() > 0.5:
+                if rotate & 1:
                     room.rotate()
+                rotate >>= 1
+            self._placed[:] = False
 
             # Try to place all rooms
             all_placed = True
             for room in sorted_rooms:
-                placed = False
-
-                # Try different positions
-                for region in self.floor_regions:
-                    # Skip regions too small for this room
-                    if region['width'] < room.width or region['height'] < room.height:
-                        continue
-
-                    # Try placing in this region
-                    for _ in range(200):  # Try 200 random positions within this region
-                        # Ensure we have valid ranges for random.randint
-                        max_x = region['x'] + region['width'] - room.width
-                        max_y = region['y'] + region['height'] - room.height
-
-                        # Only try if we have valid ranges
-                        if max_x >= region['x'] and max_y >= region['y']:
-                            x = random.randint(region['x'], max_x)
-                            y = random.randint(region['y'], max_y)
-
-                            if not self.check_overlap(room, x, y, room.width, room.height):
-                                room.x = x
-                                room.y = y
-                                placed = True
-                                break
-
-                    if placed:
-                        break
-
-                if not placed:
-                    # Try rotating the room and placing again
-                    room.rotate()
-                    for region in self.floor_regions:
-                        # Skip regions too small for this room after rotation
-                        if region['width'] < room.width or region['height'] < room.height:
-                            continue
-
-                        # Try placing in this region
-                        for _ in range(100):
-                            max_x = region['x'] + region['width'] - room.width
-                            max_y = region['y'] + region['height'] - room.height
-
-                            if max_x >= region['x'] and max_y >= region['y']:
-                                x = random.randint(region['x'], max_x)
-                                y = random.randint(region['y'], max_y)
-
-                                if not self.check_overlap(room, x, y, room.width, room.height):
-                                    room.x = x
-                                    room.y = y
-                                    placed = True
-                                    break
-
-                        if placed:
-                            break
-
-                if not placed:
+                if not self._try_place_room(room):
                     all_placed = False
                     break
 
             if all_placed:
-                # Store the current placement
-                current_placement = [
-                    (room.name, room.x, room.y, room.width, room.height, room.rotated, room.max_expansion)
-                    for room in self.rooms]
-
                 # If expansion is enabled, try to expand rooms to fill space
                 if enable_expansion:
                     self.expand_rooms()
@@ -367,31 +639,25 @@ class FloorPlan:
                 # Keep track of the best placement
                 if score > best_score:
                     best_score = score
-                    best_placement = [
-                        (room.name, room.x, room.y, room.width, room.height, room.rotated, room.max_expansion)
-                        for room in self.rooms]
+                    best_placement = self._capture_placement()
 
-                # If all adjacency requirements are met, we can stop
-                if score == len(self.adjacency_graph.edges):
-                    break
+                    # If all adjacency requirements are met, we can stop
+                    if score == total_edges:
+                        break
 
         # Restore best placement if found
-        if best_placement:
-            for room_data in best_placement:
-                name, x, y, width, height, rotated, max_expansion = room_data
-                room = next(r for r in self.rooms if r.name == name)
-                room.x = x
-                room.y = y
-                room.width = width
-                room.height = height
-                room.rotated = rotated
-                room.max_expansion = max_expansion
+        if best_placement is not None:
+            self._apply_placement(best_placement)
             return True
 
         return all_placed  # Return True if at least we placed all rooms, even if adjacencies aren't perfect
 
     def visualize(self):
         """Visualize the floor plan using matplotlib"""
+        # Imported here so placement-only use (scripts, batch runs) does not load matplotlib
+        import matplotlib.pyplot as plt
+        import matplotlib.patches as patches
+
         fig, ax = plt.subplots(figsize=(10, 8))
 
         # Draw floor shape
@@ -444,10 +710,7 @@ class FloorPlan:
                 )
 
         # Add adjacency relationships as dotted lines between room centers
-        for room1_name, room2_name in self.adjacency_graph.edges:
-            room1 = next(r for r in self.rooms if r.name == room1_name)
-            room2 = next(r for r in self.rooms if r.name == room2_name)
-
+        for _, room1, room2 in self._get_edge_index():
             if room1.x is not None and room2.x is not None:
                 center1 = (room1.x + room1.width / 2, room1.y + room1.height / 2)
                 center2 = (room2.x + room2.width / 2, room2.y + room2.height / 2)
@@ -1,12 +1,16 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import numpy as np
-from bfs import FloorPlan  # Import from your original file
 import json
+import queue
+import threading
+from datetime import datetime
 from tkinter import filedialog
 
+try:
+    import orjson  # Optional: much faster JSON encoding/decoding for large save files
+except ImportError:
+    orjson = None
+
 class FloorPlanGUI:
     def __init__(self, root):
         self.root = root
@@ -17,6 +21,21 @@ class FloorPlanGUI:
         self.floor_plan = None
         self.current_screen = "regions"
 
+        # In-memory copies of the regions/rooms/adjacencies, kept in the same order as the widgets
+        self._regions = []
+        self._rooms = []
+        self._room_names = []  # names of self._rooms, fed straight to the adjacency combo boxes
+        self._adj_pairs = []
+        self._adj_set = set()  # frozenset({room1, room2}) per adjacency, for the duplicate check
+
+        # Generation settings live here rather than on the output screen, which is built lazily
+        self.max_attempts_var = tk.StringVar(value="1000")
+        self.enable_expansion_var = tk.BooleanVar(value=True)
+
+        # The solver runs on a worker thread and hands its result back through this queue
+        self._result_q = queue.Queue()
+        self._worker = None
+
         # Create main container
         self.main_frame = ttk.Frame(root)
         self.main_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
@@ -41,15 +60,20 @@ class FloorPlanGUI:
             self.nav_buttons[screen] = btn
 
         # Generate button
-        ttk.Button(self.nav_frame, text="Generate Floor Plan",
-                   command=self.generate_floor_plan,
-                   style="Accent.TButton").pack(side=tk.RIGHT, padx=5)
+        self.generate_button = ttk.Button(self.nav_frame, text="Generate Floor Plan",
+                                          command=self.generate_floor_plan,
+                                          style="Accent.TButton")
+        self.generate_button.pack(side=tk.RIGHT, padx=5)
 
         # Create content frame
         self.content_frame = ttk.Frame(self.main_frame)
         self.content_frame.pack(fill=tk.BOTH, expand=True)
 
-        # Initialize screens
+        # Screens are stacked in the same grid cell; showing one just raises it
+        self.content_frame.grid_rowconfigure(0, weight=1)
+        self.content_frame.grid_columnconfigure(0, weight=1)
+
+        # Screens are built the first time they are shown
         self.screens = {}
         self.init_screens()
 
@@ -60,18 +84,20 @@ class FloorPlanGUI:
         self.show_screen("regions")
 
     def init_screens(self):
-        """Initialize all screen frames"""
-        # Region Specs Screen
-        self.init_regions_screen()
-
-        # Rooms Screen
-        self.init_rooms_screen()
-
-        # Adjacency Screen
-        self.init_adjacency_screen()
+        """Register the builder for each screen frame"""
+        self._screen_builders = {
+            "regions": self.init_regions_screen,
+            "rooms": self.init_rooms_screen,
+            "adjacency": self.init_adjacency_screen,
+            "output": self.init_output_screen
+        }
 
-        # Output Screen
-        self.init_output_screen()
+    def _ensure_screen(self, screen_name):
+        """Build the screen on first use and return its frame"""
+        if screen_name not in self.screens:
+            self._screen_builders[screen_name]()
+            self.screens[screen_name].grid(row=0, column=0, sticky="nsew")
+        return self.screens[screen_name]
 
     def init_regions_screen(self):
         """Initialize the region specifications screen"""
@@ -106,9 +132,9 @@ class FloorPlanGUI:
         self.regions_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
 
         # Scrollbar for regions
-        regions_scrollbar = ttk.Scrollbar(regions_frame, orient=tk.VERTICAL, command=self.regions_tree.yview)
-        regions_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        self.regions_tree.config(yscrollcommand=regions_scrollbar.set)
+        self.regions_scrollbar = ttk.Scrollbar(regions_frame, orient=tk.VERTICAL, command=self.regions_tree.yview)
+        self.regions_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.regions_tree.config(yscrollcommand=self.regions_scrollbar.set)
 
         # Region input frame
         input_frame = ttk.Frame(frame)
@@ -140,6 +166,8 @@ class FloorPlanGUI:
         ttk.Button(button_frame, text="Remove Selected", command=self.remove_region).pack(side=tk.LEFT, padx=2)
         ttk.Button(button_frame, text="Clear All", command=self.clear_regions).pack(side=tk.LEFT, padx=2)
 
+        self.fill_regions_tree()
+
     def init_rooms_screen(self):
         """Initialize the rooms screen"""
         frame = ttk.Frame(self.content_frame)
@@ -173,9 +201,9 @@ class FloorPlanGUI:
         self.rooms_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
 
         # Scrollbar for rooms
-        rooms_scrollbar = ttk.Scrollbar(rooms_frame, orient=tk.VERTICAL, command=self.rooms_tree.yview)
-        rooms_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        self.rooms_tree.config(yscrollcommand=rooms_scrollbar.set)
+        self.rooms_scrollbar = ttk.Scrollbar(rooms_frame, orient=tk.VERTICAL, command=self.rooms_tree.yview)
+        self.rooms_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.rooms_tree.config(yscrollcommand=self.rooms_scrollbar.set)
 
         # Room input frame
         input_frame = ttk.Frame(frame)
@@ -206,6 +234,8 @@ class FloorPlanGUI:
         ttk.Button(button_frame, text="Remove Selected", command=self.remove_room).pack(side=tk.LEFT, padx=2)
         ttk.Button(button_frame, text="Clear All", command=self.clear_rooms).pack(side=tk.LEFT, padx=2)
 
+        self.fill_rooms_tree()
+
     def init_adjacency_screen(self):
         """Initialize the adjacency screen"""
         frame = ttk.Frame(self.content_frame)
@@ -262,6 +292,8 @@ class FloorPlanGUI:
         ttk.Button(adj_button_frame, text="Clear All",
                    command=self.clear_adjacencies).pack(side=tk.LEFT, padx=2)
 
+        self.fill_adjacencies_listbox()
+
     def init_output_screen(self):
         """Initialize the output screen"""
         frame = ttk.Frame(self.content_frame)
@@ -289,11 +321,9 @@ class FloorPlanGUI:
 
         # Max attempts
         ttk.Label(gen_controls_row, text="Max Attempts:").grid(row=0, column=0, sticky=tk.W, padx=5)
-        self.max_attempts_var = tk.StringVar(value="1000")
         ttk.Entry(gen_controls_row, textvariable=self.max_attempts_var, width=10).grid(row=0, column=1, padx=5)
 
         # Enable expansion
-        self.enable_expansion_var = tk.BooleanVar(value=True)
         ttk.Checkbutton(gen_controls_row, text="Enable Room Expansion",
                         variable=self.enable_expansion_var).grid(row=0, column=2, padx=20)
 
@@ -322,11 +352,21 @@ class FloorPlanGUI:
         viz_frame = ttk.LabelFrame(right_panel, text="Floor Plan Visualization", padding=10)
         viz_frame.pack(fill=tk.BOTH, expand=True)
 
-        # Matplotlib figure
+        # Matplotlib figure (imported here so startup does not pay for matplotlib)
+        import matplotlib.pyplot as plt
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
         self.fig, self.ax = plt.subplots(figsize=(8, 6))
         self.canvas = FigureCanvasTkAgg(self.fig, viz_frame)
         self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
 
+        # Artists kept between redraws so a new layout updates them instead of clearing the axes
+        self._drawn_regions = None  # region tuples the outlines were drawn for
+        self._room_collection = None  # PatchCollection holding every room rectangle
+        self._room_labels = {}  # room name -> Text
+        self._palette = None  # RGBA row per room index
+        self._adjacency_lines = []
+        self._layout_key = None
+
     def save_floor_plan_json(self):
         """Save the current floor plan configuration and results to JSON"""
         try:
@@ -361,8 +401,12 @@ class FloorPlanGUI:
                 data["results"] = self.get_floor_plan_results()
 
             # Save to file
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            if orjson is not None:
+                with open(file_path, 'wb') as f:
+                    f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+            else:
+                with open(file_path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, indent=2, ensure_ascii=False)
 
             messagebox.showinfo("Success", f"Floor plan saved to:\n{file_path}")
 
@@ -382,33 +426,39 @@ class FloorPlanGUI:
                 return  # User cancelled
 
             # Load from file
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            if orjson is not None:
+                with open(file_path, 'rb') as f:
+                    data = orjson.loads(f.read())
+            else:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
 
             # Clear existing data
             self.clear_all_data()
 
             # Load regions
             if "regions" in data:
-                for i, region in enumerate(data["regions"]):
-                    item = self.regions_tree.insert("", "end", text=f"Region {i + 1}")
-                    self.regions_tree.set(item, "X", region['x'])
-                    self.regions_tree.set(item, "Y", region['y'])
-                    self.regions_tree.set(item, "Width", region['width'])
-                    self.regions_tree.set(item, "Height", region['height'])
+                for region in data["regions"]:
+                    self._regions.append({key: int(region[key]) for key in ('x', 'y', 'width', 'height')})
 
             # Load rooms
             if "rooms" in data:
                 for room in data["rooms"]:
-                    item = self.rooms_tree.insert("", "end", text=room['name'])
-                    self.rooms_tree.set(item, "Width", room['width'])
-                    self.rooms_tree.set(item, "Height", room['height'])
-                    self.rooms_tree.set(item, "Max Expansion", room['max_expansion'])
+                    self._rooms.append({
+                        "name": room['name'],
+                        "width": int(room['width']),
+                        "height": int(room['height']),
+                        "max_expansion": int(room['max_expansion'])
+                    })
+                    self._room_names.append(room['name'])
 
             # Load adjacencies
             if "adjacencies" in data:
                 for adj in data["adjacencies"]:
-                    self.adjacencies_listbox.insert(tk.END, f"{adj['room1']} ↔ {adj['room2']}")
+                    self._adj_pairs.append((adj['room1'], adj['room2']))
+                    self._adj_set.add(frozenset((adj['room1'], adj['room2'])))
+
+            self.fill_data_widgets()
 
             # Load generation settings
             if "generation_settings" in data:
@@ -434,7 +484,7 @@ class FloorPlanGUI:
                 else:  # User chose NO - generate new layout
                     self.generate_floor_plan()
                     messagebox.showinfo("Success",
-                                        f"Floor plan configuration loaded from:\n{file_path}\nNew layout generated.")
+                                        f"Floor plan configuration loaded from:\n{file_path}\nGenerating a new layout.")
             else:
                 # No results in file, ask if user wants to generate now
                 response = messagebox.askyesno(
@@ -445,7 +495,7 @@ class FloorPlanGUI:
 
                 if response:
                     self.generate_floor_plan()
-                    messagebox.showinfo("Success", f"Floor plan loaded and generated from:\n{file_path}")
+                    messagebox.showinfo("Success", f"Floor plan loaded from:\n{file_path}\nGenerating the layout.")
                 else:
                     messagebox.showinfo("Success", f"Floor plan configuration loaded from:\n{file_path}")
 
@@ -455,6 +505,8 @@ class FloorPlanGUI:
     def restore_floor_plan_from_results(self, results_data):
         """Restore floor plan from saved results data"""
         try:
+            from bfs import FloorPlan  # Import from your original file
+
             # Create floor plan with current regions
             regions = self.get_regions_data()
             if not regions:
@@ -463,27 +515,19 @@ class FloorPlanGUI:
             self.floor_plan = FloorPlan(regions)
 
             # Add rooms with original specifications
-            room_names = []
-            for item in self.rooms_tree.get_children():
-                name = self.rooms_tree.item(item)['text']
-                width = int(self.rooms_tree.set(item, "Width"))
-                height = int(self.rooms_tree.set(item, "Height"))
-                max_exp = int(self.rooms_tree.set(item, "Max Expansion"))
-
-                self.floor_plan.add_room(name, width, height, max_exp)
-                room_names.append(name)
+            for room in self._rooms:
+                self.floor_plan.add_room(**room)
 
             # Add adjacencies
-            for i in range(self.adjacencies_listbox.size()):
-                adjacency = self.adjacencies_listbox.get(i)
-                room1, room2 = adjacency.split(" ↔ ")
+            for room1, room2 in self._adj_pairs:
                 self.floor_plan.add_adjacency(room1, room2)
 
             # Restore room placements from saved results
             if "room_placements" in results_data:
+                rooms_by_name = {room.name: room for room in self.floor_plan.rooms}
                 for placement in results_data["room_placements"]:
                     # Find the room object
-                    room = next((r for r in self.floor_plan.rooms if r.name == placement["name"]), None)
+                    room = rooms_by_name.get(placement["name"])
                     if room:
                         # Restore the placement
                         room.x = placement["x"]
@@ -509,38 +553,15 @@ class FloorPlanGUI:
 
     def get_regions_data(self):
         """Get regions data as list of dictionaries"""
-        regions = []
-        for item in self.regions_tree.get_children():
-            region = {
-                "x": int(self.regions_tree.set(item, "X")),
-                "y": int(self.regions_tree.set(item, "Y")),
-                "width": int(self.regions_tree.set(item, "Width")),
-                "height": int(self.regions_tree.set(item, "Height"))
-            }
-            regions.append(region)
-        return regions
+        return [dict(region) for region in self._regions]
 
     def get_rooms_data(self):
         """Get rooms data as list of dictionaries"""
-        rooms = []
-        for item in self.rooms_tree.get_children():
-            room = {
-                "name": self.rooms_tree.item(item)['text'],
-                "width": int(self.rooms_tree.set(item, "Width")),
-                "height": int(self.rooms_tree.set(item, "Height")),
-                "max_expansion": int(self.rooms_tree.set(item, "Max Expansion"))
-            }
-            rooms.append(room)
-        return rooms
+        return [dict(room) for room in self._rooms]
 
     def get_adjacencies_data(self):
         """Get adjacencies data as list of dictionaries"""
-        adjacencies = []
-        for i in range(self.adjacencies_listbox.size()):
-            adjacency_text = self.adjacencies_listbox.get(i)
-            room1, room2 = adjacency_text.split(" ↔ ")
-            adjacencies.append({"room1": room1, "room2": room2})
-        return adjacencies
+        return [{"room1": room1, "room2": room2} for room1, room2 in self._adj_pairs]
 
     def get_floor_plan_results(self):
         """Get floor plan generation results"""
@@ -549,13 +570,14 @@ class FloorPlanGUI:
 
         # Calculate statistics
         total_area = sum(region['width'] * region['height'] for region in self.floor_plan.floor_regions)
-        used_area = sum(room.width * room.height for room in self.floor_plan.rooms if room.x is not None)
         score, adjacent_pairs = self.floor_plan.evaluate_adjacency_score()
 
-        # Get room placements
+        # Get room placements, summing the used area in the same pass
+        used_area = 0
         room_placements = []
         for room in self.floor_plan.rooms:
             if room.x is not None:
+                used_area += room.width * room.height
                 placement = {
                     "name": room.name,
                     "x": room.x,
@@ -584,19 +606,13 @@ class FloorPlanGUI:
 
     def get_current_timestamp(self):
         """Get current timestamp as string"""
-        from datetime import datetime
         return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
 
     def show_screen(self, screen_name):
-        """Show the specified screen and hide others"""
-        # Hide all screens
-        for screen in self.screens.values():
-            screen.pack_forget()
-
-        # Show selected screen
-        if screen_name in self.screens:
-            self.screens[screen_name].pack(fill=tk.BOTH, expand=True)
+        """Show the specified screen on top of the others"""
+        if screen_name in self._screen_builders:
+            self._ensure_screen(screen_name).tkraise()
             self.current_screen = screen_name
 
             # Update button states (optional visual feedback)
@@ -623,12 +639,7 @@ class FloorPlanGUI:
             {'x': 10, 'y': 5, 'width': 6, 'height': 6}
         ]
 
-        for i, region in enumerate(example_regions):
-            item = self.regions_tree.insert("", "end", text=f"Region {i + 1}")
-            self.regions_tree.set(item, "X", region['x'])
-            self.regions_tree.set(item, "Y", region['y'])
-            self.regions_tree.set(item, "Width", region['width'])
-            self.regions_tree.set(item, "Height", region['height'])
+        self._regions.extend(dict(region) for region in example_regions)
 
         # Load example rooms
         example_rooms = [
@@ -642,12 +653,9 @@ class FloorPlanGUI:
             ("secretRoom", 3, 3, 3)
         ]
 
-        for room_data in example_rooms:
-            name, width, height, max_exp = room_data
-            item = self.rooms_tree.insert("", "end", text=name)
-            self.rooms_tree.set(item, "Width", width)
-            self.rooms_tree.set(item, "Height", height)
-            self.rooms_tree.set(item, "Max Expansion", max_exp)
+        for name, width, height, max_exp in example_rooms:
+            self._rooms.append({"name": name, "width": width, "height": height, "max_expansion": max_exp})
+            self._room_names.append(name)
 
         # Load example adjacencies
         example_adjacencies = [
@@ -660,21 +668,64 @@ class FloorPlanGUI:
             ("secretRoom", "Kitchen")
         ]
 
-        for room1, room2 in example_adjacencies:
-            self.adjacencies_listbox.insert(tk.END, f"{room1} ↔ {room2}")
+        self._adj_pairs.extend(example_adjacencies)
+        self._adj_set.update(frozenset(pair) for pair in example_adjacencies)
+
+        self.fill_data_widgets()
+
+    def fill_regions_tree(self):
+        """Insert a row into the (empty) regions tree for every region"""
+        # Detach the scrollbar while inserting so it is only updated once at the end
+        self.regions_tree.config(yscrollcommand="")
+        for i, region in enumerate(self._regions):
+            self.regions_tree.insert("", "end", text=f"Region {i + 1}",
+                                     values=(region['x'], region['y'], region['width'], region['height']))
+        self.regions_tree.config(yscrollcommand=self.regions_scrollbar.set)
+        self.regions_tree.yview_moveto(0)
+
+    def fill_rooms_tree(self):
+        """Insert a row into the (empty) rooms tree for every room"""
+        self.rooms_tree.config(yscrollcommand="")
+        for room in self._rooms:
+            self.rooms_tree.insert("", "end", text=room['name'],
+                                   values=(room['width'], room['height'], room['max_expansion']))
+        self.rooms_tree.config(yscrollcommand=self.rooms_scrollbar.set)
+        self.rooms_tree.yview_moveto(0)
+
+    def fill_adjacencies_listbox(self):
+        """Insert a line into the (empty) adjacencies listbox for every adjacency"""
+        # Listbox.insert takes any number of lines, so this is a single Tk call
+        if self._adj_pairs:
+            self.adjacencies_listbox.insert(tk.END, *(f"{room1} ↔ {room2}" for room1, room2 in self._adj_pairs))
+
+    def fill_data_widgets(self):
+        """Fill the widgets of the data screens that have been built so far"""
+        if "regions" in self.screens:
+            self.fill_regions_tree()
+        if "rooms" in self.screens:
+            self.fill_rooms_tree()
+        if "adjacency" in self.screens:
+            self.fill_adjacencies_listbox()
 
     def clear_all_data(self):
         """Clear all data from the GUI"""
         # Clear regions
-        for item in self.regions_tree.get_children():
-            self.regions_tree.delete(item)
+        if "regions" in self.screens:
+            self.regions_tree.delete(*self.regions_tree.get_children())
 
         # Clear rooms
-        for item in self.rooms_tree.get_children():
-            self.rooms_tree.delete(item)
+        if "rooms" in self.screens:
+            self.rooms_tree.delete(*self.rooms_tree.get_children())
 
         # Clear adjacencies
-        self.adjacencies_listbox.delete(0, tk.END)
+        if "adjacency" in self.screens:
+            self.adjacencies_listbox.delete(0, tk.END)
+
+        self._regions.clear()
+        self._rooms.clear()
+        self._room_names.clear()
+        self._adj_pairs.clear()
+        self._adj_set.clear()
 
     def add_region(self):
         """Add a new region"""
@@ -690,11 +741,8 @@ class FloorPlanGUI:
 
             # Add to tree
             region_count = len(self.regions_tree.get_children()) + 1
-            item = self.regions_tree.insert("", "end", text=f"Region {region_count}")
-            self.regions_tree.set(item, "X", x)
-            self.regions_tree.set(item, "Y", y)
-            self.regions_tree.set(item, "Width", width)
-            self.regions_tree.set(item, "Height", height)
+            self.regions_tree.insert("", "end", text=f"Region {region_count}", values=(x, y, width, height))
+            self._regions.append({'x': x, 'y': y, 'width': width, 'height': height})
 
             # Clear input fields
             self.region_x_var.set("")
@@ -709,6 +757,7 @@ class FloorPlanGUI:
         """Remove selected region"""
         selected = self.regions_tree.selection()
         if selected:
+            del self._regions[self.regions_tree.index(selected[0])]
             self.regions_tree.delete(selected[0])
 
     def edit_region(self):
@@ -720,19 +769,16 @@ class FloorPlanGUI:
 
         # Get current values from the selected region
         item = selected[0]
-        current_x = self.regions_tree.set(item, "X")
-        current_y = self.regions_tree.set(item, "Y")
-        current_width = self.regions_tree.set(item, "Width")
-        current_height = self.regions_tree.set(item, "Height")
+        region = self._regions.pop(self.regions_tree.index(item))
 
         # Populate input fields with current values
-        self.region_x_var.set(current_x)
-        self.region_y_var.set(current_y)
-        self.region_width_var.set(current_width)
-        self.region_height_var.set(current_height)
+        self.region_x_var.set(region['x'])
+        self.region_y_var.set(region['y'])
+        self.region_width_var.set(region['width'])
+        self.region_height_var.set(region['height'])
 
         # Remove the selected region (it will be re-added with new values when user clicks Add)
-        region_name = self.regions_tree.item(item)['text']
+        region_name = self.regions_tree.item(item, 'text')
         self.regions_tree.delete(item)
 
         # Show message to user
@@ -741,8 +787,8 @@ class FloorPlanGUI:
 
     def clear_regions(self):
         """Clear all regions"""
-        for item in self.regions_tree.get_children():
-            self.regions_tree.delete(item)
+        self.regions_tree.delete(*self.regions_tree.get_children())
+        self._regions.clear()
 
     def add_room(self):
         """Add a new room"""
@@ -765,16 +811,14 @@ class FloorPlanGUI:
                 return
 
             # Check if room name already exists
-            for item in self.rooms_tree.get_children():
-                if self.rooms_tree.item(item)['text'] == name:
-                    messagebox.showerror("Error", "Room name already exists")
-                    return
+            if name in self._room_names:
+                messagebox.showerror("Error", "Room name already exists")
+                return
 
             # Add to tree
-            item = self.rooms_tree.insert("", "end", text=name)
-            self.rooms_tree.set(item, "Width", width)
-            self.rooms_tree.set(item, "Height", height)
-            self.rooms_tree.set(item, "Max Expansion", max_exp)
+            self.rooms_tree.insert("", "end", text=name, values=(width, height, max_exp))
+            self._rooms.append({"name": name, "width": width, "height": height, "max_expansion": max_exp})
+            self._room_names.append(name)
 
             # Clear input fields
             self.room_name_var.set("")
@@ -789,31 +833,34 @@ class FloorPlanGUI:
         """Remove selected room"""
         selected = self.rooms_tree.selection()
         if selected:
-            room_name = self.rooms_tree.item(selected[0])['text']
+            index = self.rooms_tree.index(selected[0])
+            room_name = self._room_names.pop(index)
+            del self._rooms[index]
             self.rooms_tree.delete(selected[0])
 
             # Remove any adjacencies involving this room
-            items_to_remove = []
-            for i in range(self.adjacencies_listbox.size()):
-                adjacency = self.adjacencies_listbox.get(i)
-                if room_name in adjacency:
-                    items_to_remove.append(i)
+            items_to_remove = [i for i, pair in enumerate(self._adj_pairs) if room_name in pair]
 
             # Remove from bottom to top to maintain indices
             for i in reversed(items_to_remove):
-                self.adjacencies_listbox.delete(i)
+                if "adjacency" in self.screens:
+                    self.adjacencies_listbox.delete(i)
+                self._adj_set.discard(frozenset(self._adj_pairs.pop(i)))
 
     def clear_rooms(self):
         """Clear all rooms"""
-        for item in self.rooms_tree.get_children():
-            self.rooms_tree.delete(item)
-        self.adjacencies_listbox.delete(0, tk.END)  # Clear adjacencies too
+        self.rooms_tree.delete(*self.rooms_tree.get_children())
+        if "adjacency" in self.screens:
+            self.adjacencies_listbox.delete(0, tk.END)  # Clear adjacencies too
+        self._rooms.clear()
+        self._room_names.clear()
+        self._adj_pairs.clear()
+        self._adj_set.clear()
 
     def refresh_room_combos(self):
         """Refresh the room combo boxes with current room names"""
-        room_names = [self.rooms_tree.item(item)['text'] for item in self.rooms_tree.get_children()]
-        self.room1_combo['values'] = room_names
-        self.room2_combo['values'] = room_names
+        self.room1_combo['values'] = self._room_names
+        self.room2_combo['values'] = self._room_names
 
     def add_adjacency(self):
         """Add a new adjacency"""
@@ -829,17 +876,15 @@ class FloorPlanGUI:
             return
 
         # Check if adjacency already exists (in either direction)
-        adjacency1 = f"{room1} ↔ {room2}"
-        adjacency2 = f"{room2} ↔ {room1}"
-
-        for i in range(self.adjacencies_listbox.size()):
-            existing = self.adjacencies_listbox.get(i)
-            if existing == adjacency1 or existing == adjacency2:
-                messagebox.showerror("Error", "This adjacency already exists")
-                return
+        key = frozenset((room1, room2))
+        if key in self._adj_set:
+            messagebox.showerror("Error", "This adjacency already exists")
+            return
 
         # Add adjacency
-        self.adjacencies_listbox.insert(tk.END, adjacency1)
+        self.adjacencies_listbox.insert(tk.END, f"{room1} ↔ {room2}")
+        self._adj_pairs.append((room1, room2))
+        self._adj_set.add(key)
 
         # Clear selections
         self.room1_combo.set("")
@@ -850,72 +895,103 @@ class FloorPlanGUI:
         selection = self.adjacencies_listbox.curselection()
         if selection:
             self.adjacencies_listbox.delete(selection[0])
+            self._adj_set.discard(frozenset(self._adj_pairs.pop(selection[0])))
 
     def clear_adjacencies(self):
         """Clear all adjacencies"""
         self.adjacencies_listbox.delete(0, tk.END)
+        self._adj_pairs.clear()
+        self._adj_set.clear()
 
     def generate_floor_plan(self):
-        """Generate the floor plan based on current data"""
+        """Start generating the floor plan from the current data on a worker thread"""
+        if self._worker is not None:
+            return  # A generation is already running
+
         try:
             # Collect regions
-            regions = []
-            for item in self.regions_tree.get_children():
-                x = int(self.regions_tree.set(item, "X"))
-                y = int(self.regions_tree.set(item, "Y"))
-                width = int(self.regions_tree.set(item, "Width"))
-                height = int(self.regions_tree.set(item, "Height"))
-                regions.append({'x': x, 'y': y, 'width': width, 'height': height})
+            regions = self.get_regions_data()
 
             if not regions:
                 messagebox.showerror("Error", "Please define at least one region")
                 return
 
-            # Create floor plan
-            self.floor_plan = FloorPlan(regions)
+            if not self._rooms:
+                messagebox.showerror("Error", "Please define at least one room")
+                return
 
-            # Add rooms
-            room_names = []
-            for item in self.rooms_tree.get_children():
-                name = self.rooms_tree.item(item)['text']
-                width = int(self.rooms_tree.set(item, "Width"))
-                height = int(self.rooms_tree.set(item, "Height"))
-                max_exp = int(self.rooms_tree.set(item, "Max Expansion"))
+            max_attempts = int(self.max_attempts_var.get())
+            enable_expansion = self.enable_expansion_var.get()
 
-                self.floor_plan.add_room(name, width, height, max_exp)
-                room_names.append(name)
+            # Import the solver (and numpy/networkx with it) here on the Tk thread, on first use
+            from bfs import FloorPlan
 
-            if not room_names:
-                messagebox.showerror("Error", "Please define at least one room")
-                return
+        except ValueError as e:
+            messagebox.showerror("Error", f"Invalid input: {str(e)}")
+            return
+        except Exception as e:
+            messagebox.showerror("Error", f"An error occurred: {str(e)}")
+            return
+
+        # The worker gets its own copies, so edits made while it runs do not affect it
+        self._worker = threading.Thread(
+            target=self._compute_floor_plan,
+            args=(FloorPlan, regions, self.get_rooms_data(), list(self._adj_pairs), max_attempts, enable_expansion),
+            daemon=True
+        )
+        self.generate_button.state(['disabled'])
+        self._worker.start()
+        self.root.after(50, self._poll_result)
+
+    def _compute_floor_plan(self, floor_plan_cls, regions, rooms, adjacencies, max_attempts, enable_expansion):
+        """Build and solve a floor plan (worker thread) and queue the outcome for the Tk thread"""
+        try:
+            floor_plan = floor_plan_cls(regions)
+
+            # Add rooms
+            for room in rooms:
+                floor_plan.add_room(**room)
 
             # Add adjacencies
-            for i in range(self.adjacencies_listbox.size()):
-                adjacency = self.adjacencies_listbox.get(i)
-                room1, room2 = adjacency.split(" ↔ ")
-                self.floor_plan.add_adjacency(room1, room2)
+            for room1, room2 in adjacencies:
+                floor_plan.add_adjacency(room1, room2)
 
             # Generate floor plan
-            max_attempts = int(self.max_attempts_var.get())
-            enable_expansion = self.enable_expansion_var.get()
-
-            success = self.floor_plan.place_rooms_with_constraints_optimized(
+            success = floor_plan.place_rooms_with_constraints_optimized(
                 max_attempts=max_attempts,
                 enable_expansion=enable_expansion
             )
+            self._result_q.put((floor_plan, success, None))
+
+        except Exception as e:
+            self._result_q.put((None, False, e))
+
+    def _poll_result(self):
+        """Check for the worker's result; Tk widgets and Matplotlib are only touched from here"""
+        try:
+            floor_plan, success, error = self._result_q.get_nowait()
+        except queue.Empty:
+            self.root.after(50, self._poll_result)
+            return
+
+        self._worker = None
+        self.generate_button.state(['!disabled'])
 
-            if success:
-                messagebox.showinfo("Success", "Floor plan generated successfully!")
-                self.update_output_display()
+        if error is not None:
+            if isinstance(error, ValueError):
+                messagebox.showerror("Error", f"Invalid input: {str(error)}")
             else:
-                messagebox.showwarning("Warning",
-                                       "Failed to place all rooms optimally. You may need to adjust room sizes or floor dimensions.")
-                self.update_output_display()
+                messagebox.showerror("Error", f"An error occurred: {str(error)}")
+            return
 
-        except ValueError as e:
-            messagebox.showerror("Error", f"Invalid input: {str(e)}")
-        except Exception as e:
-            messagebox.showerror("Error", f"An error occurred: {str(e)}")
+        self.floor_plan = floor_plan
+        if success:
+            messagebox.showinfo("Success", "Floor plan generated successfully!")
+            self.update_output_display()
+        else:
+            messagebox.showwarning("Warning",
+                                   "Failed to place all rooms optimally. You may need to adjust room sizes or floor dimensions.")
+            self.update_output_display()
 
     def update_output_display(self):
         """Update the output display with statistics and visualization"""
@@ -923,6 +999,7 @@ class FloorPlanGUI:
             return
 
         # Update statistics
+        self._ensure_screen("output")
         self.stats_text.delete('1.0', tk.END)
 
         # Calculate and display statistics
@@ -961,10 +1038,9 @@ class FloorPlanGUI:
 
         self.stats_text.insert('1.0', stats)
 
-        # Update visualization
-        self.ax.clear()
+        # Update visualization; the canvas repaints once Tk is idle
         self.visualize_floor_plan()
-        self.canvas.draw()
+        self.canvas.draw_idle()
 
         # Switch to output screen
         self.show_screen("output")
@@ -974,34 +1050,59 @@ class FloorPlanGUI:
         if not self.floor_plan:
             return
 
-        # Draw floor shape
-        for region in self.floor_plan.floor_regions:
-            rect = plt.Rectangle(
-                (region['x'], region['y']),
-                region['width'],
-                region['height'],
-                linewidth=2,
-                edgecolor='black',
-                facecolor='none',
-                linestyle='--'
-            )
-            self.ax.add_patch(rect)
-
-        # Draw rooms
-        colors = plt.cm.tab20(np.linspace(0, 1, len(self.floor_plan.rooms)))
-        for i, room in enumerate(self.floor_plan.rooms):
-            if room.x is not None and room.y is not None:
+        import matplotlib.pyplot as plt
+        from matplotlib.collections import PatchCollection
+        import numpy as np
+
+        # Draw floor shape; the outlines, limits and labels only change with the regions, and a new
+        # floor starts from an empty axes so the outlines stay underneath the rooms
+        regions_key = tuple((region['x'], region['y'], region['width'], region['height'])
+                            for region in self.floor_plan.floor_regions)
+        if regions_key != self._drawn_regions:
+            self.ax.clear()
+            self._room_labels = {}
+            self._adjacency_lines = []
+            self._drawn_regions = regions_key
+            self._layout_key = None
+
+            for region in self.floor_plan.floor_regions:
                 rect = plt.Rectangle(
-                    (room.x, room.y),
-                    room.width,
-                    room.height,
-                    linewidth=1,
+                    (region['x'], region['y']),
+                    region['width'],
+                    region['height'],
+                    linewidth=2,
                     edgecolor='black',
-                    facecolor=colors[i],
-                    alpha=0.7
+                    facecolor='none',
+                    linestyle='--'
                 )
                 self.ax.add_patch(rect)
 
+            # All room rectangles are drawn by one collection whose paths are replaced on each redraw
+            self._room_collection = PatchCollection([], linewidth=1, edgecolor='black', alpha=0.7)
+            self.ax.add_collection(self._room_collection, autolim=False)
+
+            # Set limits and labels
+            max_width = self.floor_plan.floor_width
+            max_height = self.floor_plan.floor_height
+            self.ax.set_xlim(-1, max_width + 1)
+            self.ax.set_ylim(-1, max_height + 1)
+            self.ax.set_aspect('equal')
+            self.ax.set_title('Floor Plan Layout')
+            self.ax.set_xlabel('Width')
+            self.ax.set_ylabel('Height')
+            self.ax.grid(True, alpha=0.3)
+
+        # Draw rooms, colored by room index from a palette that is only rebuilt when the room count changes
+        if self._palette is None or len(self._palette) != len(self.floor_plan.rooms):
+            self._palette = plt.cm.tab20(np.linspace(0, 1, len(self.floor_plan.rooms)))
+        rects = []
+        color_ids = []
+        room_labels = {}
+        for i, room in enumerate(self.floor_plan.rooms):
+            if room.x is not None and room.y is not None:
+                rects.append(plt.Rectangle((room.x, room.y), room.width, room.height))
+                color_ids.append(i)
+
                 # Add room name, size, and expansion info
                 original_size = f"{room.original_width}x{room.original_height}"
                 current_size = f"{room.width}x{room.height}"
@@ -1014,20 +1115,41 @@ class FloorPlanGUI:
                     else:
                         display_text += f"\n(from {original_size})"
 
-                self.ax.text(
-                    room.x + room.width / 2,
-                    room.y + room.height / 2,
-                    display_text,
-                    ha='center',
-                    va='center',
-                    fontsize=8,
-                    bbox=dict(boxstyle="round,pad=0.3", facecolor="white", alpha=0.8)
-                )
+                # Move the label of a room that is already on the axes
+                center = (room.x + room.width / 2, room.y + room.height / 2)
+                label = self._room_labels.pop(room.name, None)
+                if label is None:
+                    label = self.ax.text(
+                        center[0],
+                        center[1],
+                        display_text,
+                        ha='center',
+                        va='center',
+                        fontsize=8,
+                        bbox=dict(boxstyle="round,pad=0.3", facecolor="white", alpha=0.8)
+                    )
+                else:
+                    label.set_position(center)
+                    label.set_text(display_text)
+                room_labels[room.name] = label
+
+        self._room_collection.set_paths(rects)
+        self._room_collection.set_facecolor(self._palette[color_ids])
+
+        # Remove labels of rooms that are no longer placed
+        for label in self._room_labels.values():
+            label.remove()
+        self._room_labels = room_labels
 
         # Add adjacency relationships as lines between room centers
+        for line in self._adjacency_lines:
+            line.remove()
+        self._adjacency_lines = []
+
+        rooms_by_name = {room.name: room for room in self.floor_plan.rooms}
         for room1_name, room2_name in self.floor_plan.adjacency_graph.edges:
-            room1 = next(r for r in self.floor_plan.rooms if r.name == room1_name)
-            room2 = next(r for r in self.floor_plan.rooms if r.name == room2_name)
+            room1 = rooms_by_name[room1_name]
+            room2 = rooms_by_name[room2_name]
 
             if room1.x is not None and room2.x is not None:
                 center1 = (room1.x + room1.width / 2, room1.y + room1.height / 2)
@@ -1035,22 +1157,12 @@ class FloorPlanGUI:
 
                 # Check if rooms share a wall
                 if room1.has_shared_wall_with(room2):
-                    self.ax.plot([center1[0], center2[0]], [center1[1], center2[1]],
-                                 'g-', linewidth=2, alpha=0.8, label='Adjacent (satisfied)')
+                    lines = self.ax.plot([center1[0], center2[0]], [center1[1], center2[1]],
+                                         'g-', linewidth=2, alpha=0.8, label='Adjacent (satisfied)')
                 else:
-                    self.ax.plot([center1[0], center2[0]], [center1[1], center2[1]],
-                                 'r:', linewidth=1.5, alpha=0.8, label='Adjacent (unsatisfied)')
-
-        # Set limits and labels
-        max_width = self.floor_plan.floor_width
-        max_height = self.floor_plan.floor_height
-        self.ax.set_xlim(-1, max_width + 1)
-        self.ax.set_ylim(-1, max_height + 1)
-        self.ax.set_aspect('equal')
-        self.ax.set_title('Floor Plan Layout')
-        self.ax.set_xlabel('Width')
-        self.ax.set_ylabel('Height')
-        self.ax.grid(True, alpha=0.3)
+                    lines = self.ax.plot([center1[0], center2[0]], [center1[1], center2[1]],
+                                         'r:', linewidth=1.5, alpha=0.8, label='Adjacent (unsatisfied)')
+                self._adjacency_lines.extend(lines)
 
         # Add legend for adjacency lines (avoid duplicates)
         handles, labels = self.ax.get_legend_handles_labels()
@@ -1058,8 +1170,14 @@ class FloorPlanGUI:
         if by_label:
             self.ax.legend(by_label.values(), by_label.keys(), loc='upper left',
                            bbox_to_anchor=(1.02, 1), borderaxespad=0)
-
-        plt.tight_layout()
+        elif self.ax.get_legend() is not None:
+            self.ax.get_legend().remove()
+
+        # tight_layout is the slowest step here, so only redo it when the floor or legend changed
+        layout_key = (regions_key, tuple(by_label))
+        if layout_key != self._layout_key:
+            self.fig.tight_layout()
+            self._layout_key = layout_key
 
 
 def main():
@@ -2,6 +2,7 @@ import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.collections import LineCollection, PatchCollection
 import numpy as np
 from negative import FloorPlan  # Import from your original file
 import json
@@ -17,6 +18,14 @@ class FloorPlanGUI:
         self.floor_plan = None
         self.current_screen = "regions"
 
+        # Parsed row values keyed by tree item, so the data is never read back out of the widgets
+        self._regions_data = {}
+        self._rooms_data = {}
+        self._room_names = set()  # for the duplicate-name check in add_room
+        self._adjacency_pairs = []  # (room1, room2) per listbox line, in listbox order
+        self._adjacencies = set()  # frozenset({room1, room2}) per line, for the duplicate check
+        self._last_room_names = None  # names last pushed into the adjacency combos
+
         # Create main container
         self.main_frame = ttk.Frame(root)
         self.main_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
@@ -323,10 +332,20 @@ class FloorPlanGUI:
         viz_frame.pack(fill=tk.BOTH, expand=True)
 
         # Matplotlib figure
-        self.fig, self.ax = plt.subplots(figsize=(8, 6))
+        # The figure lays itself out on each draw, so redraws never run a separate tight_layout pass
+        self.fig, self.ax = plt.subplots(figsize=(8, 6), layout='constrained')
         self.canvas = FigureCanvasTkAgg(self.fig, viz_frame)
         self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
 
+        self._color_cache = {}  # room count -> tab20 RGBA rows
+
+        # Persistent artists, so a redraw of the same floor only updates them
+        self._drawn_regions = None  # region tuples the axes were last built for
+        self._room_collection = None
+        self._satisfied_lines = None
+        self._unsatisfied_lines = None
+        self._room_labels = {}  # room name -> Text
+
     def save_floor_plan_json(self):
         """Save the current floor plan configuration and results to JSON"""
         try:
@@ -391,24 +410,29 @@ class FloorPlanGUI:
             # Load regions
             if "regions" in data:
                 for i, region in enumerate(data["regions"]):
-                    item = self.regions_tree.insert("", "end", text=f"Region {i + 1}")
-                    self.regions_tree.set(item, "X", region['x'])
-                    self.regions_tree.set(item, "Y", region['y'])
-                    self.regions_tree.set(item, "Width", region['width'])
-                    self.regions_tree.set(item, "Height", region['height'])
+                    item = self.regions_tree.insert("", "end", text=f"Region {i + 1}",
+                                                    values=(region['x'], region['y'], region['width'], region['height']))
+                    self._regions_data[item] = {key: int(region[key]) for key in ('x', 'y', 'width', 'height')}
 
             # Load rooms
             if "rooms" in data:
                 for room in data["rooms"]:
-                    item = self.rooms_tree.insert("", "end", text=room['name'])
-                    self.rooms_tree.set(item, "Width", room['width'])
-                    self.rooms_tree.set(item, "Height", room['height'])
-                    self.rooms_tree.set(item, "Max Expansion", room['max_expansion'])
+                    item = self.rooms_tree.insert("", "end", text=room['name'],
+                                                  values=(room['width'], room['height'], room['max_expansion']))
+                    self._rooms_data[item] = {
+                        "name": room['name'],
+                        "width": int(room['width']),
+                        "height": int(room['height']),
+                        "max_expansion": int(room['max_expansion'])
+                    }
+                    self._room_names.add(room['name'])
 
             # Load adjacencies
             if "adjacencies" in data:
                 for adj in data["adjacencies"]:
                     self.adjacencies_listbox.insert(tk.END, f"{adj['room1']} ↔ {adj['room2']}")
+                    self._adjacency_pairs.append((adj['room1'], adj['room2']))
+                    self._adjacencies.add(frozenset((adj['room1'], adj['room2'])))
 
             # Load generation settings
             if "generation_settings" in data:
@@ -463,27 +487,19 @@ class FloorPlanGUI:
             self.floor_plan = FloorPlan(regions)
 
             # Add rooms with original specifications
-            room_names = []
-            for item in self.rooms_tree.get_children():
-                name = self.rooms_tree.item(item)['text']
-                width = int(self.rooms_tree.set(item, "Width"))
-                height = int(self.rooms_tree.set(item, "Height"))
-                max_exp = int(self.rooms_tree.set(item, "Max Expansion"))
-
-                self.floor_plan.add_room(name, width, height, max_exp)
-                room_names.append(name)
+            for room in self._rooms_data.values():
+                self.floor_plan.add_room(room['name'], room['width'], room['height'], room['max_expansion'])
 
             # Add adjacencies
-            for i in range(self.adjacencies_listbox.size()):
-                adjacency = self.adjacencies_listbox.get(i)
-                room1, room2 = adjacency.split(" ↔ ")
+            for room1, room2 in self._adjacency_pairs:
                 self.floor_plan.add_adjacency(room1, room2)
 
             # Restore room placements from saved results
             if "room_placements" in results_data:
+                rooms_by_name = {room.name: room for room in self.floor_plan.rooms}
                 for placement in results_data["room_placements"]:
                     # Find the room object
-                    room = next((r for r in self.floor_plan.rooms if r.name == placement["name"]), None)
+                    room = rooms_by_name.get(placement["name"])
                     if room:
                         # Restore the placement
                         room.x = placement["x"]
@@ -509,38 +525,15 @@ class FloorPlanGUI:
 
     def get_regions_data(self):
         """Get regions data as list of dictionaries"""
-        regions = []
-        for item in self.regions_tree.get_children():
-            region = {
-                "x": int(self.regions_tree.set(item, "X")),
-                "y": int(self.regions_tree.set(item, "Y")),
-                "width": int(self.regions_tree.set(item, "Width")),
-                "height": int(self.regions_tree.set(item, "Height"))
-            }
-            regions.append(region)
-        return regions
+        return [dict(region) for region in self._regions_data.values()]
 
     def get_rooms_data(self):
         """Get rooms data as list of dictionaries"""
-        rooms = []
-        for item in self.rooms_tree.get_children():
-            room = {
-                "name": self.rooms_tree.item(item)['text'],
-                "width": int(self.rooms_tree.set(item, "Width")),
-                "height": int(self.rooms_tree.set(item, "Height")),
-                "max_expansion": int(self.rooms_tree.set(item, "Max Expansion"))
-            }
-            rooms.append(room)
-        return rooms
+        return [dict(room) for room in self._rooms_data.values()]
 
     def get_adjacencies_data(self):
         """Get adjacencies data as list of dictionaries"""
-        adjacencies = []
-        for i in range(self.adjacencies_listbox.size()):
-            adjacency_text = self.adjacencies_listbox.get(i)
-            room1, room2 = adjacency_text.split(" ↔ ")
-            adjacencies.append({"room1": room1, "room2": room2})
-        return adjacencies
+        return [{"room1": room1, "room2": room2} for room1, room2 in self._adjacency_pairs]
 
     def get_floor_plan_results(self):
         """Get floor plan generation results"""
@@ -624,11 +617,9 @@ class FloorPlanGUI:
         ]
 
         for i, region in enumerate(example_regions):
-            item = self.regions_tree.insert("", "end", text=f"Region {i + 1}")
-            self.regions_tree.set(item, "X", region['x'])
-            self.regions_tree.set(item, "Y", region['y'])
-            self.regions_tree.set(item, "Width", region['width'])
-            self.regions_tree.set(item, "Height", region['height'])
+            item = self.regions_tree.insert("", "end", text=f"Region {i + 1}",
+                                            values=(region['x'], region['y'], region['width'], region['height']))
+            self._regions_data[item] = dict(region)
 
         # Load example rooms
         example_rooms = [
@@ -644,10 +635,9 @@ class FloorPlanGUI:
 
         for room_data in example_rooms:
             name, width, height, max_exp = room_data
-            item = self.rooms_tree.insert("", "end", text=name)
-            self.rooms_tree.set(item, "Width", width)
-            self.rooms_tree.set(item, "Height", height)
-            self.rooms_tree.set(item, "Max Expansion", max_exp)
+            item = self.rooms_tree.insert("", "end", text=name, values=(width, height, max_exp))
+            self._rooms_data[item] = {"name": name, "width": width, "height": height, "max_expansion": max_exp}
+            self._room_names.add(name)
 
         # Load example adjacencies
         example_adjacencies = [
@@ -662,20 +652,26 @@ class FloorPlanGUI:
 
         for room1, room2 in example_adjacencies:
             self.adjacencies_listbox.insert(tk.END, f"{room1} ↔ {room2}")
+            self._adjacency_pairs.append((room1, room2))
+            self._adjacencies.add(frozenset((room1, room2)))
 
     def clear_all_data(self):
         """Clear all data from the GUI"""
         # Clear regions
-        for item in self.regions_tree.get_children():
-            self.regions_tree.delete(item)
+        self.regions_tree.delete(*self.regions_tree.get_children())
 
         # Clear rooms
-        for item in self.rooms_tree.get_children():
-            self.rooms_tree.delete(item)
+        self.rooms_tree.delete(*self.rooms_tree.get_children())
 
         # Clear adjacencies
         self.adjacencies_listbox.delete(0, tk.END)
 
+        self._regions_data.clear()
+        self._rooms_data.clear()
+        self._room_names.clear()
+        self._adjacency_pairs.clear()
+        self._adjacencies.clear()
+
     def add_region(self):
         """Add a new region"""
         try:
@@ -690,11 +686,8 @@ class FloorPlanGUI:
 
             # Add to tree
             region_count = len(self.regions_tree.get_children()) + 1
-            item = self.regions_tree.insert("", "end", text=f"Region {region_count}")
-            self.regions_tree.set(item, "X", x)
-            self.regions_tree.set(item, "Y", y)
-            self.regions_tree.set(item, "Width", width)
-            self.regions_tree.set(item, "Height", height)
+            item = self.regions_tree.insert("", "end", text=f"Region {region_count}", values=(x, y, width, height))
+            self._regions_data[item] = {'x': x, 'y': y, 'width': width, 'height': height}
 
             # Clear input fields
             self.region_x_var.set("")
@@ -710,6 +703,7 @@ class FloorPlanGUI:
         selected = self.regions_tree.selection()
         if selected:
             self.regions_tree.delete(selected[0])
+            self._regions_data.pop(selected[0], None)
 
     def edit_region(self):
         """Edit the selected region"""
@@ -734,6 +728,7 @@ class FloorPlanGUI:
         # Remove the selected region (it will be re-added with new values when user clicks Add)
         region_name = self.regions_tree.item(item)['text']
         self.regions_tree.delete(item)
+        self._regions_data.pop(item, None)
 
         # Show message to user
         messagebox.showinfo("Edit Mode",
@@ -741,8 +736,8 @@ class FloorPlanGUI:
 
     def clear_regions(self):
         """Clear all regions"""
-        for item in self.regions_tree.get_children():
-            self.regions_tree.delete(item)
+        self.regions_tree.delete(*self.regions_tree.get_children())
+        self._regions_data.clear()
 
     def add_room(self):
         """Add a new room"""
@@ -765,16 +760,14 @@ class FloorPlanGUI:
                 return
 
             # Check if room name already exists
-            for item in self.rooms_tree.get_children():
-                if self.rooms_tree.item(item)['text'] == name:
-                    messagebox.showerror("Error", "Room name already exists")
-                    return
+            if name in self._room_names:
+                messagebox.showerror("Error", "Room name already exists")
+                return
 
             # Add to tree
-            item = self.rooms_tree.insert("", "end", text=name)
-            self.rooms_tree.set(item, "Width", width)
-            self.rooms_tree.set(item, "Height", height)
-            self.rooms_tree.set(item, "Max Expansion", max_exp)
+            item = self.rooms_tree.insert("", "end", text=name, values=(width, height, max_exp))
+            self._rooms_data[item] = {"name": name, "width": width, "height": height, "max_expansion": max_exp}
+            self._room_names.add(name)
 
             # Clear input fields
             self.room_name_var.set("")
@@ -789,31 +782,35 @@ class FloorPlanGUI:
         """Remove selected room"""
         selected = self.rooms_tree.selection()
         if selected:
-            room_name = self.rooms_tree.item(selected[0])['text']
+            room_name = self._rooms_data.pop(selected[0])['name']
             self.rooms_tree.delete(selected[0])
+            self._room_names.discard(room_name)
 
-            # Remove any adjacencies involving this room
-            items_to_remove = []
-            for i in range(self.adjacencies_listbox.size()):
-                adjacency = self.adjacencies_listbox.get(i)
-                if room_name in adjacency:
-                    items_to_remove.append(i)
+            # Remove any adjacencies involving this room (exact name match, so "Kitchen" leaves "Kitchenette" alone)
+            items_to_remove = [i for i, pair in enumerate(self._adjacency_pairs) if room_name in pair]
 
             # Remove from bottom to top to maintain indices
             for i in reversed(items_to_remove):
                 self.adjacencies_listbox.delete(i)
+                self._adjacencies.discard(frozenset(self._adjacency_pairs.pop(i)))
 
     def clear_rooms(self):
         """Clear all rooms"""
-        for item in self.rooms_tree.get_children():
-            self.rooms_tree.delete(item)
+        self.rooms_tree.delete(*self.rooms_tree.get_children())
         self.adjacencies_listbox.delete(0, tk.END)  # Clear adjacencies too
+        self._rooms_data.clear()
+        self._room_names.clear()
+        self._adjacency_pairs.clear()
+        self._adjacencies.clear()
 
     def refresh_room_combos(self):
         """Refresh the room combo boxes with current room names"""
-        room_names = [self.rooms_tree.item(item)['text'] for item in self.rooms_tree.get_children()]
+        room_names = tuple(room['name'] for room in self._rooms_data.values())
+        if room_names == self._last_room_names:
+            return  # combos already list these rooms, skip the Tk reconfigure
         self.room1_combo['values'] = room_names
         self.room2_combo['values'] = room_names
+        self._last_room_names = room_names
 
     def add_adjacency(self):
         """Add a new adjacency"""
@@ -829,17 +826,15 @@ class FloorPlanGUI:
             return
 
         # Check if adjacency already exists (in either direction)
-        adjacency1 = f"{room1} ↔ {room2}"
-        adjacency2 = f"{room2} ↔ {room1}"
-
-        for i in range(self.adjacencies_listbox.size()):
-            existing = self.adjacencies_listbox.get(i)
-            if existing == adjacency1 or existing == adjacency2:
-                messagebox.showerror("Error", "This adjacency already exists")
-                return
+        key = frozenset((room1, room2))
+        if key in self._adjacencies:
+            messagebox.showerror("Error", "This adjacency already exists")
+            return
 
         # Add adjacency
-        self.adjacencies_listbox.insert(tk.END, adjacency1)
+        self.adjacencies_listbox.insert(tk.END, f"{room1} ↔ {room2}")
+        self._adjacency_pairs.append((room1, room2))
+        self._adjacencies.add(key)
 
         # Clear selections
         self.room1_combo.set("")
@@ -850,22 +845,19 @@ class FloorPlanGUI:
         selection = self.adjacencies_listbox.curselection()
         if selection:
             self.adjacencies_listbox.delete(selection[0])
+            self._adjacencies.discard(frozenset(self._adjacency_pairs.pop(selection[0])))
 
     def clear_adjacencies(self):
         """Clear all adjacencies"""
         self.adjacencies_listbox.delete(0, tk.END)
+        self._adjacency_pairs.clear()
+        self._adjacencies.clear()
 
     def generate_floor_plan(self):
         """Generate the floor plan based on current data"""
         try:
             # Collect regions
-            regions = []
-            for item in self.regions_tree.get_children():
-                x = int(self.regions_tree.set(item, "X"))
-                y = int(self.regions_tree.set(item, "Y"))
-                width = int(self.regions_tree.set(item, "Width"))
-                height = int(self.regions_tree.set(item, "Height"))
-                regions.append({'x': x, 'y': y, 'width': width, 'height': height})
+            regions = self.get_regions_data()
 
             if not regions:
                 messagebox.showerror("Error", "Please define at least one region")
@@ -875,24 +867,15 @@ class FloorPlanGUI:
             self.floor_plan = FloorPlan(regions)
 
             # Add rooms
-            room_names = []
-            for item in self.rooms_tree.get_children():
-                name = self.rooms_tree.item(item)['text']
-                width = int(self.rooms_tree.set(item, "Width"))
-                height = int(self.rooms_tree.set(item, "Height"))
-                max_exp = int(self.rooms_tree.set(item, "Max Expansion"))
+            for room in self._rooms_data.values():
+                self.floor_plan.add_room(room['name'], room['width'], room['height'], room['max_expansion'])
 
-                self.floor_plan.add_room(name, width, height, max_exp)
-                room_names.append(name)
-
-            if not room_names:
+            if not self._rooms_data:
                 messagebox.showerror("Error", "Please define at least one room")
                 return
 
             # Add adjacencies
-            for i in range(self.adjacencies_listbox.size()):
-                adjacency = self.adjacencies_listbox.get(i)
-                room1, room2 = adjacency.split(" ↔ ")
+            for room1, room2 in self._adjacency_pairs:
                 self.floor_plan.add_adjacency(room1, room2)
 
             # Generate floor plan
@@ -922,27 +905,18 @@ class FloorPlanGUI:
         if not self.floor_plan:
             return
 
-        # Update statistics
-        self.stats_text.delete('1.0', tk.END)
-
         # Calculate and display statistics
         total_area = sum(region['width'] * region['height'] for region in self.floor_plan.floor_regions)
-        used_area = sum(room.width * room.height for room in self.floor_plan.rooms if room.x is not None)
-
-        stats = f"FLOOR PLAN STATISTICS\n{'=' * 30}\n\n"
-        stats += f"Floor area: {total_area} square units\n"
-        stats += f"Room area: {used_area} square units\n"
-        stats += f"Space utilization: {used_area / total_area:.2%}\n\n"
 
-        score, adjacent_pairs = self.floor_plan.evaluate_adjacency_score()
-        stats += f"Adjacency score: {score}/{len(self.floor_plan.adjacency_graph.edges)}\n"
-        stats += f"Adjacent pairs: {adjacent_pairs}\n\n"
-
-        stats += "ROOM EXPANSION STATISTICS:\n" + "-" * 30 + "\n"
+        # Sum the used area in the same pass that builds the expansion lines; all text is collected
+        # as parts and joined once at the end
+        used_area = 0
+        expansion_parts = []
         for room in self.floor_plan.rooms:
             if room.x is not None:
                 original_area = room.original_width * room.original_height
                 current_area = room.width * room.height
+                used_area += current_area
                 expansion_pct = (current_area - original_area) / original_area * 100 if original_area > 0 else 0
 
                 if not room.rotated:
@@ -952,19 +926,33 @@ class FloorPlanGUI:
 
                 expansion_usage = f"{total_expansion}/{room.max_expansion}"
 
-                stats += f"{room.name}: {room.original_width}x{room.original_height} → {room.width}x{room.height} "
-                stats += f"({expansion_pct:.1f}% increase, expansion used: {expansion_usage})\n"
+                expansion_parts.append(f"{room.name}: {room.original_width}x{room.original_height} → {room.width}x{room.height} ")
+                expansion_parts.append(f"({expansion_pct:.1f}% increase, expansion used: {expansion_usage})\n")
+
+        score, adjacent_pairs = self.floor_plan.evaluate_adjacency_score()
+
+        parts = [
+            f"FLOOR PLAN STATISTICS\n{'=' * 30}\n\n",
+            f"Floor area: {total_area} square units\n",
+            f"Room area: {used_area} square units\n",
+            f"Space utilization: {used_area / total_area:.2%}\n\n",
+            f"Adjacency score: {score}/{len(self.floor_plan.adjacency_graph.edges)}\n",
+            f"Adjacent pairs: {adjacent_pairs}\n\n",
+            "ROOM EXPANSION STATISTICS:\n" + "-" * 30 + "\n",
+        ]
+        parts.extend(expansion_parts)
 
-        stats += "\nROOM PLACEMENTS:\n" + "-" * 20 + "\n"
+        parts.append("\nROOM PLACEMENTS:\n" + "-" * 20 + "\n")
         for room in self.floor_plan.rooms:
-            stats += f"{room}\n"
+            parts.append(f"{room}\n")
+        stats = "".join(parts)
 
-        self.stats_text.insert('1.0', stats)
+        # Swap the old text for the new in one command, so the widget is never redrawn empty
+        self.stats_text.replace('1.0', tk.END, stats)
 
-        # Update visualization
-        self.ax.clear()
+        # Update visualization; the canvas repaints once Tk is idle
         self.visualize_floor_plan()
-        self.canvas.draw()
+        self.canvas.draw_idle()
 
         # Switch to output screen
         self.show_screen("output")
@@ -974,33 +962,54 @@ class FloorPlanGUI:
         if not self.floor_plan:
             return
 
-        # Draw floor shape
-        for region in self.floor_plan.floor_regions:
-            rect = plt.Rectangle(
-                (region['x'], region['y']),
-                region['width'],
-                region['height'],
-                linewidth=2,
-                edgecolor='black',
-                facecolor='none',
-                linestyle='--'
-            )
-            self.ax.add_patch(rect)
-
-        # Draw rooms
-        colors = plt.cm.tab20(np.linspace(0, 1, len(self.floor_plan.rooms)))
+        # Draw floor shape; the outlines, limits and labels only change with the regions, so the
+        # axes are only cleared and rebuilt for a new floor
+        regions_key = tuple((region['x'], region['y'], region['width'], region['height'])
+                            for region in self.floor_plan.floor_regions)
+        if regions_key != self._drawn_regions:
+            self.ax.clear()
+            self._room_labels = {}
+            self._drawn_regions = regions_key
+
+            region_rects = [plt.Rectangle((region['x'], region['y']), region['width'], region['height'])
+                            for region in self.floor_plan.floor_regions]
+            self.ax.add_collection(PatchCollection(region_rects, linewidths=2, edgecolors='black',
+                                                   facecolors='none', linestyles='--'))
+
+            # Rooms and adjacency lines are drawn by collections whose contents are replaced on each redraw
+            self._room_collection = PatchCollection([], linewidths=1, edgecolors='black', alpha=0.7)
+            self.ax.add_collection(self._room_collection, autolim=False)
+            self._satisfied_lines = LineCollection([], colors='g', linestyles='-', linewidths=2,
+                                                   alpha=0.8, label='Adjacent (satisfied)')
+            self.ax.add_collection(self._satisfied_lines, autolim=False)
+            self._unsatisfied_lines = LineCollection([], colors='r', linestyles=':', linewidths=1.5,
+                                                     alpha=0.8, label='Adjacent (unsatisfied)')
+            self.ax.add_collection(self._unsatisfied_lines, autolim=False)
+
+            # Set limits and labels
+            max_width = self.floor_plan.floor_width
+            max_height = self.floor_plan.floor_height
+            self.ax.set_xlim(-1, max_width + 1)
+            self.ax.set_ylim(-1, max_height + 1)
+            self.ax.set_aspect('equal')
+            self.ax.set_title('Floor Plan Layout')
+            self.ax.set_xlabel('Width')
+            self.ax.set_ylabel('Height')
+            self.ax.grid(True, alpha=0.3)
+
+        # Draw rooms (one collection for all room rectangles, colored by room index)
+        n_rooms = len(self.floor_plan.rooms)
+        colors = self._color_cache.get(n_rooms)
+        if colors is None:
+            colors = self._color_cache[n_rooms] = plt.cm.tab20(np.linspace(0, 1, n_rooms))
+        room_rects = []
+        color_ids = []
+        room_labels = {}
+        label_bbox = dict(boxstyle="round,pad=0.3", facecolor="white", alpha=0.8)  # Text copies it per label
         for i, room in enumerate(self.floor_plan.rooms):
             if room.x is not None and room.y is not None:
-                rect = plt.Rectangle(
-                    (room.x, room.y),
-                    room.width,
-                    room.height,
-                    linewidth=1,
-                    edgecolor='black',
-                    facecolor=colors[i],
-                    alpha=0.7
-                )
-                self.ax.add_patch(rect)
+                room_rects.append(plt.Rectangle((room.x, room.y), room.width, room.height))
+                color_ids.append(i)
 
                 # Add room name, size, and expansion info
                 original_size = f"{room.original_width}x{room.original_height}"
@@ -1014,52 +1023,57 @@ class FloorPlanGUI:
                     else:
                         display_text += f"\n(from {original_size})"
 
-                self.ax.text(
-                    room.x + room.width / 2,
-                    room.y + room.height / 2,
-                    display_text,
-                    ha='center',
-                    va='center',
-                    fontsize=8,
-                    bbox=dict(boxstyle="round,pad=0.3", facecolor="white", alpha=0.8)
-                )
-
-        # Add adjacency relationships as lines between room centers
-        for room1_name, room2_name in self.floor_plan.adjacency_graph.edges:
-            room1 = next(r for r in self.floor_plan.rooms if r.name == room1_name)
-            room2 = next(r for r in self.floor_plan.rooms if r.name == room2_name)
-
+                # Move the label of a room that is already on the axes
+                center = (room.x + room.width / 2, room.y + room.height / 2)
+                label = self._room_labels.pop(room.name, None)
+                if label is None:
+                    label = self.ax.text(
+                        center[0],
+                        center[1],
+                        display_text,
+                        ha='center',
+                        va='center',
+                        fontsize=8,
+                        bbox=label_bbox,
+                        in_layout=False  # labels sit inside the axes, so the layout solve can skip measuring them
+                    )
+                else:
+                    label.set_position(center)
+                    label.set_text(display_text)
+                room_labels[room.name] = label
+
+        self._room_collection.set_paths(room_rects)
+        self._room_collection.set_facecolor(colors[color_ids])
+
+        # Remove labels of rooms that are no longer placed
+        for label in self._room_labels.values():
+            label.remove()
+        self._room_labels = room_labels
+
+        # Add adjacency relationships as lines between room centers, collected per style
+        satisfied_segments = []
+        unsatisfied_segments = []
+        # The floor plan keeps the edge list with the rooms already looked up until an adjacency is added
+        for _, room1, room2 in self.floor_plan._get_edge_index():
             if room1.x is not None and room2.x is not None:
                 center1 = (room1.x + room1.width / 2, room1.y + room1.height / 2)
                 center2 = (room2.x + room2.width / 2, room2.y + room2.height / 2)
 
                 # Check if rooms share a wall
                 if room1.has_shared_wall_with(room2):
-                    self.ax.plot([center1[0], center2[0]], [center1[1], center2[1]],
-                                 'g-', linewidth=2, alpha=0.8, label='Adjacent (satisfied)')
+                    satisfied_segments.append((center1, center2))
                 else:
-                    self.ax.plot([center1[0], center2[0]], [center1[1], center2[1]],
-                                 'r:', linewidth=1.5, alpha=0.8, label='Adjacent (unsatisfied)')
-
-        # Set limits and labels
-        max_width = self.floor_plan.floor_width
-        max_height = self.floor_plan.floor_height
-        self.ax.set_xlim(-1, max_width + 1)
-        self.ax.set_ylim(-1, max_height + 1)
-        self.ax.set_aspect('equal')
-        self.ax.set_title('Floor Plan Layout')
-        self.ax.set_xlabel('Width')
-        self.ax.set_ylabel('Height')
-        self.ax.grid(True, alpha=0.3)
-
-        # Add legend for adjacency lines (avoid duplicates)
-        handles, labels = self.ax.get_legend_handles_labels()
-        by_label = dict(zip(labels, handles))
-        if by_label:
-            self.ax.legend(by_label.values(), by_label.keys(), loc='upper left',
-                           bbox_to_anchor=(1.02, 1), borderaxespad=0)
-
-        plt.tight_layout()
+                    unsatisfied_segments.append((center1, center2))
+
+        self._satisfied_lines.set_segments(satisfied_segments)
+        self._unsatisfied_lines.set_segments(unsatisfied_segments)
+
+        # Add legend for the adjacency line styles that are in use
+        handles = [lines for lines in (self._satisfied_lines, self._unsatisfied_lines) if len(lines.get_segments())]
+        if handles:
+            self.ax.legend(handles=handles, loc='upper left', bbox_to_anchor=(1.02, 1), borderaxespad=0)
+        elif self.ax.get_legend() is not None:
+            self.ax.get_legend().remove()
 
 
 def main():